@@ -0,0 +1,54 @@
+"""add_hot_filter_indexes
+
+Revision ID: i2j3k4l5m6n7
+Revises: h1i2j3k4l5m6
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'i2j3k4l5m6n7'
+down_revision: Union[str, Sequence[str], None] = 'h1i2j3k4l5m6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, columns). Every index ends with the route's sort key
+# including the id tie-breaker, so filtered pages are read in index order
+# with no Sort node, for OFFSET and keyset cursors alike.
+INDEXES = [
+    ('ix_storm_tracks_storm_id_timestamp', 'storm_tracks', ['storm_id', 'timestamp', 'track_id']),
+    ('ix_news_sources_storm_id_category_published_at', 'news_sources', ['storm_id', 'category', 'published_at', 'news_id']),
+    ('ix_news_sources_storm_id_published_at', 'news_sources', ['storm_id', 'published_at', 'news_id']),
+    ('ix_news_sources_published_at', 'news_sources', ['published_at', 'news_id']),
+    ('ix_rescue_requests_storm_id_created_at', 'rescue_requests', ['storm_id', 'created_at', 'request_id']),
+    ('ix_rescue_requests_status_created_at', 'rescue_requests', ['status', 'created_at', 'request_id']),
+    ('ix_rescue_requests_priority_created_at', 'rescue_requests', ['priority', 'created_at', 'request_id']),
+    ('ix_rescue_requests_created_at', 'rescue_requests', ['created_at', 'request_id']),
+    ('ix_damage_assessment_storm_id_time', 'damage_assessment', ['storm_id', 'time', 'id']),
+    ('ix_damage_assessment_time', 'damage_assessment', ['time', 'id']),
+    ('ix_forecasts_storm_id_created_at', 'forecasts', ['storm_id', 'created_at', 'forecast_id']),
+    ('ix_forecasts_created_at', 'forecasts', ['created_at', 'forecast_id']),
+    ('ix_damage_details_storm_id_created_at', 'damage_details', ['storm_id', 'created_at', 'id']),
+    ('ix_damage_details_created_at', 'damage_details', ['created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Create composite indexes for the filtered, sorted list queries."""
+    # CONCURRENTLY keeps the tables writable while the indexes build; it cannot
+    # run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Drop the composite indexes."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
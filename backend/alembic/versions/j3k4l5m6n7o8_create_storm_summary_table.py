@@ -0,0 +1,116 @@
+"""create_storm_summary_table
+
+Revision ID: j3k4l5m6n7o8
+Revises: i2j3k4l5m6n7
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'j3k4l5m6n7o8'
+down_revision: Union[str, Sequence[str], None] = 'i2j3k4l5m6n7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# One row per existing storm, aggregated from its child tables. From here on the
+# write helpers keep the rows current (src/storms/summary.py).
+BACKFILL = """
+INSERT INTO storm_summary (
+    storm_id, track_count, first_track_at, first_lat, first_lon, last_track_at, last_lat, last_lon,
+    max_wind_speed, min_lat, max_lat, min_lon, max_lon, rescue_count, rescue_by_status, rescue_by_priority,
+    latest_forecast_id, latest_damage_id, latest_damage_time, latest_damage_detail_id
+)
+SELECT
+    s.storm_id, COALESCE(t.track_count, 0), f.timestamp, f.lat, f.lon, l.timestamp, l.lat, l.lon,
+    t.max_wind_speed, t.min_lat, t.max_lat, t.min_lon, t.max_lon,
+    COALESCE(r.rescue_count, 0), COALESCE(rs.counts, '{}'::jsonb), COALESCE(rp.counts, '{}'::jsonb),
+    fc.forecast_id, d.id, d.time, dd.id
+FROM storms s
+LEFT JOIN (
+    SELECT storm_id, count(*) AS track_count, max(wind_speed) AS max_wind_speed,
+           min(lat) AS min_lat, max(lat) AS max_lat, min(lon) AS min_lon, max(lon) AS max_lon
+    FROM storm_tracks GROUP BY storm_id
+) t ON t.storm_id = s.storm_id
+LEFT JOIN LATERAL (
+    SELECT timestamp, lat, lon FROM storm_tracks
+    WHERE storm_id = s.storm_id AND timestamp IS NOT NULL
+    ORDER BY timestamp, track_id LIMIT 1
+) f ON true
+LEFT JOIN LATERAL (
+    SELECT timestamp, lat, lon FROM storm_tracks
+    WHERE storm_id = s.storm_id AND timestamp IS NOT NULL
+    ORDER BY timestamp DESC, track_id DESC LIMIT 1
+) l ON true
+LEFT JOIN (
+    SELECT storm_id, count(*) AS rescue_count FROM rescue_requests GROUP BY storm_id
+) r ON r.storm_id = s.storm_id
+LEFT JOIN (
+    SELECT storm_id, jsonb_object_agg(key, n) AS counts
+    FROM (
+        SELECT storm_id, COALESCE(status, 'unknown') AS key, count(*) AS n
+        FROM rescue_requests GROUP BY 1, 2
+    ) by_status GROUP BY storm_id
+) rs ON rs.storm_id = s.storm_id
+LEFT JOIN (
+    SELECT storm_id, jsonb_object_agg(key, n) AS counts
+    FROM (
+        SELECT storm_id, COALESCE(priority::text, 'unknown') AS key, count(*) AS n
+        FROM rescue_requests GROUP BY 1, 2
+    ) by_priority GROUP BY storm_id
+) rp ON rp.storm_id = s.storm_id
+LEFT JOIN LATERAL (
+    SELECT forecast_id FROM forecasts WHERE storm_id = s.storm_id
+    ORDER BY created_at DESC, forecast_id DESC LIMIT 1
+) fc ON true
+LEFT JOIN LATERAL (
+    SELECT id, time FROM damage_assessment WHERE storm_id = s.storm_id
+    ORDER BY time DESC, id DESC LIMIT 1
+) d ON true
+LEFT JOIN LATERAL (
+    SELECT id FROM damage_details WHERE storm_id = s.storm_id
+    ORDER BY created_at DESC, id DESC LIMIT 1
+) dd ON true
+"""
+
+
+def upgrade() -> None:
+    """Create storm_summary table and backfill it from the child tables."""
+    op.create_table(
+        'storm_summary',
+        sa.Column('storm_id', sa.String(), nullable=False),
+        sa.Column('track_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('first_track_at', sa.DateTime(), nullable=True),
+        sa.Column('first_lat', sa.Float(), nullable=True),
+        sa.Column('first_lon', sa.Float(), nullable=True),
+        sa.Column('last_track_at', sa.DateTime(), nullable=True),
+        sa.Column('last_lat', sa.Float(), nullable=True),
+        sa.Column('last_lon', sa.Float(), nullable=True),
+        sa.Column('max_wind_speed', sa.Float(), nullable=True),
+        sa.Column('min_lat', sa.Float(), nullable=True),
+        sa.Column('max_lat', sa.Float(), nullable=True),
+        sa.Column('min_lon', sa.Float(), nullable=True),
+        sa.Column('max_lon', sa.Float(), nullable=True),
+        sa.Column('rescue_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('rescue_by_status', postgresql.JSONB(), server_default='{}', nullable=False),
+        sa.Column('rescue_by_priority', postgresql.JSONB(), server_default='{}', nullable=False),
+        sa.Column('latest_forecast_id', sa.Integer(), nullable=True),
+        sa.Column('latest_damage_id', sa.Integer(), nullable=True),
+        sa.Column('latest_damage_time', sa.DateTime(), nullable=True),
+        sa.Column('latest_damage_detail_id', sa.Integer(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['storm_id'], ['storms.storm_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('storm_id')
+    )
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    """Drop storm_summary table."""
+    op.drop_table('storm_summary')
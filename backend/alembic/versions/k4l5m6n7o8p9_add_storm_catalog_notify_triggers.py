@@ -0,0 +1,59 @@
+"""add_storm_catalog_notify_triggers
+
+Revision ID: k4l5m6n7o8p9
+Revises: j3k4l5m6n7o8
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'k4l5m6n7o8p9'
+down_revision: Union[str, Sequence[str], None] = 'j3k4l5m6n7o8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Every change to a storms row notifies the storm_catalog channel with the
+# storm's id, so each worker's in-memory catalog (src/storms/catalog.py)
+# re-reads it. Payloads stay small: the row itself is read back on demand.
+NOTIFY_FUNCTION = """
+CREATE OR REPLACE FUNCTION notify_storm_catalog() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        PERFORM pg_notify('storm_catalog', json_build_object('op', TG_OP)::text);
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM pg_notify('storm_catalog', json_build_object('op', TG_OP, 'storm_id', OLD.storm_id)::text);
+    END IF;
+    IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND NEW.storm_id IS DISTINCT FROM OLD.storm_id) THEN
+        PERFORM pg_notify('storm_catalog', json_build_object('op', TG_OP, 'storm_id', NEW.storm_id)::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    """Notify the storm_catalog channel on every change to storms."""
+    op.execute(NOTIFY_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER storms_notify_catalog AFTER INSERT OR UPDATE OR DELETE ON storms "
+        "FOR EACH ROW EXECUTE FUNCTION notify_storm_catalog()"
+    )
+    op.execute(
+        "CREATE TRIGGER storms_notify_catalog_truncate AFTER TRUNCATE ON storms "
+        "FOR EACH STATEMENT EXECUTE FUNCTION notify_storm_catalog()"
+    )
+
+
+def downgrade() -> None:
+    """Drop the storm catalog triggers."""
+    op.execute("DROP TRIGGER IF EXISTS storms_notify_catalog_truncate ON storms")
+    op.execute("DROP TRIGGER IF EXISTS storms_notify_catalog ON storms")
+    op.execute("DROP FUNCTION IF EXISTS notify_storm_catalog()")
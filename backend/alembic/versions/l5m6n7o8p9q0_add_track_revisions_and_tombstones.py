@@ -0,0 +1,58 @@
+"""add_track_revisions_and_tombstones
+
+Revision ID: l5m6n7o8p9q0
+Revises: k4l5m6n7o8p9
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'l5m6n7o8p9q0'
+down_revision: Union[str, Sequence[str], None] = 'k4l5m6n7o8p9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Id of the writing transaction; see CURRENT_REVISION in src/models.py
+CURRENT_REVISION = "(pg_current_xact_id())::text::bigint"
+
+
+def upgrade() -> None:
+    """Stamp track points with the transaction that wrote them and keep tombstones of deleted points."""
+    # A constant default fills existing rows without rewriting the table; they
+    # all sort before any later write
+    op.add_column(
+        'storm_tracks',
+        sa.Column('revision', sa.BigInteger(), server_default='0', nullable=False)
+    )
+    op.alter_column('storm_tracks', 'revision', server_default=sa.text(CURRENT_REVISION))
+    op.create_index(
+        'ix_storm_tracks_storm_id_revision', 'storm_tracks', ['storm_id', 'revision', 'track_id'], unique=False
+    )
+
+    op.create_table(
+        'storm_track_tombstones',
+        sa.Column('track_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('storm_id', sa.String(), nullable=False),
+        sa.Column('revision', sa.BigInteger(), server_default=sa.text(CURRENT_REVISION), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['storm_id'], ['storms.storm_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('track_id')
+    )
+    op.create_index(
+        'ix_storm_track_tombstones_storm_id_revision', 'storm_track_tombstones',
+        ['storm_id', 'revision', 'track_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Drop track revisions and tombstones."""
+    op.drop_index('ix_storm_track_tombstones_storm_id_revision', table_name='storm_track_tombstones')
+    op.drop_table('storm_track_tombstones')
+    op.drop_index('ix_storm_tracks_storm_id_revision', table_name='storm_tracks')
+    op.drop_column('storm_tracks', 'revision')
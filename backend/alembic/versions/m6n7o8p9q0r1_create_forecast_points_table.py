@@ -0,0 +1,194 @@
+"""create_forecast_points_table
+
+Revision ID: m6n7o8p9q0r1
+Revises: l5m6n7o8p9q0
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'm6n7o8p9q0r1'
+down_revision: Union[str, Sequence[str], None] = 'l5m6n7o8p9q0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Forecasts read per backfill batch
+BACKFILL_BATCH = 500
+
+# The bulletin flattening as of this revision (src/forecasts/points.py), frozen
+# here so the backfill does not change with the application code
+SOURCES = ("nchmf", "jtwc")
+TIME_FORMATS = ("%Y-%m-%d %H:%M", "%d-%m-%Y %H:%M")
+NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+
+def _time(value: Any) -> Optional[datetime]:
+    if not isinstance(value, str):
+        return None
+    for time_format in TIME_FORMATS:
+        try:
+            return datetime.strptime(value.strip(), time_format)
+        except ValueError:
+            pass
+    try:
+        return datetime.fromisoformat(value.strip()).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def _number(value: Any) -> Optional[float]:
+    """A bulletin number; ranges such as "10-11" (Beaufort levels) count as their upper end."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        numbers = [float(n) for n in NUMBER.findall(value.replace("–", " ").replace("-", " "))]
+        return max(numbers) if numbers else None
+    return None
+
+
+def _dict(value: Any) -> dict:
+    return value if isinstance(value, dict) else {}
+
+
+def _bounds(values: Any) -> List[Optional[float]]:
+    if not isinstance(values, (list, tuple)) or len(values) != 2:
+        return [None, None]
+    low, high = _number(values[0]), _number(values[1])
+    if low is None or high is None:
+        return [None, None]
+    return [min(low, high), max(low, high)]
+
+
+def flatten_forecast(forecast_id: int, storm_id: str, source: str, payload: Optional[dict]) -> List[Dict[str, Any]]:
+    """
+    ``forecast_points`` rows for one source's bulletin: the ``current``
+    position at lead 0 followed by every ``forecast[]`` entry. The issue time
+    is the time of ``current`` (else the earliest entry); entries without a
+    time or position are skipped.
+    """
+    if not isinstance(payload, dict):
+        return []
+    current = payload.get("current") if isinstance(payload.get("current"), dict) else None
+    entries = [current] if current is not None else []
+    forecast = payload.get("forecast")
+    entries += [entry for entry in forecast if isinstance(entry, dict)] if isinstance(forecast, list) else []
+
+    timed = [(entry, _time(entry.get("time"))) for entry in entries]
+    timed = [(entry, valid_at) for entry, valid_at in timed if valid_at is not None]
+    if not timed:
+        return []
+    issued_at = _time(current.get("time")) if current is not None else None
+    issued_at = issued_at or min(valid_at for _, valid_at in timed)
+
+    points = []
+    for entry, valid_at in timed:
+        position = _dict(entry.get("position"))
+        lat, lon = _number(position.get("lat")), _number(position.get("lon"))
+        if lat is None or lon is None:
+            continue
+        intensity = _dict(entry.get("intensity"))
+        zone = _dict(entry.get("danger_zone"))
+        danger_min_lat, danger_max_lat = _bounds(zone.get("lat_range"))
+        danger_min_lon, danger_max_lon = _bounds(zone.get("lon_range"))
+        risk_level = _number(entry.get("risk_level"))
+        points.append({
+            "forecast_id": forecast_id,
+            "storm_id": storm_id,
+            "source": source,
+            "issued_at": issued_at,
+            "valid_at": valid_at,
+            "lead_hours": round((valid_at - issued_at).total_seconds() / 3600),
+            "lat": lat,
+            "lon": lon,
+            "wind": _number(intensity.get("wind")),
+            "gust": _number(intensity.get("gust")),
+            "risk_level": None if risk_level is None else int(risk_level),
+            "danger_min_lat": danger_min_lat,
+            "danger_max_lat": danger_max_lat,
+            "danger_min_lon": danger_min_lon,
+            "danger_max_lon": danger_max_lon,
+        })
+    return points
+
+
+
+def upgrade() -> None:
+    """Create forecast_points and flatten the bulletins of every existing forecast into it."""
+    forecast_points_table = op.create_table(
+        'forecast_points',
+        sa.Column('point_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('forecast_id', sa.Integer(), nullable=False),
+        sa.Column('storm_id', sa.String(), nullable=False),
+        sa.Column('source', sa.String(), nullable=False),
+        sa.Column('issued_at', sa.DateTime(), nullable=False),
+        sa.Column('valid_at', sa.DateTime(), nullable=False),
+        sa.Column('lead_hours', sa.Integer(), nullable=False),
+        sa.Column('lat', sa.Float(), nullable=False),
+        sa.Column('lon', sa.Float(), nullable=False),
+        sa.Column('wind', sa.Float(), nullable=True),
+        sa.Column('gust', sa.Float(), nullable=True),
+        sa.Column('risk_level', sa.Integer(), nullable=True),
+        sa.Column('danger_min_lat', sa.Float(), nullable=True),
+        sa.Column('danger_max_lat', sa.Float(), nullable=True),
+        sa.Column('danger_min_lon', sa.Float(), nullable=True),
+        sa.Column('danger_max_lon', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['forecast_id'], ['forecasts.forecast_id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['storm_id'], ['storms.storm_id'], ),
+        sa.PrimaryKeyConstraint('point_id')
+    )
+    op.create_index('ix_forecast_points_forecast_id', 'forecast_points', ['forecast_id'], unique=False)
+    op.create_index(
+        'ix_forecast_points_storm_id_lead_hours', 'forecast_points', ['storm_id', 'lead_hours', 'point_id'], unique=False
+    )
+    op.create_index(
+        'ix_forecast_points_lead_hours_lat_lon', 'forecast_points', ['lead_hours', 'lat', 'lon'], unique=False
+    )
+
+    # The flattening runs in Python, so it needs a live connection
+    if op.get_context().as_sql:
+        return
+    connection = op.get_bind()
+    forecasts = sa.table(
+        'forecasts', sa.column('forecast_id', sa.Integer), sa.column('storm_id', sa.String),
+        sa.column('nchmf', sa.JSON), sa.column('jtwc', sa.JSON),
+    )
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(forecasts)
+            .where(forecasts.c.forecast_id > last_id)
+            .order_by(forecasts.c.forecast_id)
+            .limit(BACKFILL_BATCH)
+        ).all()
+        if not rows:
+            break
+        points = [
+            point
+            for row in rows
+            for source in SOURCES
+            for point in flatten_forecast(row.forecast_id, row.storm_id, source, getattr(row, source))
+        ]
+        if points:
+            connection.execute(forecast_points_table.insert(), points)
+        last_id = rows[-1].forecast_id
+
+
+def downgrade() -> None:
+    """Drop forecast_points."""
+    op.drop_index('ix_forecast_points_lead_hours_lat_lon', table_name='forecast_points')
+    op.drop_index('ix_forecast_points_storm_id_lead_hours', table_name='forecast_points')
+    op.drop_index('ix_forecast_points_forecast_id', table_name='forecast_points')
+    op.drop_table('forecast_points')
@@ -0,0 +1,291 @@
+"""create_forecast_cones_table
+
+Revision ID: n7o8p9q0r1s2
+Revises: m6n7o8p9q0r1
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from alembic import op
+import orjson
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'n7o8p9q0r1s2'
+down_revision: Union[str, Sequence[str], None] = 'm6n7o8p9q0r1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Forecasts read per backfill batch
+BACKFILL_BATCH = 500
+
+# The cone computation as of this revision (src/forecasts/cone.py), frozen here
+# so the backfill does not change with the application code
+SOURCES = ("nchmf", "jtwc")
+POINT_COLUMNS = (
+    "forecast_id", "source", "issued_at", "valid_at", "lead_hours", "lat", "lon",
+    "danger_min_lat", "danger_max_lat", "danger_min_lon", "danger_max_lon",
+)
+Point = Tuple[float, float]  # (lon, lat)
+Ring = List[Point]
+
+EPSILON = 1e-9
+# Endpoint rounding when chaining union edges into rings
+KEY_DIGITS = 7
+
+
+def _cross(o: Point, a: Point, b: Point) -> float:
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def convex_hull(points: Sequence[Point]) -> Ring:
+    """Counter-clockwise convex hull (monotone chain), without the closing point."""
+    points = sorted(set(points))
+    if len(points) < 3:
+        return list(points)
+    lower, upper = [], []
+    for p in points:
+        while len(lower) >= 2 and _cross(lower[-2], lower[-1], p) <= EPSILON:
+            lower.pop()
+        lower.append(p)
+    for p in reversed(points):
+        while len(upper) >= 2 and _cross(upper[-2], upper[-1], p) <= EPSILON:
+            upper.pop()
+        upper.append(p)
+    return lower[:-1] + upper[:-1]
+
+
+def _edges(ring: Ring):
+    return [(ring[i], ring[(i + 1) % len(ring)]) for i in range(len(ring))]
+
+
+def _split_params(p: Point, q: Point, a: Point, b: Point) -> List[float]:
+    """Positions along p->q (0..1) where the segment a-b meets it, including overlapping ends."""
+    r = (q[0] - p[0], q[1] - p[1])
+    s = (b[0] - a[0], b[1] - a[1])
+    denominator = r[0] * s[1] - r[1] * s[0]
+    offset = (a[0] - p[0], a[1] - p[1])
+    length = r[0] * r[0] + r[1] * r[1]
+    if abs(denominator) < EPSILON:
+        # Parallel: only a collinear overlap splits p->q, at a's and b's projections
+        if abs(offset[0] * r[1] - offset[1] * r[0]) > EPSILON or length < EPSILON:
+            return []
+        return [
+            ((c[0] - p[0]) * r[0] + (c[1] - p[1]) * r[1]) / length
+            for c in (a, b)
+        ]
+    t = (offset[0] * s[1] - offset[1] * s[0]) / denominator
+    u = (offset[0] * r[1] - offset[1] * r[0]) / denominator
+    return [t] if -EPSILON <= u <= 1 + EPSILON else []
+
+
+def _locate(point: Point, ring: Ring) -> Tuple[str, Optional[Point]]:
+    """("inside" | "outside" | "boundary", direction of the boundary edge) of ``point`` against a convex CCW ring."""
+    boundary = None
+    for a, b in _edges(ring):
+        side = _cross(a, b, point)
+        if side < -EPSILON:
+            return "outside", None
+        if side <= EPSILON:
+            boundary = (b[0] - a[0], b[1] - a[1])
+    return ("boundary", boundary) if boundary is not None else ("inside", None)
+
+
+def union_outline(polygons: Sequence[Ring]) -> List[Ring]:
+    """
+    Outline of the union of convex CCW polygons, as closed rings: outer
+    boundaries counter-clockwise, holes clockwise.
+
+    Every polygon edge is cut where it meets another polygon's edges; a piece
+    is part of the outline when its midpoint lies outside every other polygon.
+    A piece shared with another polygon survives once if both interiors lie
+    on the same side of it, and not at all if they face each other. The
+    surviving pieces are then chained end to end.
+    """
+    polygons = [ring for ring in polygons if len(ring) >= 3]
+    pieces = []
+    for i, ring in enumerate(polygons):
+        others = [(j, other) for j, other in enumerate(polygons) if j != i]
+        for p, q in _edges(ring):
+            params = {0.0, 1.0}
+            for _, other in others:
+                for a, b in _edges(other):
+                    params.update(t for t in _split_params(p, q, a, b) if 0.0 < t < 1.0)
+            params = sorted(params)
+            for t0, t1 in zip(params, params[1:]):
+                if t1 - t0 < EPSILON:
+                    continue
+                middle = (p[0] + (q[0] - p[0]) * (t0 + t1) / 2, p[1] + (q[1] - p[1]) * (t0 + t1) / 2)
+                keep = True
+                for j, other in others:
+                    where, direction = _locate(middle, other)
+                    if where == "inside":
+                        keep = False
+                    elif where == "boundary":
+                        same_side = direction[0] * (q[0] - p[0]) + direction[1] * (q[1] - p[1]) > 0
+                        keep = keep and same_side and i < j
+                    if not keep:
+                        break
+                if keep:
+                    start = (p[0] + (q[0] - p[0]) * t0, p[1] + (q[1] - p[1]) * t0)
+                    end = (p[0] + (q[0] - p[0]) * t1, p[1] + (q[1] - p[1]) * t1)
+                    pieces.append((start, end))
+
+    def key(point: Point) -> Tuple[float, float]:
+        return round(point[0], KEY_DIGITS), round(point[1], KEY_DIGITS)
+
+    outgoing: Dict[Tuple[float, float], List[int]] = defaultdict(list)
+    for index, (start, _) in enumerate(pieces):
+        outgoing[key(start)].append(index)
+    used = [False] * len(pieces)
+    rings = []
+    for first in range(len(pieces)):
+        if used[first]:
+            continue
+        ring, index = [], first
+        while index is not None and not used[index]:
+            used[index] = True
+            start, end = pieces[index]
+            ring.append(start)
+            index = next((n for n in outgoing[key(end)] if not used[n]), None)
+        if len(ring) >= 3 and key(pieces[first][0]) == key(end):
+            rings.append(_drop_collinear(ring))
+    return [ring for ring in rings if len(ring) >= 3]
+
+
+def _drop_collinear(ring: Ring) -> Ring:
+    kept = [
+        ring[i] for i in range(len(ring))
+        if abs(_cross(ring[i - 1], ring[i], ring[(i + 1) % len(ring)])) > EPSILON
+    ]
+    return [(round(lon, 6), round(lat, 6)) for lon, lat in kept]
+
+
+def _signed_area(ring: Ring) -> float:
+    return sum(a[0] * b[1] - b[0] * a[1] for a, b in _edges(ring)) / 2
+
+
+def _contains(ring: Ring, point: Point) -> bool:
+    inside = False
+    for (x1, y1), (x2, y2) in _edges(ring):
+        if (y1 > point[1]) != (y2 > point[1]) and point[0] < x1 + (point[1] - y1) * (x2 - x1) / (y2 - y1):
+            inside = not inside
+    return inside
+
+
+def rings_to_geometry(rings: List[Ring]) -> Optional[Dict[str, Any]]:
+    """GeoJSON (Multi)Polygon from union_outline rings; each hole goes to the outer ring around it."""
+    outers = [ring for ring in rings if _signed_area(ring) > 0]
+    holes = [ring for ring in rings if _signed_area(ring) < 0]
+    if not outers:
+        return None
+    polygons = [[ring] for ring in outers]
+    for hole in holes:
+        for polygon in polygons:
+            if _contains(polygon[0], hole[0]):
+                polygon.append(hole)
+                break
+    coordinates = [
+        [[list(point) for point in ring + ring[:1]] for ring in polygon]
+        for polygon in polygons
+    ]
+    if len(coordinates) == 1:
+        return {"type": "Polygon", "coordinates": coordinates[0]}
+    return {"type": "MultiPolygon", "coordinates": coordinates}
+
+
+def _zone(point: Dict[str, Any]) -> List[Point]:
+    """Corners of a point's danger zone, or the forecast position itself when it has none."""
+    if None in (point["danger_min_lat"], point["danger_max_lat"], point["danger_min_lon"], point["danger_max_lon"]):
+        return [(point["lon"], point["lat"])]
+    return [
+        (point["danger_min_lon"], point["danger_min_lat"]), (point["danger_max_lon"], point["danger_min_lat"]),
+        (point["danger_max_lon"], point["danger_max_lat"]), (point["danger_min_lon"], point["danger_max_lat"]),
+    ]
+
+
+def cone_hulls(points: Sequence[Dict[str, Any]]) -> List[Ring]:
+    """
+    Convex hulls of each pair of consecutive danger zones along one source's
+    forecast path (ordered by lead time); a position without a zone, such as
+    the current one, counts as a point, so the cone narrows to it.
+    """
+    zones = [_zone(point) for point in sorted(points, key=lambda p: p["lead_hours"])]
+    if len(zones) == 1:
+        return [convex_hull(zones[0])]
+    return [convex_hull(a + b) for a, b in zip(zones, zones[1:])]
+
+
+def forecast_cone_json(forecast_id: int, points: Sequence[Dict[str, Any]]) -> bytes:
+    """
+    GeoJSON FeatureCollection for one forecast's flattened points: the merged
+    uncertainty cone of every source, then one cone per source. Sources
+    without any danger zone contribute no feature.
+    """
+    by_source = {source: [p for p in points if p["source"] == source] for source in SOURCES}
+    hulls = {source: cone_hulls(source_points) if source_points else [] for source, source_points in by_source.items()}
+    features = []
+    for source, source_hulls in [("merged", [h for source_hulls in hulls.values() for h in source_hulls])] + list(hulls.items()):
+        zoned = [p for p in points if source in ("merged", p["source"]) and p["danger_min_lat"] is not None]
+        geometry = rings_to_geometry(union_outline(source_hulls)) if zoned else None
+        if geometry is None:
+            continue
+        valid = [p["valid_at"] for p in zoned]
+        features.append({
+            "type": "Feature",
+            "geometry": geometry,
+            "properties": {
+                "forecast_id": forecast_id,
+                "source": source,
+                "issued_at": min(p["issued_at"] for p in points if source in ("merged", p["source"])),
+                "valid_from": min(valid),
+                "valid_to": max(valid),
+            },
+        })
+    return orjson.dumps({"type": "FeatureCollection", "features": features})
+
+
+def upgrade() -> None:
+    """Create forecast_cones and compute the cones of every existing forecast."""
+    forecast_cones = op.create_table(
+        'forecast_cones',
+        sa.Column('forecast_id', sa.Integer(), nullable=False),
+        sa.Column('geojson', sa.Text(), nullable=False),
+        sa.ForeignKeyConstraint(['forecast_id'], ['forecasts.forecast_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('forecast_id')
+    )
+
+    # The cones are computed in Python from the points the previous revision flattened, so they need a live connection
+    if op.get_context().as_sql:
+        return
+    connection = op.get_bind()
+    forecasts = sa.table('forecasts', sa.column('forecast_id', sa.Integer))
+    forecast_points = sa.table('forecast_points', *(sa.column(name) for name in POINT_COLUMNS))
+    last_id = 0
+    while True:
+        forecast_ids = connection.execute(
+            sa.select(forecasts.c.forecast_id)
+            .where(forecasts.c.forecast_id > last_id)
+            .order_by(forecasts.c.forecast_id)
+            .limit(BACKFILL_BATCH)
+        ).scalars().all()
+        if not forecast_ids:
+            break
+        points = defaultdict(list)
+        for row in connection.execute(
+            sa.select(forecast_points).where(forecast_points.c.forecast_id.in_(forecast_ids))
+        ).mappings():
+            points[row["forecast_id"]].append(dict(row))
+        connection.execute(forecast_cones.insert(), [
+            {"forecast_id": forecast_id, "geojson": forecast_cone_json(forecast_id, points[forecast_id]).decode()}
+            for forecast_id in forecast_ids
+        ])
+        last_id = forecast_ids[-1]
+
+
+def downgrade() -> None:
+    """Drop forecast_cones."""
+    op.drop_table('forecast_cones')
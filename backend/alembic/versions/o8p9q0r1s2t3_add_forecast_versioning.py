@@ -0,0 +1,81 @@
+"""add_forecast_versioning
+
+Revision ID: o8p9q0r1s2t3
+Revises: n7o8p9q0r1s2
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import orjson
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'o8p9q0r1s2t3'
+down_revision: Union[str, Sequence[str], None] = 'n7o8p9q0r1s2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Forecasts read per backfill batch
+BACKFILL_BATCH = 500
+
+
+def content_hash(nchmf, jtwc) -> str:
+    """The forecast content hash as of this revision (src/forecasts/versions.py): SHA-256 of the canonical JSON."""
+    canonical = orjson.dumps({"nchmf": nchmf, "jtwc": jtwc}, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(canonical).hexdigest()
+
+
+def upgrade() -> None:
+    """Add the version columns and hash every existing forecast; existing rows stay stored whole."""
+    op.add_column('forecasts', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column('forecasts', sa.Column('base_id', sa.Integer(), nullable=True))
+    op.add_column('forecasts', sa.Column('delta', sa.JSON(), nullable=True))
+    op.add_column('forecasts', sa.Column('delta_depth', sa.Integer(), server_default='0', nullable=False))
+    op.create_foreign_key('forecasts_base_id_fkey', 'forecasts', 'forecasts', ['base_id'], ['forecast_id'])
+    op.create_index('ix_forecasts_base_id', 'forecasts', ['base_id'], unique=False)
+
+    # The hash is computed in Python, so it needs a live connection
+    if op.get_context().as_sql:
+        return
+    connection = op.get_bind()
+    forecasts = sa.table(
+        'forecasts', sa.column('forecast_id', sa.Integer), sa.column('content_hash', sa.String),
+        sa.column('nchmf', sa.JSON), sa.column('jtwc', sa.JSON),
+    )
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(forecasts.c.forecast_id, forecasts.c.nchmf, forecasts.c.jtwc)
+            .where(forecasts.c.forecast_id > last_id)
+            .order_by(forecasts.c.forecast_id)
+            .limit(BACKFILL_BATCH)
+        ).all()
+        if not rows:
+            break
+        connection.execute(
+            forecasts.update()
+            .where(forecasts.c.forecast_id == sa.bindparam('b_forecast_id'))
+            .values(content_hash=sa.bindparam('b_content_hash')),
+            [
+                {
+                    "b_forecast_id": row.forecast_id,
+                    "b_content_hash": content_hash(row.nchmf, row.jtwc),
+                }
+                for row in rows
+            ]
+        )
+        last_id = rows[-1].forecast_id
+
+
+def downgrade() -> None:
+    """Drop the version columns; run while every forecast is stored whole (delta rows would lose their content)."""
+    op.drop_index('ix_forecasts_base_id', table_name='forecasts')
+    op.drop_constraint('forecasts_base_id_fkey', 'forecasts', type_='foreignkey')
+    op.drop_column('forecasts', 'delta_depth')
+    op.drop_column('forecasts', 'delta')
+    op.drop_column('forecasts', 'base_id')
+    op.drop_column('forecasts', 'content_hash')
@@ -0,0 +1,92 @@
+"""add_danger_zone_impact_indexes
+
+Revision ID: p9q0r1s2t3u4
+Revises: o8p9q0r1s2t3
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+import math
+from typing import Any, Optional, Sequence, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'p9q0r1s2t3u4'
+down_revision: Union[str, Sequence[str], None] = 'o8p9q0r1s2t3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Damage details read per backfill batch
+BACKFILL_BATCH = 500
+
+
+# The coordinate parsing as of this revision (src/damage_details/model.py), frozen
+# here so the backfill does not change with the application code
+def _coordinate(value: Any, limit: float) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) and -limit <= value <= limit else None
+
+
+def content_coordinates(content: Any) -> Tuple[Optional[float], Optional[float]]:
+    """(lat, lon) from the ``latitude``/``longitude`` the geocoder stores in content; (None, None) unless both are valid."""
+    if not isinstance(content, dict):
+        return None, None
+    lat, lon = _coordinate(content.get("latitude"), 90.0), _coordinate(content.get("longitude"), 180.0)
+    return (lat, lon) if lat is not None and lon is not None else (None, None)
+
+
+def upgrade() -> None:
+    """Index rescue requests and damage details by location; copy the damage coordinates out of content."""
+    op.create_index(
+        'ix_rescue_requests_storm_id_status_lat_lon', 'rescue_requests', ['storm_id', 'status', 'lat', 'lon'], unique=False
+    )
+    op.add_column('damage_details', sa.Column('lat', sa.Float(), nullable=True))
+    op.add_column('damage_details', sa.Column('lon', sa.Float(), nullable=True))
+    op.create_index('ix_damage_details_storm_id_lat_lon', 'damage_details', ['storm_id', 'lat', 'lon'], unique=False)
+
+    # content is validated in Python, so the backfill needs a live connection
+    if op.get_context().as_sql:
+        return
+    connection = op.get_bind()
+    damage_details = sa.table(
+        'damage_details', sa.column('id', sa.Integer), sa.column('content', sa.JSON),
+        sa.column('lat', sa.Float), sa.column('lon', sa.Float),
+    )
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(damage_details.c.id, damage_details.c.content)
+            .where(damage_details.c.id > last_id)
+            .order_by(damage_details.c.id)
+            .limit(BACKFILL_BATCH)
+        ).all()
+        if not rows:
+            break
+        coordinates = [(row.id, *content_coordinates(row.content)) for row in rows]
+        located = [
+            {"b_id": detail_id, "b_lat": lat, "b_lon": lon}
+            for detail_id, lat, lon in coordinates if lat is not None
+        ]
+        if located:
+            connection.execute(
+                damage_details.update()
+                .where(damage_details.c.id == sa.bindparam('b_id'))
+                .values(lat=sa.bindparam('b_lat'), lon=sa.bindparam('b_lon')),
+                located
+            )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    """Drop the location indexes and the copied damage coordinates."""
+    op.drop_index('ix_damage_details_storm_id_lat_lon', table_name='damage_details')
+    op.drop_column('damage_details', 'lon')
+    op.drop_column('damage_details', 'lat')
+    op.drop_index('ix_rescue_requests_storm_id_status_lat_lon', table_name='rescue_requests')
@@ -0,0 +1,114 @@
+"""
+Benchmark the ``fast`` read path against the default ORM + response_model path.
+
+Seeds a throwaway storm with tracks and forecasts, then requests
+/api/v1/storms/tracks/all and /api/v1/forecasts in-process (ASGI transport,
+no network) with and without ?fast=true at 1k and 5k rows. The seeded rows
+are deleted afterwards.
+
+Run this with: python benchmark_fast_read_path.py [repeats]
+"""
+import asyncio
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import delete, insert
+
+from src.database import AsyncSessionLocal, engine
+from src.models import Forecast, Storm, StormTrack
+from src.forecasts.router import router as forecasts_router
+from src.storms.router import router as storms_router
+
+BENCH_STORM_ID = "BENCH_FAST_READ"
+TRACK_ROWS = 5000
+FORECAST_ROWS = 1000
+
+# Only the routers under test, so the benchmark does not need the chatbot stack
+app = FastAPI()
+app.include_router(storms_router)
+app.include_router(forecasts_router)
+
+
+async def seed():
+    start = datetime(2024, 1, 1)
+    async with AsyncSessionLocal() as session:
+        await session.execute(insert(Storm).values(storm_id=BENCH_STORM_ID, name="Benchmark", start_date=start))
+        await session.execute(insert(StormTrack), [
+            {
+                "storm_id": BENCH_STORM_ID,
+                "timestamp": start + timedelta(hours=i),
+                "lat": 10 + i * 0.001,
+                "lon": 110 + i * 0.001,
+                "category": i % 5,
+                "wind_speed": 30.0 + i % 40,
+            }
+            for i in range(TRACK_ROWS)
+        ])
+        forecast = {
+            "forecast": [
+                {"time": "2024-11-27 13:00", "position": {"lat": 12.7, "lon": 114.1}, "intensity": {"wind": 11}}
+                for _ in range(8)
+            ]
+        }
+        await session.execute(insert(Forecast), [
+            {"storm_id": BENCH_STORM_ID, "nchmf": forecast, "jtwc": forecast} for _ in range(FORECAST_ROWS)
+        ])
+        await session.commit()
+
+
+async def cleanup():
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(StormTrack).where(StormTrack.storm_id == BENCH_STORM_ID))
+        await session.execute(delete(Forecast).where(Forecast.storm_id == BENCH_STORM_ID))
+        await session.execute(delete(Storm).where(Storm.storm_id == BENCH_STORM_ID))
+        await session.commit()
+
+
+async def measure(client: httpx.AsyncClient, path: str, params: dict, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats + 1):
+        start = time.perf_counter()
+        response = await client.get(path, params=params)
+        response.raise_for_status()
+        timings.append(time.perf_counter() - start)
+    # Drop the first (warm-up) request
+    return statistics.median(timings[1:])
+
+
+async def run_benchmark(repeats: int):
+    await cleanup()
+    await seed()
+    cases = [
+        ("/api/v1/storms/tracks/all", 1000),
+        ("/api/v1/storms/tracks/all", 5000),
+        ("/api/v1/forecasts", 1000),
+    ]
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            print(f"📊 median of {repeats} requests")
+            for path, rows in cases:
+                default = await measure(client, path, {"limit": rows}, repeats)
+                fast = await measure(client, path, {"limit": rows, "fast": "true"}, repeats)
+                print(
+                    f"  {path:<28} {rows:>5} rows  "
+                    f"default {default * 1000:7.1f} ms ({rows / default:8.0f} rows/s)  "
+                    f"fast {fast * 1000:7.1f} ms ({rows / fast:8.0f} rows/s)  "
+                    f"x{default / fast:.1f}"
+                )
+    finally:
+        await cleanup()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    asyncio.run(run_benchmark(repeats))
@@ -0,0 +1,142 @@
+"""
+Benchmark the grid-indexed storm proximity search against a plain SQL scan.
+
+Seeds a synthetic multi-decade archive (YEARS seasons of STORMS_PER_YEAR
+storms with POINTS_PER_STORM 6-hourly track points each, wandering across
+the western Pacific), then times building the in-process track index, the
+indexed radius and bbox queries, and the same radius query answered by a
+haversine scan over every storm_tracks row. The seeded rows are deleted
+afterwards.
+
+Run this with: python benchmark_storms_near.py [repeats]
+"""
+import asyncio
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sqlalchemy import delete, func, insert, select, text
+
+from src.database import AsyncSessionLocal, engine
+from src.models import Storm, StormSummary, StormTrack
+from src.storms.spatial import TrackGridIndex
+
+BENCH_PREFIX = "BENCH_NEAR_"
+YEARS = 40
+STORMS_PER_YEAR = 30
+POINTS_PER_STORM = 120
+# Da Nang, and a box around the central coast of Vietnam
+LAT, LON, RADIUS_KM = 16.05, 108.2, 200.0
+BBOX = (106.0, 14.0, 110.0, 18.0)
+
+NAIVE_SCAN = text("""
+SELECT storm_id, min(
+    2 * 6371.0088 * asin(sqrt(
+        power(sin(radians(lat - :lat) / 2), 2)
+        + cos(radians(:lat)) * cos(radians(lat)) * power(sin(radians(lon - :lon) / 2), 2)
+    ))
+) AS distance_km
+FROM storm_tracks
+WHERE storm_id IS NOT NULL AND lat IS NOT NULL AND lon IS NOT NULL
+GROUP BY storm_id
+HAVING min(
+    2 * 6371.0088 * asin(sqrt(
+        power(sin(radians(lat - :lat) / 2), 2)
+        + cos(radians(:lat)) * cos(radians(lat)) * power(sin(radians(lon - :lon) / 2), 2)
+    ))
+) <= :radius
+ORDER BY distance_km
+""")
+
+
+def synthetic_track(rng: random.Random, start: datetime):
+    lat, lon = rng.uniform(8, 20), rng.uniform(125, 150)
+    heading_lat, heading_lon = rng.uniform(0.0, 0.4), rng.uniform(-0.9, -0.3)
+    for i in range(POINTS_PER_STORM):
+        yield start + timedelta(hours=6 * i), lat, lon
+        lat += heading_lat + rng.gauss(0, 0.1)
+        lon += heading_lon + rng.gauss(0, 0.1)
+
+
+async def seed():
+    rng = random.Random(42)
+    async with AsyncSessionLocal() as session:
+        for year in range(1985, 1985 + YEARS):
+            storms, tracks = [], []
+            for n in range(STORMS_PER_YEAR):
+                storm_id = f"{BENCH_PREFIX}{year}{n:02d}"
+                start = datetime(year, 6, 1) + timedelta(days=rng.uniform(0, 150))
+                storms.append({"storm_id": storm_id, "name": f"Bench {year}-{n}", "start_date": start})
+                tracks.extend(
+                    {"storm_id": storm_id, "timestamp": at, "lat": lat, "lon": lon, "wind_speed": 35.0}
+                    for at, lat, lon in synthetic_track(rng, start)
+                )
+            await session.execute(insert(Storm), storms)
+            await session.execute(insert(StormTrack), tracks)
+            # The index syncs from storm_summary; updated_at defaults to now()
+            await session.execute(insert(StormSummary), [{"storm_id": storm["storm_id"]} for storm in storms])
+        await session.commit()
+
+
+async def cleanup():
+    bench = Storm.storm_id.like(f"{BENCH_PREFIX}%")
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(StormTrack).where(StormTrack.storm_id.like(f"{BENCH_PREFIX}%")))
+        await session.execute(delete(StormSummary).where(StormSummary.storm_id.like(f"{BENCH_PREFIX}%")))
+        await session.execute(delete(Storm).where(bench))
+        await session.commit()
+
+
+def median_ms(timings):
+    return statistics.median(timings) * 1000
+
+
+async def run_benchmark(repeats: int):
+    await cleanup()
+    await seed()
+    try:
+        async with AsyncSessionLocal() as session:
+            points = (await session.execute(select(func.count()).select_from(StormTrack))).scalar()
+            storms = (await session.execute(select(func.count()).select_from(StormSummary))).scalar()
+            print(f"📊 {storms} storms, {points} track points, median of {repeats} runs")
+
+            index = TrackGridIndex(sync_seconds=float("inf"))
+            start = time.perf_counter()
+            await index.sync(session)
+            print(f"  index build (full sync)     {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+            radius_timings, bbox_timings, scan_timings = [], [], []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                near = index.near(LAT, LON, RADIUS_KM)
+                radius_timings.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                boxed = index.within_bbox(*BBOX)
+                bbox_timings.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                scanned = (await session.execute(NAIVE_SCAN, {"lat": LAT, "lon": LON, "radius": RADIUS_KM})).all()
+                scan_timings.append(time.perf_counter() - start)
+
+            # The index measures segments, the scan only vertices, so the index may find more
+            missed = {row.storm_id for row in scanned} - {a.storm_id for a in near}
+            print(f"  indexed radius {RADIUS_KM:.0f} km        {median_ms(radius_timings):9.2f} ms  ({len(near)} storms)")
+            print(f"  indexed bbox                {median_ms(bbox_timings):9.2f} ms  ({len(boxed)} storms)")
+            print(f"  SQL haversine scan          {median_ms(scan_timings):9.2f} ms  ({len(scanned)} storms)")
+            print(f"  x{statistics.median(scan_timings) / statistics.median(radius_timings):.0f} faster, "
+                  f"{len(missed)} storms found by the scan but not the index")
+    finally:
+        await cleanup()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    asyncio.run(run_benchmark(repeats))
@@ -0,0 +1,111 @@
+"""
+Benchmark the per-call latency of the update/delete helpers.
+
+Compares the previous get -> mutate -> flush -> refresh pattern against the
+single UPDATE/DELETE ... RETURNING statements in storm_tracks. Everything runs
+inside one transaction that is rolled back, so the database is left untouched.
+
+Run this with: python benchmark_update_delete.py [iterations]
+"""
+import asyncio
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sqlalchemy import insert
+
+from src.database import AsyncSessionLocal, engine
+from src.models import Storm, StormTrack
+from src.storms.model import storm_tracks
+
+BENCH_STORM_ID = "BENCH_UPDATE_DELETE"
+
+
+async def legacy_update(session, track_id: int, wind_speed: float):
+    track = await session.get(StormTrack, track_id)
+    if not track:
+        return None
+    track.wind_speed = wind_speed
+    await session.flush()
+    await session.refresh(track)
+    return track
+
+
+async def legacy_delete(session, track_id: int) -> bool:
+    track = await session.get(StormTrack, track_id)
+    if not track:
+        return False
+    await session.delete(track)
+    await session.flush()
+    return True
+
+
+async def returning_update(session, track_id: int, wind_speed: float):
+    return await storm_tracks.update_track(session, track_id, wind_speed=wind_speed)
+
+
+async def returning_delete(session, track_id: int) -> bool:
+    return await storm_tracks.delete_track(session, track_id)
+
+
+async def seed_tracks(session, count: int) -> list[int]:
+    rows = [
+        {
+            "storm_id": BENCH_STORM_ID,
+            "timestamp": datetime(2024, 1, 1),
+            "lat": 10.0,
+            "lon": 110.0,
+            "category": 1,
+            "wind_speed": 20.0,
+        }
+        for _ in range(count)
+    ]
+    result = await session.scalars(insert(StormTrack).returning(StormTrack.track_id), rows)
+    return list(result)
+
+
+async def time_calls(session, func, track_ids: list[int], *args) -> list[float]:
+    timings = []
+    for track_id in track_ids:
+        # Start every call cold, as a fresh request session would.
+        session.expunge_all()
+        start = time.perf_counter()
+        await func(session, track_id, *args)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label: str, timings: list[float]):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"  {label:<28} median {statistics.median(timings):7.3f} ms   p95 {p95:7.3f} ms")
+
+
+async def run_benchmark(iterations: int):
+    async with AsyncSessionLocal() as session:
+        try:
+            session.add(Storm(storm_id=BENCH_STORM_ID, name="Benchmark", start_date=datetime(2024, 1, 1)))
+            await session.flush()
+            track_ids = await seed_tracks(session, iterations * 2)
+            legacy_ids, returning_ids = track_ids[:iterations], track_ids[iterations:]
+
+            print(f"📊 {iterations} calls per variant")
+            print("update_track")
+            report("get/flush/refresh", await time_calls(session, legacy_update, legacy_ids, 30.0))
+            report("UPDATE ... RETURNING", await time_calls(session, returning_update, returning_ids, 30.0))
+            print("delete_track")
+            report("get/delete/flush", await time_calls(session, legacy_delete, legacy_ids))
+            report("DELETE ... RETURNING", await time_calls(session, returning_delete, returning_ids))
+        finally:
+            await session.rollback()
+            await engine.dispose()
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    asyncio.run(run_benchmark(iterations))
@@ -0,0 +1,158 @@
+"""
+Import historical storms from best-track archives into storms/storm_tracks.
+
+Reads IBTrACS CSV files (e.g. ibtracs.WP.list.v04r01.csv) and JTWC/ATCF
+b-deck files (e.g. bwp012024.dat) in chunks of lines. Chunks are parsed on a
+process pool while earlier ones load, with at most two chunks per worker in
+flight, so memory stays bounded whatever the archive size. Each chunk upserts
+its storms and COPYs its track points in one transaction; wind is stored in
+km/h with the Beaufort level as category.
+
+After every loaded chunk the byte offset reached in the file is written to
+the checkpoint file, and a rerun resumes from there. Loading a chunk replaces
+points already stored for the same storm and time, so a chunk that committed
+just before an interruption is not doubled.
+
+Run this with: python import_best_track.py FILE [FILE ...] [--format ibtracs|bdeck]
+    [--chunk-rows 50000] [--workers N] [--checkpoint PATH] [--restart]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.database import AsyncSessionLocal, engine
+from src.storms.best_track import (
+    BDECK, FORMATS, IBTRACS, IBTRACS_COLUMNS, ParsedChunk, detect_format, parse_bdeck, parse_ibtracs
+)
+from src.storms.model import storms, storm_tracks
+
+DEFAULT_CHECKPOINT = Path(__file__).parent / ".best_track_checkpoint.json"
+
+
+class Checkpoint:
+    """Byte offset reached in each imported file, saved atomically after every chunk."""
+
+    def __init__(self, path: Path, restart: bool):
+        self.path = path
+        self.offsets: Dict[str, int] = {}
+        if path.exists() and not restart:
+            self.offsets = json.loads(path.read_text())
+
+    def get(self, source: Path) -> int:
+        return self.offsets.get(str(source.resolve()), 0)
+
+    def save(self, source: Path, offset: int) -> None:
+        self.offsets[str(source.resolve())] = offset
+        temporary = self.path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(self.offsets, indent=2))
+        os.replace(temporary, self.path)
+
+
+def read_chunks(source: Path, file_format: str, start: int, chunk_rows: int) -> Iterator[Tuple[bytes, List[bytes], int]]:
+    """Yield (header, lines, end offset) blocks of data lines from ``start`` on."""
+    with open(source, "rb") as f:
+        header = b""
+        if file_format == IBTRACS:
+            header = f.readline()
+            missing = set(IBTRACS_COLUMNS) - {c.strip() for c in header.decode().split(",")}
+            if missing:
+                raise ValueError(f"{source.name} is missing IBTrACS column(s): {', '.join(sorted(missing))}")
+            # The second line holds units, not data
+            f.readline()
+        f.seek(max(start, f.tell()))
+        lines = []
+        for line in f:
+            if line.strip():
+                lines.append(line)
+            if len(lines) >= chunk_rows:
+                yield header, lines, f.tell()
+                lines = []
+        if lines:
+            yield header, lines, f.tell()
+
+
+async def load_chunk(chunk: ParsedChunk) -> Tuple[int, int]:
+    async with AsyncSessionLocal() as session:
+        await storms.upsert_archive_storms(session, chunk.storms)
+        replaced, inserted = await storm_tracks.replace_archive_tracks(session, chunk.tracks)
+        await session.commit()
+    return replaced, inserted
+
+
+async def import_file(
+    pool: ProcessPoolExecutor,
+    source: Path,
+    file_format: str,
+    checkpoint: Checkpoint,
+    chunk_rows: int,
+    workers: int
+) -> None:
+    start = checkpoint.get(source)
+    if start:
+        print(f"↪️  {source.name}: resuming at byte {start}")
+    parse = partial(parse_bdeck, source.name) if file_format == BDECK else None
+    loop = asyncio.get_running_loop()
+    pending = deque()
+    totals = {"storms": set(), "inserted": 0, "replaced": 0, "rejected": 0}
+    began = time.perf_counter()
+
+    async def load_oldest() -> None:
+        future, end = pending.popleft()
+        chunk = await future
+        replaced, inserted = await load_chunk(chunk)
+        checkpoint.save(source, end)
+        totals["storms"].update(storm[0] for storm in chunk.storms)
+        totals["inserted"] += inserted
+        totals["replaced"] += replaced
+        totals["rejected"] += chunk.rejected
+        print(f"  {source.name}: {totals['inserted']} points, {len(totals['storms'])} storms "
+              f"({time.perf_counter() - began:.1f}s)")
+
+    for header, lines, end in read_chunks(source, file_format, start, chunk_rows):
+        if file_format == IBTRACS:
+            future = loop.run_in_executor(pool, parse_ibtracs, header, lines)
+        else:
+            future = loop.run_in_executor(pool, parse, lines)
+        pending.append((future, end))
+        # Chunks load in file order, so the checkpoint only ever moves forward
+        while len(pending) >= workers * 2:
+            await load_oldest()
+    while pending:
+        await load_oldest()
+
+    print(f"✅ {source.name}: {totals['inserted']} points for {len(totals['storms'])} storms, "
+          f"{totals['replaced']} replaced, {totals['rejected']} rejected "
+          f"in {time.perf_counter() - began:.1f}s")
+
+
+async def main(args: argparse.Namespace) -> None:
+    checkpoint = Checkpoint(args.checkpoint, args.restart)
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            for source in args.files:
+                file_format = args.format or detect_format(source)
+                await import_file(pool, source, file_format, checkpoint, args.chunk_rows, args.workers)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import IBTrACS / JTWC b-deck best-track archives")
+    parser.add_argument("files", nargs="+", type=Path)
+    parser.add_argument("--format", choices=FORMATS, help="Default: from the file name (.csv is IBTrACS)")
+    parser.add_argument("--chunk-rows", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--checkpoint", type=Path, default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and read every file from the start")
+    asyncio.run(main(parser.parse_args()))
@@ -9,12 +9,8 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
-from datetime import datetime
-
-from src.config import settings
-from src.models import Forecast
+from src.database import AsyncSessionLocal, engine
+from src.forecasts.model import ForecastModel
 
 # Sample data from user's request
 SAMPLE_FORECAST_DATA = {
@@ -122,44 +118,24 @@ SAMPLE_JTWC_DATA = {
 async def insert_sample_forecast():
     """Insert sample forecast data for NOWLIVE1234 storm"""
     
-    # Create async engine
-    engine = create_async_engine(
-        settings.DATABASE_URL,
-        echo=True,
-    )
-    
-    # Create async session
-    async_session = sessionmaker(
-        engine, class_=AsyncSession, expire_on_commit=False
-    )
-    
-    async with async_session() as session:
+    async with AsyncSessionLocal() as session:
         try:
-            # Check if forecast already exists
-            from sqlalchemy import select
-            result = await session.execute(
-                select(Forecast).where(Forecast.storm_id == "NOWLIVE1234")
-            )
-            existing = result.scalars().first()
-            
-            if existing:
-                print("⚠️  Forecast for NOWLIVE1234 already exists. Updating...")
-                existing.nchmf = SAMPLE_FORECAST_DATA
-                existing.jtwc = SAMPLE_JTWC_DATA
-                print("✅ Updated existing forecast")
-            else:
-                # Create new forecast
-                forecast = Forecast(
-                    storm_id="NOWLIVE1234",
-                    nchmf=SAMPLE_FORECAST_DATA,
-                    jtwc=SAMPLE_JTWC_DATA
-                )
-                session.add(forecast)
+            # Goes through ForecastModel so the version, points and cone are stored like an API post;
+            # rerunning with unchanged data returns the latest version instead of a new one
+            forecast, created = await ForecastModel.create(session, {
+                "storm_id": "NOWLIVE1234",
+                "nchmf": SAMPLE_FORECAST_DATA,
+                "jtwc": SAMPLE_JTWC_DATA
+            })
+            await session.commit()
+            if created:
                 print("✅ Created new forecast")
+            else:
+                print("⚠️  Forecast for NOWLIVE1234 is already the latest version")
             
-            await session.commit()
             print("\n🎉 Sample forecast data inserted successfully!")
             print(f"   Storm ID: NOWLIVE1234")
+            print(f"   Forecast ID: {forecast.forecast_id}")
             print(f"   NCHMF: {len(SAMPLE_FORECAST_DATA['forecast'])} forecast periods")
             print(f"   JTWC: {len(SAMPLE_JTWC_DATA['forecast'])} forecast periods")
             
@@ -0,0 +1,178 @@
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+import orjson
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.config import config
+
+CHANGED_STORMS_KEY = "changed_storms"
+# Channel committed storm writes are announced on; the storm catalog's listener connection subscribes to it
+VERSIONS_CHANNEL = "storm_versions"
+# Storm ids per notification, well under the 8000-byte payload limit even with every storm listed under each part
+NOTIFY_BATCH = 100
+# Parts of a storm's data with versions of their own, for caches that depend on nothing else
+TRACKS = "tracks"
+FORECASTS = "forecasts"
+
+
+class StormVersions:
+    """
+    Per-storm data versions used to build ETags and key in-process caches.
+
+    A storm's version is bumped after every committed write to the storm or
+    its tracks, news, rescue requests, damage assessments/details and
+    forecasts. The committing transaction also announces its storms on
+    VERSIONS_CHANNEL, and while ``notified`` is set (the storm catalog's
+    listener is connected) other workers' writes bump versions here as they
+    commit. Otherwise every token also carries the current lease window, so
+    those writes become visible once the lease rolls over. Tokens carry a
+    process id and an epoch that changes whenever the listener (re)connects,
+    since notifications sent while disconnected are lost.
+
+    Writes to a storm's tracks or forecasts also bump a version of that part
+    alone (``token(storm_id, TRACKS)``), which caches derived only from that
+    part key on so that news, rescue or damage writes leave them warm.
+
+    With a read replica, a read made shortly after a write may not see it
+    yet; ``settled`` tells callers when a result is safe to cache.
+    """
+
+    def __init__(self, lease_seconds: float, replica_lag_seconds: float = 0.0):
+        self.lease_seconds = lease_seconds
+        self.replica_lag_seconds = replica_lag_seconds
+        self._process = uuid.uuid4().hex[:8]
+        self._epoch = 0
+        self._versions: Dict[Union[str, Tuple[str, str]], int] = {}
+        self._changed_at: Dict[Union[str, Tuple[str, str]], float] = {}
+        self.notified = False
+        # Bumped with every committed write to any storm
+        self.generation = 0
+
+    def token(self, storm_id: str, part: Optional[str] = None) -> str:
+        window = "n" if self.notified else int(time.time() // self.lease_seconds)
+        key = storm_id if part is None else (storm_id, part)
+        return f"{self._process}.{self._epoch}.{window}.{self._versions.get(key, 0)}"
+
+    def bump(self, storm_ids: Iterable[str], parts: Iterable[str] = ()) -> None:
+        """Bump each storm's version and, for every one of ``parts``, the version of that part."""
+        now = time.monotonic()
+        parts = tuple(parts)
+        for storm_id in storm_ids:
+            for key in (storm_id, *((storm_id, part) for part in parts)):
+                self._versions[key] = self._versions.get(key, 0) + 1
+                self._changed_at[key] = now
+        self.generation += 1
+
+    def settled(self, storm_id: str, part: Optional[str] = None) -> bool:
+        """Whether the replica has surely caught up with the last write to the storm (or its ``part``), so a result read now may be cached."""
+        if self.replica_lag_seconds <= 0:
+            return True
+        changed_at = self._changed_at.get(storm_id if part is None else (storm_id, part))
+        return changed_at is None or time.monotonic() - changed_at >= self.replica_lag_seconds
+
+    def set_notified(self, notified: bool) -> None:
+        if notified and not self.notified:
+            self._epoch += 1
+        self.notified = notified
+
+    def notifications(self, changed: Mapping[str, Iterable[str]]) -> List[str]:
+        """VERSIONS_CHANNEL payloads announcing writes to the storms in ``changed``, each with the parts written."""
+        ids = sorted(changed)
+        payloads = []
+        for i in range(0, len(ids), NOTIFY_BATCH):
+            batch = ids[i:i + NOTIFY_BATCH]
+            parts: Dict[str, List[str]] = {}
+            for storm_id in batch:
+                for part in changed[storm_id]:
+                    parts.setdefault(part, []).append(storm_id)
+            payloads.append(orjson.dumps({"process": self._process, "storm_ids": batch, "parts": parts}).decode())
+        return payloads
+
+    def on_notify(self, connection, pid, channel, payload) -> None:
+        message = orjson.loads(payload)
+        # This process bumped its own writes on commit already
+        if message["process"] != self._process:
+            parts: Dict[str, List[str]] = {}
+            for part, storm_ids in message.get("parts", {}).items():
+                for storm_id in storm_ids:
+                    parts.setdefault(storm_id, []).append(part)
+            for storm_id in message["storm_ids"]:
+                self.bump([storm_id], parts.get(storm_id, ()))
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    headers: Dict[str, str]
+    media_type: str = "application/json"
+
+
+class ResponseCache:
+    """LRU of pre-serialized JSON bodies bounded by entry count and total bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._size = 0
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Hashable, entry: CachedResponse) -> None:
+        if len(entry.body) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous.body)
+        self._entries[key] = entry
+        self._size += len(entry.body)
+        while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted.body)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+
+storm_versions = StormVersions(
+    config.RESPONSE_CACHE_LEASE_SECONDS,
+    config.RESPONSE_CACHE_REPLICA_LAG_SECONDS if config.DATABASE_REPLICA_URL else 0.0,
+)
+response_cache = ResponseCache(config.RESPONSE_CACHE_MAX_ENTRIES, config.RESPONSE_CACHE_MAX_BYTES)
+
+
+def mark_storm_changed(session: AsyncSession, storm_id: Optional[str], *parts: str) -> None:
+    """Record a write to ``storm_id`` and any of its ``parts``; their versions are bumped once the session commits."""
+    if storm_id is not None:
+        session.info.setdefault(CHANGED_STORMS_KEY, {}).setdefault(storm_id, set()).update(parts)
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_changed_storms(session):
+    # Delivered by the database only if the transaction commits
+    changed = session.info.get(CHANGED_STORMS_KEY)
+    if changed and config.STORM_CATALOG_ENABLED:
+        for payload in storm_versions.notifications(changed):
+            session.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": VERSIONS_CHANNEL, "payload": payload})
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_changed_storms(session):
+    changed = session.info.pop(CHANGED_STORMS_KEY, None)
+    if changed:
+        for storm_id, parts in changed.items():
+            storm_versions.bump([storm_id], parts)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_storms(session):
+    session.info.pop(CHANGED_STORMS_KEY, None)
@@ -1,13 +1,38 @@
 import os
+from typing import Optional
 from pydantic_settings import BaseSettings
 from src.constants import LogLevel, Environment
 class Config(BaseSettings):
     DATABASE_URL: str
+    # Optional read replica; GET routes fall back to DATABASE_URL when unset or unreachable
+    DATABASE_REPLICA_URL: Optional[str] = None
     APP_NAME: str = "FastAPI Application"
     LOG_DIR: str = "./logs"
     APP_ENV: Environment = Environment.DEVELOPMENT
     LOG_LEVEL: LogLevel = LogLevel.INFO
     APP_VERSION: str = "1.0.0"
+    # Seconds a storm-existence lookup is trusted before re-checking the database
+    STORM_CACHE_TTL_SECONDS: float = 60.0
+    # Serve storm list/detail/existence reads from a LISTEN/NOTIFY-synced in-process copy of the storms table
+    STORM_CATALOG_ENABLED: bool = True
+    # Storm-scoped GET responses: ETag lease (bounds cross-worker staleness while the catalog listener is down) and LRU size
+    RESPONSE_CACHE_LEASE_SECONDS: float = 30.0
+    # With a replica, results read within this long of a storm's last write are not cached (replication lag)
+    RESPONSE_CACHE_REPLICA_LAG_SECONDS: float = 5.0
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    # Storms whose track arrays are kept in memory for position interpolation
+    TRACK_ARRAY_CACHE_MAX_STORMS: int = 256
+    # Longest the in-process track grid index goes without picking up other workers' writes
+    TRACK_INDEX_SYNC_SECONDS: float = 30.0
+    # Forecast versions stored as diffs in a row before one is stored whole again; bounds rebuild work per read
+    FORECAST_KEYFRAME_INTERVAL: int = 12
+    # Storms whose forecast verification tables are kept in memory (rebuilt when the storm's track or forecast version moves)
+    FORECAST_VERIFICATION_CACHE_MAX_STORMS: int = 256
+    # Per-request query count / DB time / pool wait (headers + /metrics/db); defaults to on outside production
+    DB_INSTRUMENTATION_ENABLED: Optional[bool] = None
+    # Warn about a possible N+1 when one request runs the same statement more often than this
+    DB_QUERY_REPEAT_THRESHOLD: int = 10
     GOOGLE_API_KEY: str
     SERPAPI_API_KEY: str
     
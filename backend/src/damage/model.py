@@ -3,7 +3,13 @@ from datetime import datetime
 from src.models import DamageAssessment as DamageAssessmentDB
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Select, delete, insert, select, update
+from src.pagination import paginate
+from src.caching import mark_storm_changed
+from src.storms.summary import storm_summaries
+
+DAMAGE_SORT_KEY = (DamageAssessmentDB.time, DamageAssessmentDB.id)
+DAMAGE_COLUMNS = tuple(DamageAssessmentDB.__table__.columns)
 
 
 class DamageAssessmentTables:
@@ -16,15 +22,16 @@ class DamageAssessmentTables:
     ) -> DamageAssessmentDB:
         time_obj = datetime.strptime(time, "%d-%m-%Y %H:%M") if time else None
         
-        new_damage = DamageAssessmentDB(
-            storm_id=storm_id,
-            detail=detail,
-            time=time_obj
+        mark_storm_changed(session, storm_id)
+        damage = await session.scalar(
+            insert(DamageAssessmentDB).values(
+                storm_id=storm_id,
+                detail=detail,
+                time=time_obj
+            ).returning(DamageAssessmentDB)
         )
-        session.add(new_damage)
-        await session.flush()
-        await session.refresh(new_damage)
-        return new_damage
+        await storm_summaries.damage_added(session, storm_id, damage.id, damage.time)
+        return damage
     
     async def get_damage_by_id(
         self,
@@ -38,11 +45,15 @@ class DamageAssessmentTables:
         session: AsyncSession,
         storm_id: str,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[DamageAssessmentDB]:
-        query = select(DamageAssessmentDB).where(
-            DamageAssessmentDB.storm_id == storm_id
-        ).order_by(DamageAssessmentDB.time.desc()).offset(skip).limit(limit)
+        query = paginate(
+            select(DamageAssessmentDB).where(
+                DamageAssessmentDB.storm_id == storm_id
+            ),
+            DAMAGE_SORT_KEY, skip, limit, cursor, descending=True
+        )
         result = await session.execute(query)
         return result.scalars().all()
     
@@ -61,14 +72,23 @@ class DamageAssessmentTables:
         self,
         session: AsyncSession,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[DamageAssessmentDB]:
-        query = select(DamageAssessmentDB).order_by(
-            DamageAssessmentDB.time.desc()
-        ).offset(skip).limit(limit)
+        query = paginate(
+            select(DamageAssessmentDB),
+            DAMAGE_SORT_KEY, skip, limit, cursor, descending=True
+        )
         result = await session.execute(query)
         return result.scalars().all()
     
+    def export_query(self, storm_id: Optional[str] = None) -> Select:
+        """Every damage assessment (optionally for one storm) in sort-key order, as plain columns."""
+        query = select(*DAMAGE_COLUMNS).order_by(*DAMAGE_SORT_KEY)
+        if storm_id is not None:
+            query = query.where(DamageAssessmentDB.storm_id == storm_id)
+        return query
+    
     async def update_damage(
         self,
         session: AsyncSession,
@@ -76,30 +96,40 @@ class DamageAssessmentTables:
         detail: Optional[dict] = None,
         time: Optional[str] = None
     ) -> Optional[DamageAssessmentDB]:
-        damage = await self.get_damage_by_id(session, damage_id)
-        if not damage:
-            return None
-        
+        values = {}
         if detail is not None:
-            damage.detail = detail
+            values["detail"] = detail
         if time is not None:
-            damage.time = datetime.strptime(time, "%d-%m-%Y %H:%M")
+            values["time"] = datetime.strptime(time, "%d-%m-%Y %H:%M")
         
-        await session.flush()
-        await session.refresh(damage)
-        return damage
+        if not values:
+            return await self.get_damage_by_id(session, damage_id)
+        
+        updated = await session.scalar(
+            update(DamageAssessmentDB)
+            .where(DamageAssessmentDB.id == damage_id)
+            .values(**values)
+            .returning(DamageAssessmentDB)
+            .execution_options(populate_existing=True)
+        )
+        if updated is not None:
+            mark_storm_changed(session, updated.storm_id)
+            if "time" in values:
+                await storm_summaries.damage_changed(session, updated.storm_id)
+        return updated
     
     async def delete_damage(
         self,
         session: AsyncSession,
         damage_id: int
     ) -> bool:
-        damage = await self.get_damage_by_id(session, damage_id)
-        if not damage:
+        deleted = (await session.execute(
+            delete(DamageAssessmentDB).where(DamageAssessmentDB.id == damage_id).returning(DamageAssessmentDB.storm_id)
+        )).first()
+        if deleted is None:
             return False
-        
-        await session.delete(damage)
-        await session.flush()
+        mark_storm_changed(session, deleted.storm_id)
+        await storm_summaries.damage_changed(session, deleted.storm_id)
         return True
 
 
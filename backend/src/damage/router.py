@@ -1,12 +1,14 @@
-from typing import List, Annotated
+from typing import List, Annotated, Optional
 from fastapi import (
     APIRouter,
     Body,
     Depends,
     Path,
+    Query,
     status,
 )
-from src.dependencies import DBSession
+from src.dependencies import DBSession, ReadOnlyDBSession, Cursor, StormCache
+from src.export import ExportFormat, stream_export
 from src.schemas import (
     DamageAssessmentCreate,
     DamageAssessmentUpdate,
@@ -15,6 +17,7 @@ from src.schemas import (
 )
 
 from src.damage.service import DamageAssessmentService
+from src.damage.model import DAMAGE_SORT_KEY
 
 service = DamageAssessmentService()
 router = APIRouter(prefix="/api/v1/damage", tags=["damage-assessments"])
@@ -33,43 +36,70 @@ async def create_damage(
 @router.get("/", response_model=List[DamageAssessmentResponse])
 async def get_all_damage(
     pagination: Annotated[PaginationRequest, Depends()],
-    session: DBSession = None,
+    keyset: Cursor,
+    session: ReadOnlyDBSession = None,
 ):
     """Get all damage assessments with pagination"""
-    damage_list = await service.get_all_damage(session=session, skip=pagination.skip, limit=pagination.limit)
-    return damage_list
+    damage_list = await service.get_all_damage(
+        session=session,
+        skip=pagination.skip,
+        limit=pagination.limit,
+        cursor=keyset.cursor
+    )
+    return keyset.page(damage_list, pagination.limit, DAMAGE_SORT_KEY)
 
 
 @router.get("/storm/{storm_id}", response_model=List[DamageAssessmentResponse])
 async def get_damage_by_storm(
     storm_id: str,
     pagination: Annotated[PaginationRequest, Depends()],
-    session: DBSession = None,
+    keyset: Cursor,
+    cache: StormCache,
+    session: ReadOnlyDBSession = None,
 ):
     """Get all damage assessments for a specific storm"""
+    cached = cache.lookup(storm_id)
+    if cached is not None:
+        return cached
     damage_list = await service.get_damage_by_storm(
         session=session,
         storm_id=storm_id,
         skip=pagination.skip,
-        limit=pagination.limit
+        limit=pagination.limit,
+        cursor=keyset.cursor
     )
-    return damage_list
+    return cache.store(keyset.page(damage_list, pagination.limit, DAMAGE_SORT_KEY), List[DamageAssessmentResponse])
 
 
 @router.get("/storm/{storm_id}/latest", response_model=DamageAssessmentResponse)
 async def get_latest_damage_by_storm(
     storm_id: str,
-    session: DBSession = None,
+    cache: StormCache,
+    session: ReadOnlyDBSession = None,
 ):
     """Get the latest damage assessment for a specific storm"""
+    cached = cache.lookup(storm_id)
+    if cached is not None:
+        return cached
     damage = await service.get_latest_damage_by_storm(session=session, storm_id=storm_id)
-    return damage
+    return cache.store(damage, DamageAssessmentResponse)
+
+
+@router.get("/export")
+async def export_damage(
+    export_format: ExportFormat = "ndjson",
+    storm_id: Optional[str] = Query(None, description="Only export rows for this storm"),
+    session: ReadOnlyDBSession = None,
+):
+    """Stream every damage assessment (optionally for one storm) as NDJSON or CSV"""
+    query = await service.export_damage(session=session, storm_id=storm_id)
+    return stream_export(query, export_format, f"damage_assessments_{storm_id or 'all'}")
 
 
 @router.get("/{damage_id}", response_model=DamageAssessmentResponse)
 async def get_damage(
     damage_id: int = Path(...),
-    session: DBSession = None,
+    session: ReadOnlyDBSession = None,
 ):
     """Get a damage assessment by ID"""
     damage = await service.get_damage(session=session, damage_id=damage_id)
@@ -1,9 +1,10 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from fastapi import HTTPException, status
+from sqlalchemy import Select
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.damage.model import damage_assessments
-from src.storms.model import storms
+from src.storms.registry import storm_registry
 from src.models import DamageAssessment as DamageAssessmentDB
 
 
@@ -14,8 +15,7 @@ class DamageAssessmentService:
         damage_data: Dict[str, Any]
     ) -> DamageAssessmentDB:
         # Verify storm exists
-        storm = await storms.get_storm_by_id(session, damage_data["storm_id"])
-        if not storm:
+        if not await storm_registry.exists(session, damage_data["storm_id"]):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Storm with id {damage_data['storm_id']} not found"
@@ -47,32 +47,29 @@ class DamageAssessmentService:
         session: AsyncSession,
         storm_id: str,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[DamageAssessmentDB]:
-        # Verify storm exists
-        storm = await storms.get_storm_by_id(session, storm_id)
-        if not storm:
+        damage_list = await damage_assessments.get_damage_by_storm(session, storm_id, skip, limit, cursor)
+        if not damage_list and not await storm_registry.exists(session, storm_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Storm with id {storm_id} not found"
             )
-        return await damage_assessments.get_damage_by_storm(session, storm_id, skip, limit)
+        return damage_list
     
     async def get_latest_damage_by_storm(
         self,
         session: AsyncSession,
         storm_id: str
     ) -> DamageAssessmentDB:
-        # Verify storm exists
-        storm = await storms.get_storm_by_id(session, storm_id)
-        if not storm:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Storm with id {storm_id} not found"
-            )
-        
         damage = await damage_assessments.get_latest_damage_by_storm(session, storm_id)
         if not damage:
+            if not await storm_registry.exists(session, storm_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Storm with id {storm_id} not found"
+                )
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"No damage assessment found for storm {storm_id}"
@@ -83,9 +80,22 @@ class DamageAssessmentService:
         self,
         session: AsyncSession,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[DamageAssessmentDB]:
-        return await damage_assessments.get_all_damage(session, skip, limit)
+        return await damage_assessments.get_all_damage(session, skip, limit, cursor)
+    
+    async def export_damage(
+        self,
+        session: AsyncSession,
+        storm_id: Optional[str] = None
+    ) -> Select:
+        if storm_id is not None and not await storm_registry.exists(session, storm_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Storm with id {storm_id} not found"
+            )
+        return damage_assessments.export_query(storm_id)
     
     async def update_damage(
         self,
@@ -1,7 +1,37 @@
-from typing import Optional, List
+import math
+from typing import Any, Optional, List, Sequence, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Select, and_, delete, insert, or_, select, update
 from src.models import DamageDetail as DamageDetailDB
+from src.pagination import paginate
+from src.caching import mark_storm_changed
+from src.storms.summary import storm_summaries
+
+DAMAGE_DETAIL_SORT_KEY = (DamageDetailDB.created_at, DamageDetailDB.id)
+# Copied from content for indexing; not part of DamageDetailResponse
+DAMAGE_DETAIL_COORDINATE_COLUMNS = ("lat", "lon")
+# Plain columns for the fast read path; they mirror DamageDetailResponse
+DAMAGE_DETAIL_COLUMNS = tuple(
+    c for c in DamageDetailDB.__table__.columns if c.key not in DAMAGE_DETAIL_COORDINATE_COLUMNS
+)
+
+
+def _coordinate(value: Any, limit: float) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) and -limit <= value <= limit else None
+
+
+def content_coordinates(content: Any) -> Tuple[Optional[float], Optional[float]]:
+    """(lat, lon) from the ``latitude``/``longitude`` the geocoder stores in content; (None, None) unless both are valid."""
+    if not isinstance(content, dict):
+        return None, None
+    lat, lon = _coordinate(content.get("latitude"), 90.0), _coordinate(content.get("longitude"), 180.0)
+    return (lat, lon) if lat is not None and lon is not None else (None, None)
 
 
 class DamageDetailTables:
@@ -11,14 +41,18 @@ class DamageDetailTables:
         storm_id: str,
         content: dict
     ) -> DamageDetailDB:
-        new_damage_detail = DamageDetailDB(
-            storm_id=storm_id,
-            content=content
+        mark_storm_changed(session, storm_id)
+        lat, lon = content_coordinates(content)
+        damage_detail = await session.scalar(
+            insert(DamageDetailDB).values(
+                storm_id=storm_id,
+                content=content,
+                lat=lat,
+                lon=lon
+            ).returning(DamageDetailDB)
         )
-        session.add(new_damage_detail)
-        await session.flush()
-        await session.refresh(new_damage_detail)
-        return new_damage_detail
+        await storm_summaries.damage_detail_added(session, storm_id, damage_detail.id)
+        return damage_detail
     
     async def get_damage_detail_by_id(
         self,
@@ -32,25 +66,59 @@ class DamageDetailTables:
         session: AsyncSession,
         storm_id: str,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        as_rows: bool = False
     ) -> List[DamageDetailDB]:
-        query = select(DamageDetailDB).where(
-            DamageDetailDB.storm_id == storm_id
-        ).order_by(DamageDetailDB.created_at.desc()).offset(skip).limit(limit)
+        query = paginate(
+            (select(*DAMAGE_DETAIL_COLUMNS) if as_rows else select(DamageDetailDB)).where(
+                DamageDetailDB.storm_id == storm_id
+            ),
+            DAMAGE_DETAIL_SORT_KEY, skip, limit, cursor, descending=True
+        )
         result = await session.execute(query)
-        return result.scalars().all()
+        return result.all() if as_rows else result.scalars().all()
     
     async def get_all_damage_details(
         self,
         session: AsyncSession,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        as_rows: bool = False
     ) -> List[DamageDetailDB]:
-        query = select(DamageDetailDB).order_by(
-            DamageDetailDB.created_at.desc()
-        ).offset(skip).limit(limit)
+        query = paginate(
+            select(*DAMAGE_DETAIL_COLUMNS) if as_rows else select(DamageDetailDB),
+            DAMAGE_DETAIL_SORT_KEY, skip, limit, cursor, descending=True
+        )
+        result = await session.execute(query)
+        return result.all() if as_rows else result.scalars().all()
+    
+    async def get_damage_details_in_boxes(
+        self,
+        session: AsyncSession,
+        storm_id: str,
+        bboxes: Sequence[Tuple[float, float, float, float]]
+    ) -> List[Any]:
+        """The storm's damage details located in any of ``bboxes`` ((min_lon, min_lat, max_lon, max_lat) each)."""
+        if not bboxes:
+            return []
+        query = select(*DAMAGE_DETAIL_COLUMNS, DamageDetailDB.lat, DamageDetailDB.lon).where(
+            DamageDetailDB.storm_id == storm_id,
+            or_(*(
+                and_(DamageDetailDB.lat.between(min_lat, max_lat), DamageDetailDB.lon.between(min_lon, max_lon))
+                for min_lon, min_lat, max_lon, max_lat in bboxes
+            ))
+        )
         result = await session.execute(query)
-        return result.scalars().all()
+        return result.all()
+    
+    def export_query(self, storm_id: Optional[str] = None) -> Select:
+        """Every damage detail (optionally for one storm) in sort-key order, as plain columns."""
+        query = select(*DAMAGE_DETAIL_COLUMNS).order_by(*DAMAGE_DETAIL_SORT_KEY)
+        if storm_id is not None:
+            query = query.where(DamageDetailDB.storm_id == storm_id)
+        return query
     
     async def update_damage_detail(
         self,
@@ -58,28 +126,37 @@ class DamageDetailTables:
         damage_detail_id: int,
         content: Optional[dict] = None
     ) -> Optional[DamageDetailDB]:
-        damage_detail = await self.get_damage_detail_by_id(session, damage_detail_id)
-        if not damage_detail:
-            return None
-        
+        values = {}
         if content is not None:
-            damage_detail.content = content
+            values["content"] = content
+            values["lat"], values["lon"] = content_coordinates(content)
         
-        await session.flush()
-        await session.refresh(damage_detail)
-        return damage_detail
+        if not values:
+            return await self.get_damage_detail_by_id(session, damage_detail_id)
+        
+        updated = await session.scalar(
+            update(DamageDetailDB)
+            .where(DamageDetailDB.id == damage_detail_id)
+            .values(**values)
+            .returning(DamageDetailDB)
+            .execution_options(populate_existing=True)
+        )
+        if updated is not None:
+            mark_storm_changed(session, updated.storm_id)
+        return updated
     
     async def delete_damage_detail(
         self,
         session: AsyncSession,
         damage_detail_id: int
     ) -> bool:
-        damage_detail = await self.get_damage_detail_by_id(session, damage_detail_id)
-        if not damage_detail:
+        deleted = (await session.execute(
+            delete(DamageDetailDB).where(DamageDetailDB.id == damage_detail_id).returning(DamageDetailDB.storm_id)
+        )).first()
+        if deleted is None:
             return False
-        
-        await session.delete(damage_detail)
-        await session.flush()
+        mark_storm_changed(session, deleted.storm_id)
+        await storm_summaries.damage_details_changed(session, deleted.storm_id)
         return True
 
 
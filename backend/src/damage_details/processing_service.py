@@ -84,8 +84,6 @@ class DamageProcessingService:
                     storm_id=storm_id,
                     content=content
                 )
-                await db.flush()
-                await db.refresh(damage_record)
                 
                 created_records.append({
                     "id": damage_record.id,
@@ -1,7 +1,9 @@
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Query, status
 
-from src.dependencies import DBSession
+from src.dependencies import DBSession, ReadOnlyDBSession, Cursor, StormCache, FastPath
+from src.serialization import rows_response, rows_to_json
+from src.export import ExportFormat, stream_export
 from src.schemas import (
     DamageDetailCreate, 
     DamageDetailUpdate, 
@@ -10,6 +12,7 @@ from src.schemas import (
     DamageTextProcessResponse
 )
 from src.damage_details.service import DamageDetailService
+from src.damage_details.model import DAMAGE_DETAIL_SORT_KEY
 from src.damage_details.processing_service import damage_processing_service
 
 router = APIRouter(prefix="/api/v1/damage-details", tags=["damage-details"])
@@ -41,14 +44,39 @@ async def create_damage_detail(
     description="Retrieve all damage details with pagination support"
 )
 async def get_all_damage_details(
-    db: DBSession,
+    db: ReadOnlyDBSession,
+    keyset: Cursor,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
-    limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return")
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
+    fast: FastPath = False
 ):
     """
     Get all damage details with pagination.
     """
-    return await DamageDetailService.get_all_damage_details(db, skip, limit)
+    damage_detail_list = await DamageDetailService.get_all_damage_details(
+        db, skip, limit, keyset.cursor, as_rows=fast
+    )
+    page = keyset.page(damage_detail_list, limit, DAMAGE_DETAIL_SORT_KEY)
+    if fast:
+        return rows_response(page, keyset.response)
+    return page
+
+
+@router.get(
+    "/export",
+    summary="Export damage details",
+    description="Stream every damage detail (optionally for one storm) as NDJSON or CSV over a server-side cursor"
+)
+async def export_damage_details(
+    db: ReadOnlyDBSession,
+    export_format: ExportFormat = "ndjson",
+    storm_id: Optional[str] = Query(None, description="Only export rows for this storm")
+):
+    """
+    Export damage details without pagination; the response starts streaming immediately.
+    """
+    query = await DamageDetailService.export_damage_details(db, storm_id)
+    return stream_export(query, export_format, f"damage_details_{storm_id or 'all'}")
 
 
 @router.get(
@@ -59,7 +87,7 @@ async def get_all_damage_details(
 )
 async def get_damage_detail_by_id(
     damage_detail_id: int,
-    db: DBSession
+    db: ReadOnlyDBSession
 ):
     """
     Get a specific damage detail by ID.
@@ -75,14 +103,26 @@ async def get_damage_detail_by_id(
 )
 async def get_damage_details_by_storm(
     storm_id: str,
-    db: DBSession,
+    cache: StormCache,
+    db: ReadOnlyDBSession,
+    keyset: Cursor,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
-    limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return")
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
+    fast: FastPath = False
 ):
     """
     Get all damage details for a specific storm with pagination.
     """
-    return await DamageDetailService.get_damage_details_by_storm(db, storm_id, skip, limit)
+    cached = cache.lookup(storm_id)
+    if cached is not None:
+        return cached
+    damage_detail_list = await DamageDetailService.get_damage_details_by_storm(
+        db, storm_id, skip, limit, keyset.cursor, as_rows=fast
+    )
+    page = keyset.page(damage_detail_list, limit, DAMAGE_DETAIL_SORT_KEY)
+    if fast:
+        return cache.store_json(rows_to_json(page))
+    return cache.store(page, List[DamageDetailResponse])
 
 
 @router.put(
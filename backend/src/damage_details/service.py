@@ -1,10 +1,11 @@
 from typing import List, Optional
+from sqlalchemy import Select
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
 from src.damage_details.model import damage_details
 from src.schemas import DamageDetailCreate, DamageDetailUpdate, DamageDetailResponse
-from src.models import Storm
+from src.storms.registry import storm_registry
 
 
 class DamageDetailService:
@@ -13,8 +14,7 @@ class DamageDetailService:
     @staticmethod
     async def verify_storm_exists(db: AsyncSession, storm_id: str) -> bool:
         """Verify if a storm exists."""
-        storm = await db.get(Storm, storm_id)
-        return storm is not None
+        return await storm_registry.exists(db, storm_id)
 
     @staticmethod
     async def create_damage_detail(
@@ -59,10 +59,14 @@ class DamageDetailService:
     async def get_all_damage_details(
         db: AsyncSession, 
         skip: int = 0, 
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        as_rows: bool = False
     ) -> List[DamageDetailResponse]:
         """Get all damage details with pagination."""
-        damage_detail_list = await damage_details.get_all_damage_details(db, skip, limit)
+        damage_detail_list = await damage_details.get_all_damage_details(db, skip, limit, cursor, as_rows)
+        if as_rows:
+            return damage_detail_list
         return [DamageDetailResponse.model_validate(d) for d in damage_detail_list]
 
     @staticmethod
@@ -70,22 +74,34 @@ class DamageDetailService:
         db: AsyncSession, 
         storm_id: str, 
         skip: int = 0, 
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        as_rows: bool = False
     ) -> List[DamageDetailResponse]:
         """Get all damage details for a specific storm."""
-        # Verify storm exists
-        storm_exists = await DamageDetailService.verify_storm_exists(db, storm_id)
-        if not storm_exists:
+        damage_detail_list = await damage_details.get_damage_details_by_storm(
+            db, storm_id, skip, limit, cursor, as_rows
+        )
+        # Only an empty page needs the storm existence check
+        if not damage_detail_list and not await DamageDetailService.verify_storm_exists(db, storm_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Storm with id '{storm_id}' not found"
             )
-
-        damage_detail_list = await damage_details.get_damage_details_by_storm(
-            db, storm_id, skip, limit
-        )
+        if as_rows:
+            return damage_detail_list
         return [DamageDetailResponse.model_validate(d) for d in damage_detail_list]
 
+    @staticmethod
+    async def export_damage_details(db: AsyncSession, storm_id: Optional[str] = None) -> Select:
+        """Query streaming every damage detail, optionally for one storm."""
+        if storm_id is not None and not await DamageDetailService.verify_storm_exists(db, storm_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Storm with id '{storm_id}' not found"
+            )
+        return damage_details.export_query(storm_id)
+
     @staticmethod
     async def update_damage_detail(
         db: AsyncSession, 
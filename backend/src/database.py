@@ -1,7 +1,12 @@
+import asyncio
+
+import asyncpg
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import text
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.engine import make_url
+from sqlalchemy import event, text
 from src.logger import logger
+from src.instrumentation import InstrumentedQueuePool, instrument_engine
 
 from src.config import config
 
@@ -11,6 +16,7 @@ engine = create_async_engine(
     pool_pre_ping=True,
     pool_size=5,
     max_overflow=10,
+    poolclass=InstrumentedQueuePool,
     connect_args={"statement_cache_size": 0, "prepared_statement_cache_size": 0},
 )
 
@@ -23,6 +29,63 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+def asyncpg_dsn(url: str) -> str:
+    return make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+async def _connect_replica() -> asyncpg.Connection:
+    """
+    Open a driver connection to the read replica, falling back to the primary
+    when the replica is unreachable so read traffic keeps flowing.
+    """
+    try:
+        return await asyncpg.connect(
+            asyncpg_dsn(config.DATABASE_REPLICA_URL), statement_cache_size=0, timeout=5
+        )
+    except (OSError, asyncio.TimeoutError, asyncpg.PostgresError) as e:
+        logger.warning(f"[DB] Read replica unavailable, falling back to primary: {e}")
+        return await asyncpg.connect(asyncpg_dsn(config.DATABASE_URL), statement_cache_size=0)
+
+
+if config.DATABASE_REPLICA_URL:
+    read_engine = create_async_engine(
+        str(config.DATABASE_REPLICA_URL),
+        echo=False,
+        pool_pre_ping=True,
+        pool_size=5,
+        max_overflow=10,
+        # Recycle so connections opened against the primary during a replica
+        # outage move back to the replica once it recovers.
+        pool_recycle=300,
+        poolclass=InstrumentedQueuePool,
+        async_creator=_connect_replica,
+    )
+else:
+    read_engine = engine
+
+instrument_engine(engine)
+if read_engine is not engine:
+    instrument_engine(read_engine)
+
+
+class ReadOnlySession(Session):
+    """Session whose transactions are opened READ ONLY and never committed."""
+
+
+@event.listens_for(ReadOnlySession, "after_begin")
+def _set_transaction_read_only(session, transaction, connection):
+    connection.exec_driver_sql("SET TRANSACTION READ ONLY")
+
+
+ReadOnlySessionLocal = async_sessionmaker(
+    bind=read_engine,
+    class_=AsyncSession,
+    sync_session_class=ReadOnlySession,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -38,4 +101,4 @@ async def check_database() -> bool:
         return True
     except Exception as e:
         logger.info(f"[DB HEALTH] Connection failed: {e}")
-        return False
\ No newline at end of file
+        return False
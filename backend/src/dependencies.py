@@ -1,9 +1,13 @@
-from typing import AsyncGenerator, Annotated
+from functools import lru_cache
+from typing import Any, AsyncGenerator, Annotated, Hashable, Optional, Sequence
 
-from src.database import AsyncSessionLocal
+from src.database import AsyncSessionLocal, ReadOnlySessionLocal
+from src.pagination import NEXT_CURSOR_HEADER, encode_cursor
+from src.caching import CachedResponse, response_cache, storm_versions
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import Depends
+from fastapi import Depends, Query, Request, Response, status
+from pydantic import TypeAdapter
 
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
@@ -18,6 +22,112 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_read_only_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """Read-only transaction on the replica engine; closed without committing."""
+    async with ReadOnlySessionLocal() as session:
+        yield session
+
+
+class KeysetCursor:
+    """
+    Keyset pagination alongside PaginationRequest/TrackPaginationRequest.
+
+    Accepts the opaque ``cursor`` query parameter and, when a page is full,
+    publishes the cursor for the next page in the ``X-Next-Cursor`` header.
+    """
+
+    def __init__(
+        self,
+        response: Response,
+        cursor: Optional[str] = Query(
+            None,
+            description="Opaque cursor from the X-Next-Cursor header; when set, skip is ignored"
+        ),
+    ):
+        self.response = response
+        self.cursor = cursor
+
+    def page(self, rows: Sequence[Any], limit: int, sort_key: Sequence[Any]) -> Sequence[Any]:
+        if rows and len(rows) == limit:
+            last = rows[-1]
+            self.response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+                [getattr(last, column.key) for column in sort_key]
+            )
+        return rows
+
+
+@lru_cache(maxsize=None)
+def _type_adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # Weak comparison: W/"x" and "x" name the same representation
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+class StormResponseCache:
+    """
+    Conditional GET and serialized-response caching for storm-scoped routes.
+
+    ``lookup`` answers from the storm's data version alone, before any query
+    runs: 304 when If-None-Match still matches, or the cached JSON bytes for
+    this path and query string. Otherwise the route passes its result to
+    ``store``, which serializes it once and caches it under the version
+    ``lookup`` saw, so a write racing the query can only make that copy newer.
+    A result that may have been read from a replica still behind the storm's
+    last write is returned without caching it or sending an ETag.
+    """
+
+    def __init__(self, request: Request, response: Response):
+        self.request = request
+        self.response = response
+        self.storm_id: Optional[str] = None
+        self.etag: Optional[str] = None
+        self.key: Optional[Hashable] = None
+
+    def _headers(self) -> dict:
+        return {"ETag": self.etag, "Cache-Control": "no-cache"}
+
+    def lookup(self, storm_id: str) -> Optional[Response]:
+        self.storm_id = storm_id
+        version = storm_versions.token(storm_id)
+        self.etag = f'W/"{version}"'
+        if _etag_matches(self.request.headers.get("if-none-match"), self.etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=self._headers())
+
+        self.key = (self.request.url.path, tuple(sorted(self.request.query_params.multi_items())), version)
+        cached = response_cache.get(self.key)
+        if cached is None:
+            return None
+        return Response(
+            content=cached.body,
+            media_type=cached.media_type,
+            headers={**cached.headers, **self._headers()},
+        )
+
+    def store(self, content: Any, response_type: Any) -> Response:
+        adapter = _type_adapter(response_type)
+        return self.store_json(adapter.dump_json(adapter.validate_python(content, from_attributes=True)))
+
+    def store_json(self, body: bytes, media_type: str = "application/json") -> Response:
+        # Keep headers other dependencies set on the injected response (e.g. X-Next-Cursor)
+        headers = dict(self.response.headers)
+        if not storm_versions.settled(self.storm_id):
+            return Response(content=body, media_type=media_type, headers={**headers, "Cache-Control": "no-cache"})
+        response_cache.put(self.key, CachedResponse(body, headers, media_type))
+        return Response(content=body, media_type=media_type, headers={**headers, **self._headers()})
+
+
 DBSession = Annotated[AsyncSession, Depends(get_db_session)]
+ReadOnlyDBSession = Annotated[AsyncSession, Depends(get_read_only_db_session)]
+Cursor = Annotated[KeysetCursor, Depends()]
+StormCache = Annotated[StormResponseCache, Depends()]
+FastPath = Annotated[bool, Query(
+    description="Select plain columns and serialize them directly, skipping ORM objects and response validation"
+)]
 
-__all__ = ["DBSession"]
\ No newline at end of file
+__all__ = ["DBSession", "ReadOnlyDBSession", "Cursor", "StormCache", "FastPath"]
@@ -0,0 +1,75 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import orjson
+from sqlalchemy import Row
+
+# Rescue requests still waiting for help
+PENDING_STATUS = "pending"
+
+
+def zone_bbox(zone: Row) -> Tuple[float, float, float, float]:
+    """(min_lon, min_lat, max_lon, max_lat) of a forecast point's danger zone."""
+    return zone.danger_min_lon, zone.danger_min_lat, zone.danger_max_lon, zone.danger_max_lat
+
+
+def earliest_leads(sites: Sequence[Row], zones: Sequence[Row]) -> np.ndarray:
+    """
+    Lead time of the earliest danger zone containing each site (with lat and
+    lon), testing every site against every zone at once; -1 for none.
+    """
+    if not sites or not zones:
+        return np.full(len(sites), -1)
+    lat = np.array([site.lat for site in sites], dtype=float)[:, None]
+    lon = np.array([site.lon for site in sites], dtype=float)[:, None]
+    bounds = np.array([zone_bbox(zone) for zone in zones], dtype=float)
+    inside = (
+        (lon >= bounds[:, 0]) & (lat >= bounds[:, 1]) & (lon <= bounds[:, 2]) & (lat <= bounds[:, 3])
+    )
+    leads = np.array([zone.lead_hours for zone in zones])
+    return np.where(inside.any(axis=1), np.where(inside, leads, np.iinfo(np.int64).max).min(axis=1), -1)
+
+
+def impact_json(
+    storm_id: str,
+    forecast_id: Optional[int],
+    zones: Sequence[Row],
+    requests: Sequence[Row],
+    details: Sequence[Row]
+) -> bytes:
+    """
+    Pending rescue requests and damage details inside the danger zones of a
+    forecast, grouped by lead time. A site is listed once, under the earliest
+    lead whose zone (of any source) contains it.
+    """
+    by_lead: Dict[int, Dict[str, Any]] = {}
+    for zone in sorted(zones, key=lambda z: (z.lead_hours, z.source)):
+        lead = by_lead.setdefault(zone.lead_hours, {
+            "lead_hours": zone.lead_hours,
+            "valid_at": zone.valid_at,
+            "zones": [],
+            "rescue_requests": [],
+            "damage_details": [],
+        })
+        lead["valid_at"] = min(lead["valid_at"], zone.valid_at)
+        lead["zones"].append({
+            "source": zone.source,
+            "min_lat": zone.danger_min_lat,
+            "max_lat": zone.danger_max_lat,
+            "min_lon": zone.danger_min_lon,
+            "max_lon": zone.danger_max_lon,
+            "risk_level": zone.risk_level,
+        })
+    for key, sites in (("rescue_requests", requests), ("damage_details", details)):
+        for site, lead in zip(sites, earliest_leads(sites, zones).tolist()):
+            if lead >= 0:
+                by_lead[lead][key].append(site._asdict())
+
+    leads: List[Dict[str, Any]] = [by_lead[lead] for lead in sorted(by_lead)]
+    return orjson.dumps({
+        "storm_id": storm_id,
+        "forecast_id": forecast_id,
+        "rescue_request_count": sum(len(lead["rescue_requests"]) for lead in leads),
+        "damage_detail_count": sum(len(lead["damage_details"]) for lead in leads),
+        "leads": leads,
+    })
@@ -1,56 +1,227 @@
-from typing import Optional, List
+from collections import namedtuple
+from typing import Any, Collection, Dict, Optional, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, desc
+from sqlalchemy import Select, insert, null, select, tuple_, update, delete, desc
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm.attributes import set_committed_value
 
-from src.models import Forecast, Storm
+from src.config import config
+from src.models import Forecast, ForecastCone, ForecastPoint, Storm
+from src.forecasts.cone import forecast_cone_json
+from src.forecasts.points import SOURCES, forecast_points
+from src.forecasts.versions import Payloads, apply_delta, content_hash, payload_delta
+from src.pagination import paginate
+from src.caching import FORECASTS, mark_storm_changed
+from src.storms.registry import storm_registry
+from src.storms.summary import storm_summaries
+
+FORECAST_SORT_KEY = (Forecast.created_at, Forecast.forecast_id)
+# How a version is stored (see Forecast); not part of ForecastResponse
+FORECAST_VERSION_COLUMNS = ("content_hash", "base_id", "delta", "delta_depth")
+# Plain columns for the fast read path; they mirror ForecastResponse
+FORECAST_COLUMNS = tuple(c for c in Forecast.__table__.columns if c.key not in FORECAST_VERSION_COLUMNS)
+# A fast-path row whose bulletins were rebuilt from diffs
+ForecastRow = namedtuple("ForecastRow", [c.key for c in FORECAST_COLUMNS])
+FORECAST_POINT_SORT_KEY = (ForecastPoint.storm_id, ForecastPoint.lead_hours, ForecastPoint.point_id)
+FORECAST_POINT_COLUMNS = tuple(ForecastPoint.__table__.columns)
 
 
 class ForecastModel:
     """Database operations for Forecast table."""
 
     @staticmethod
-    async def create(db: AsyncSession, forecast_data: dict) -> Forecast:
-        """Create a new forecast."""
-        forecast = Forecast(**forecast_data)
-        db.add(forecast)
-        await db.flush()
-        await db.refresh(forecast)
-        return forecast
+    async def create(db: AsyncSession, forecast_data: dict) -> Tuple[Forecast, bool]:
+        """
+        Create a new forecast version; returns it and whether it was created.
+
+        A re-post of the storm's latest version (same content hash) is not
+        stored again: the latest version is returned instead. Otherwise the
+        version is stored as a diff against the latest one, unless that diff
+        is no smaller than the content or the chain of diffs behind the latest
+        one is already FORECAST_KEYFRAME_INTERVAL long.
+        """
+        payloads = {source: forecast_data.get(source) for source in SOURCES}
+        digest = content_hash(payloads)
+        latest = await ForecastModel.get_latest_by_storm_id(db, forecast_data["storm_id"])
+        if latest is not None and latest.content_hash == digest:
+            return latest, False
+
+        stored = ForecastModel._stored(payloads)
+        if latest is not None and latest.delta_depth + 1 < config.FORECAST_KEYFRAME_INTERVAL:
+            stored = ForecastModel._stored(payloads, latest, ForecastModel.payloads(latest))
+        mark_storm_changed(db, forecast_data.get("storm_id"), FORECASTS)
+        forecast = await db.scalar(
+            insert(Forecast).values(**{**forecast_data, **stored, "content_hash": digest}).returning(Forecast)
+        )
+        ForecastModel._fill(forecast, payloads)
+        await ForecastModel._write_points(db, forecast, SOURCES)
+        await storm_summaries.forecast_added(db, forecast.storm_id, forecast.forecast_id)
+        return forecast, True
+
+    @staticmethod
+    def payloads(forecast: Any) -> Payloads:
+        """The bulletins (source -> JSON) of a restored forecast."""
+        return {source: getattr(forecast, source) for source in SOURCES}
+
+    @staticmethod
+    def _fill(forecast: Forecast, payloads: Payloads) -> None:
+        # Loaded state rather than a change, so nothing is written back on flush
+        for source in SOURCES:
+            set_committed_value(forecast, source, payloads[source])
+
+    @staticmethod
+    def _stored(payloads: Payloads, base: Optional[Any] = None, base_payloads: Optional[Payloads] = None) -> dict:
+        """Column values storing ``payloads`` as a diff against ``base`` when that is smaller, else whole."""
+        delta = payload_delta(base_payloads, payloads) if base is not None else None
+        # null() rather than None, which a JSON column would store as a JSON 'null'
+        if delta is None:
+            return {**payloads, "base_id": None, "delta": null(), "delta_depth": 0}
+        return {
+            **{source: null() for source in SOURCES},
+            "base_id": base.forecast_id,
+            "delta": delta,
+            "delta_depth": base.delta_depth + 1,
+        }
+
+    @staticmethod
+    async def _rebuild(db: AsyncSession, forecast_ids: Collection[int]) -> Dict[int, Payloads]:
+        """
+        Bulletins of the diff-stored forecasts among ``forecast_ids``. Their
+        base chains down to the nearest whole version are read in one
+        recursive query and every diff is applied once.
+        """
+        chain = (
+            select(Forecast.forecast_id, Forecast.base_id)
+            .where(Forecast.forecast_id.in_(forecast_ids), Forecast.base_id.isnot(None))
+            .cte("chain", recursive=True)
+        )
+        chain = chain.union(
+            select(Forecast.forecast_id, Forecast.base_id).join(chain, Forecast.forecast_id == chain.c.base_id)
+        )
+        stored = {
+            row.forecast_id: row
+            for row in (await db.execute(
+                select(Forecast.forecast_id, Forecast.base_id, Forecast.delta, *(getattr(Forecast, s) for s in SOURCES))
+                .where(Forecast.forecast_id.in_(select(chain.c.forecast_id)))
+            )).all()
+        }
+        rebuilt: Dict[int, Payloads] = {}
+
+        def rebuild(forecast_id: int) -> Payloads:
+            path = []
+            while forecast_id not in rebuilt and stored[forecast_id].base_id is not None:
+                path.append(forecast_id)
+                forecast_id = stored[forecast_id].base_id
+            if forecast_id not in rebuilt:
+                rebuilt[forecast_id] = ForecastModel.payloads(stored[forecast_id])
+            payloads = rebuilt[forecast_id]
+            for version in reversed(path):
+                payloads = rebuilt[version] = apply_delta(payloads, stored[version].delta)
+            return payloads
+
+        return {forecast_id: rebuild(forecast_id) for forecast_id in forecast_ids if forecast_id in stored}
+
+    @staticmethod
+    async def restore(db: AsyncSession, forecasts: List[Any]) -> List[Any]:
+        """
+        Fill in the bulletins of diff-stored versions among ``forecasts`` (ORM
+        objects, updated in place, or FORECAST_COLUMNS rows, replaced).
+        """
+        # A diff-stored version has no bulletin of its own
+        candidates = [f.forecast_id for f in forecasts if all(getattr(f, s) is None for s in SOURCES)]
+        rebuilt = await ForecastModel._rebuild(db, candidates) if candidates else {}
+        if not rebuilt:
+            return forecasts
+        restored = []
+        for forecast in forecasts:
+            payloads = rebuilt.get(forecast.forecast_id)
+            if payloads is not None and isinstance(forecast, Forecast):
+                ForecastModel._fill(forecast, payloads)
+            elif payloads is not None:
+                forecast = ForecastRow(**{**forecast._asdict(), **payloads})
+            restored.append(forecast)
+        return restored
+
+    @staticmethod
+    async def _write_points(db: AsyncSession, forecast: Forecast, sources: Tuple[str, ...]) -> None:
+        """
+        Replace the forecast_points rows of ``sources`` with ones flattened
+        from the forecast's JSON, and recompute its cone from every source.
+        """
+        points = forecast_points(
+            forecast.forecast_id, forecast.storm_id, {source: getattr(forecast, source) for source in SOURCES}
+        )
+        await db.execute(
+            delete(ForecastPoint)
+            .where(ForecastPoint.forecast_id == forecast.forecast_id, ForecastPoint.source.in_(sources))
+        )
+        changed = [point for point in points if point["source"] in sources]
+        if changed:
+            await db.execute(insert(ForecastPoint), changed)
+
+        cone = forecast_cone_json(forecast.forecast_id, points).decode()
+        await db.execute(
+            pg_insert(ForecastCone)
+            .values(forecast_id=forecast.forecast_id, geojson=cone)
+            .on_conflict_do_update(index_elements=[ForecastCone.forecast_id], set_={"geojson": cone})
+        )
 
     @staticmethod
     async def get_by_id(db: AsyncSession, forecast_id: int) -> Optional[Forecast]:
         """Get forecast by ID."""
-        return await db.get(Forecast, forecast_id)
+        forecast = await db.get(Forecast, forecast_id)
+        if forecast is not None:
+            await ForecastModel.restore(db, [forecast])
+        return forecast
 
     @staticmethod
-    async def get_all(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Forecast]:
-        """Get all forecasts with pagination."""
-        query = (
+    async def get_previous(db: AsyncSession, forecast: Forecast) -> Optional[Forecast]:
+        """The storm's version before ``forecast``."""
+        previous = await db.scalar(
             select(Forecast)
-            .order_by(desc(Forecast.created_at))
-            .offset(skip)
-            .limit(limit)
+            .where(
+                Forecast.storm_id == forecast.storm_id,
+                tuple_(*FORECAST_SORT_KEY) < tuple_(forecast.created_at, forecast.forecast_id),
+            )
+            .order_by(desc(Forecast.created_at), desc(Forecast.forecast_id))
+            .limit(1)
+        )
+        if previous is not None:
+            await ForecastModel.restore(db, [previous])
+        return previous
+
+    @staticmethod
+    async def get_all(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        as_rows: bool = False
+    ) -> List[Forecast]:
+        """Get all forecasts with pagination."""
+        query = paginate(
+            select(*FORECAST_COLUMNS) if as_rows else select(Forecast),
+            FORECAST_SORT_KEY, skip, limit, cursor, descending=True
         )
         result = await db.execute(query)
-        return list(result.scalars().all())
+        return await ForecastModel.restore(db, list(result.all() if as_rows else result.scalars().all()))
 
     @staticmethod
     async def get_by_storm_id(
         db: AsyncSession, 
         storm_id: str, 
         skip: int = 0, 
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        as_rows: bool = False
     ) -> List[Forecast]:
         """Get all forecasts for a specific storm."""
-        query = (
-            select(Forecast)
-            .where(Forecast.storm_id == storm_id)
-            .order_by(desc(Forecast.created_at))
-            .offset(skip)
-            .limit(limit)
+        query = paginate(
+            (select(*FORECAST_COLUMNS) if as_rows else select(Forecast)).where(Forecast.storm_id == storm_id),
+            FORECAST_SORT_KEY, skip, limit, cursor, descending=True
         )
         result = await db.execute(query)
-        return list(result.scalars().all())
+        return await ForecastModel.restore(db, list(result.all() if as_rows else result.scalars().all()))
 
     @staticmethod
     async def get_latest_by_storm_id(
@@ -61,11 +232,116 @@ class ForecastModel:
         query = (
             select(Forecast)
             .where(Forecast.storm_id == storm_id)
-            .order_by(desc(Forecast.created_at))
+            .order_by(desc(Forecast.created_at), desc(Forecast.forecast_id))
             .limit(1)
         )
         result = await db.execute(query)
-        return result.scalars().first()
+        forecast = result.scalars().first()
+        if forecast is not None:
+            await ForecastModel.restore(db, [forecast])
+        return forecast
+
+    @staticmethod
+    async def get_latest_per_storm(
+        db: AsyncSession,
+        storm_ids: Optional[List[str]] = None,
+        as_rows: bool = False
+    ) -> List[Forecast]:
+        """Newest forecast of each of ``storm_ids`` (else of each active storm), by storm_id."""
+        # DISTINCT ON keeps the first row per storm; ordering every key descending
+        # lets a backward scan of ix_forecasts_storm_id_created_at deliver them
+        query = (
+            (select(*FORECAST_COLUMNS) if as_rows else select(Forecast))
+            .distinct(Forecast.storm_id)
+            .order_by(desc(Forecast.storm_id), desc(Forecast.created_at), desc(Forecast.forecast_id))
+        )
+        if storm_ids is not None:
+            query = query.where(Forecast.storm_id.in_(storm_ids))
+        else:
+            # A storm without an end date is still ongoing
+            query = query.where(Forecast.storm_id.in_(select(Storm.storm_id).where(Storm.end_date.is_(None))))
+        result = await db.execute(query)
+        forecasts = list(result.all() if as_rows else result.scalars().all())
+        return await ForecastModel.restore(db, forecasts[::-1])
+
+    @staticmethod
+    async def get_latest_cone(db: AsyncSession, storm_id: str) -> Optional[str]:
+        """Cone GeoJSON of the storm's latest forecast; None when it has none."""
+        latest = (
+            select(Forecast.forecast_id)
+            .where(Forecast.storm_id == storm_id)
+            .order_by(desc(Forecast.created_at), desc(Forecast.forecast_id))
+            .limit(1)
+            .scalar_subquery()
+        )
+        return await db.scalar(select(ForecastCone.geojson).where(ForecastCone.forecast_id == latest))
+
+    @staticmethod
+    async def get_latest_danger_zones(db: AsyncSession, storm_id: str) -> List[Any]:
+        """Points with a danger zone of the storm's latest forecast; empty when it has none."""
+        latest = (
+            select(Forecast.forecast_id)
+            .where(Forecast.storm_id == storm_id)
+            .order_by(desc(Forecast.created_at), desc(Forecast.forecast_id))
+            .limit(1)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            select(*FORECAST_POINT_COLUMNS)
+            .where(ForecastPoint.forecast_id == latest, ForecastPoint.danger_min_lat.isnot(None))
+        )
+        return list(result.all())
+
+    @staticmethod
+    async def get_points(
+        db: AsyncSession,
+        storm_id: Optional[str] = None,
+        source: Optional[str] = None,
+        min_lead_hours: Optional[int] = None,
+        max_lead_hours: Optional[int] = None,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        skip: int = 0,
+        limit: int = 1000,
+        cursor: Optional[str] = None
+    ) -> List[ForecastPoint]:
+        """Forecast points matching every given filter; ``bbox`` is (min_lon, min_lat, max_lon, max_lat)."""
+        query = select(*FORECAST_POINT_COLUMNS)
+        if storm_id is not None:
+            query = query.where(ForecastPoint.storm_id == storm_id)
+        if source is not None:
+            query = query.where(ForecastPoint.source == source)
+        if min_lead_hours is not None:
+            query = query.where(ForecastPoint.lead_hours >= min_lead_hours)
+        if max_lead_hours is not None:
+            query = query.where(ForecastPoint.lead_hours <= max_lead_hours)
+        if bbox is not None:
+            min_lon, min_lat, max_lon, max_lat = bbox
+            query = query.where(
+                ForecastPoint.lat.between(min_lat, max_lat),
+                ForecastPoint.lon.between(min_lon, max_lon),
+            )
+        result = await db.execute(paginate(query, FORECAST_POINT_SORT_KEY, skip, limit, cursor))
+        return list(result.all())
+
+    @staticmethod
+    async def get_verification_points(db: AsyncSession, storm_ids: List[str]) -> Dict[str, List[Any]]:
+        """Forecast points past the issue time (lead > 0) of each of ``storm_ids``, in one query."""
+        query = select(
+            ForecastPoint.storm_id, ForecastPoint.forecast_id, ForecastPoint.source, ForecastPoint.issued_at,
+            ForecastPoint.valid_at, ForecastPoint.lead_hours, ForecastPoint.lat, ForecastPoint.lon, ForecastPoint.wind
+        ).where(ForecastPoint.storm_id.in_(storm_ids), ForecastPoint.lead_hours > 0)
+        points = {storm_id: [] for storm_id in storm_ids}
+        for row in (await db.execute(query)).all():
+            points[row.storm_id].append(row)
+        return points
+
+    @staticmethod
+    def export_query(storm_id: Optional[str] = None) -> Select:
+        """Every forecast (optionally for one storm) in sort-key order, as plain columns; see ``restore``."""
+        query = select(*FORECAST_COLUMNS).order_by(*FORECAST_SORT_KEY)
+        if storm_id is not None:
+            query = query.where(Forecast.storm_id == storm_id)
+        return query
 
     @staticmethod
     async def update(
@@ -74,27 +350,99 @@ class ForecastModel:
         update_data: dict
     ) -> Optional[Forecast]:
         """Update forecast."""
-        forecast = await ForecastModel.get_by_id(db, forecast_id)
-        if not forecast:
-            return None
+        values = {
+            key: value for key, value in update_data.items()
+            if key in Forecast.__table__.columns and key not in FORECAST_VERSION_COLUMNS
+        }
+        if not values:
+            return await ForecastModel.get_by_id(db, forecast_id)
 
-        for key, value in update_data.items():
-            if hasattr(forecast, key):
-                setattr(forecast, key, value)
+        sources = tuple(source for source in SOURCES if source in values)
+        payloads = None
+        if sources:
+            current = await ForecastModel.get_by_id(db, forecast_id)
+            if current is None:
+                return None
+            previous = ForecastModel.payloads(current)
+            payloads = {**previous, **{source: values[source] for source in sources}}
+            # Still stored against the same base, if it has one
+            base = await ForecastModel.get_by_id(db, current.base_id) if current.base_id is not None else None
+            values.update(ForecastModel._stored(payloads, base, base and ForecastModel.payloads(base)))
+            values["content_hash"] = content_hash(payloads)
 
-        await db.flush()
-        await db.refresh(forecast)
+        forecast = await db.scalar(
+            update(Forecast)
+            .where(Forecast.forecast_id == forecast_id)
+            .values(**values)
+            .returning(Forecast)
+            .execution_options(populate_existing=True)
+        )
+        if forecast is not None:
+            mark_storm_changed(db, forecast.storm_id, FORECASTS)
+            if payloads is not None:
+                ForecastModel._fill(forecast, payloads)
+                await ForecastModel._rebase_children(db, forecast, previous, forecast, payloads)
+                await ForecastModel._write_points(db, forecast, sources)
+            else:
+                await ForecastModel.restore(db, [forecast])
         return forecast
 
+    @staticmethod
+    async def _rebase_children(
+        db: AsyncSession,
+        forecast: Forecast,
+        payloads: Payloads,
+        base: Optional[Forecast],
+        base_payloads: Optional[Payloads]
+    ) -> None:
+        """
+        Re-store the versions diffed against ``forecast`` (whose bulletins were
+        ``payloads``) as diffs against ``base``, or whole when it is None, and
+        renumber the delta_depth of every version stored on top of them.
+        """
+        children = (await db.execute(
+            select(Forecast.forecast_id, Forecast.delta).where(Forecast.base_id == forecast.forecast_id)
+        )).all()
+        for child in children:
+            stored = ForecastModel._stored(apply_delta(payloads, child.delta), base, base_payloads)
+            await db.execute(update(Forecast).where(Forecast.forecast_id == child.forecast_id).values(**stored))
+        if children:
+            await ForecastModel._renumber_depths(db, [child.forecast_id for child in children])
+
+    @staticmethod
+    async def _renumber_depths(db: AsyncSession, forecast_ids: Collection[int]) -> None:
+        """Set the delta_depth of every version diffed (in)directly against ``forecast_ids`` from theirs, in one query."""
+        tree = (
+            select(Forecast.forecast_id, Forecast.delta_depth)
+            .where(Forecast.forecast_id.in_(forecast_ids))
+            .cte("tree", recursive=True)
+        )
+        tree = tree.union_all(
+            select(Forecast.forecast_id, tree.c.delta_depth + 1).join(tree, Forecast.base_id == tree.c.forecast_id)
+        )
+        await db.execute(
+            update(Forecast)
+            .where(Forecast.forecast_id == tree.c.forecast_id, Forecast.delta_depth != tree.c.delta_depth)
+            .values(delta_depth=tree.c.delta_depth)
+            .execution_options(synchronize_session=False)
+        )
+
     @staticmethod
     async def delete(db: AsyncSession, forecast_id: int) -> bool:
-        """Delete a forecast by ID."""
-        forecast = await ForecastModel.get_by_id(db, forecast_id)
-        if not forecast:
+        """Delete a forecast by ID; versions stored as diffs against it are re-based onto its own base."""
+        if await db.scalar(select(Forecast.forecast_id).where(Forecast.base_id == forecast_id).limit(1)) is not None:
+            forecast = await ForecastModel.get_by_id(db, forecast_id)
+            base = await ForecastModel.get_by_id(db, forecast.base_id) if forecast.base_id is not None else None
+            await ForecastModel._rebase_children(
+                db, forecast, ForecastModel.payloads(forecast), base, base and ForecastModel.payloads(base)
+            )
+        deleted = (await db.execute(
+            delete(Forecast).where(Forecast.forecast_id == forecast_id).returning(Forecast.storm_id)
+        )).first()
+        if deleted is None:
             return False
-
-        await db.delete(forecast)
-        await db.flush()
+        mark_storm_changed(db, deleted.storm_id, FORECASTS)
+        await storm_summaries.forecasts_changed(db, deleted.storm_id)
         return True
 
     @staticmethod
@@ -103,10 +451,12 @@ class ForecastModel:
         query = delete(Forecast).where(Forecast.storm_id == storm_id)
         result = await db.execute(query)
         await db.flush()
+        if result.rowcount:
+            mark_storm_changed(db, storm_id, FORECASTS)
+            await storm_summaries.forecasts_changed(db, storm_id)
         return result.rowcount
 
     @staticmethod
     async def verify_storm_exists(db: AsyncSession, storm_id: str) -> bool:
         """Verify if a storm exists."""
-        storm = await db.get(Storm, storm_id)
-        return storm is not None
+        return await storm_registry.exists(db, storm_id)
@@ -0,0 +1,112 @@
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+# Forecast JSON columns, each holding one agency's bulletin
+SOURCES = ("nchmf", "jtwc")
+TIME_FORMATS = ("%Y-%m-%d %H:%M", "%d-%m-%Y %H:%M")
+NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+
+def _time(value: Any) -> Optional[datetime]:
+    if not isinstance(value, str):
+        return None
+    for time_format in TIME_FORMATS:
+        try:
+            return datetime.strptime(value.strip(), time_format)
+        except ValueError:
+            pass
+    try:
+        return datetime.fromisoformat(value.strip()).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def _number(value: Any) -> Optional[float]:
+    """A bulletin number; ranges such as "10-11" (Beaufort levels) count as their upper end."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        numbers = [float(n) for n in NUMBER.findall(value.replace("–", " ").replace("-", " "))]
+        return max(numbers) if numbers else None
+    return None
+
+
+def _dict(value: Any) -> dict:
+    return value if isinstance(value, dict) else {}
+
+
+def _bounds(values: Any) -> List[Optional[float]]:
+    if not isinstance(values, (list, tuple)) or len(values) != 2:
+        return [None, None]
+    low, high = _number(values[0]), _number(values[1])
+    if low is None or high is None:
+        return [None, None]
+    return [min(low, high), max(low, high)]
+
+
+def flatten_forecast(forecast_id: int, storm_id: str, source: str, payload: Optional[dict]) -> List[Dict[str, Any]]:
+    """
+    ``forecast_points`` rows for one source's bulletin: the ``current``
+    position at lead 0 followed by every ``forecast[]`` entry. The issue time
+    is the time of ``current`` (else the earliest entry); entries without a
+    time or position are skipped.
+    """
+    if not isinstance(payload, dict):
+        return []
+    current = payload.get("current") if isinstance(payload.get("current"), dict) else None
+    entries = [current] if current is not None else []
+    forecast = payload.get("forecast")
+    entries += [entry for entry in forecast if isinstance(entry, dict)] if isinstance(forecast, list) else []
+
+    timed = [(entry, _time(entry.get("time"))) for entry in entries]
+    timed = [(entry, valid_at) for entry, valid_at in timed if valid_at is not None]
+    if not timed:
+        return []
+    issued_at = _time(current.get("time")) if current is not None else None
+    issued_at = issued_at or min(valid_at for _, valid_at in timed)
+
+    points = []
+    for entry, valid_at in timed:
+        position = _dict(entry.get("position"))
+        lat, lon = _number(position.get("lat")), _number(position.get("lon"))
+        if lat is None or lon is None:
+            continue
+        intensity = _dict(entry.get("intensity"))
+        zone = _dict(entry.get("danger_zone"))
+        danger_min_lat, danger_max_lat = _bounds(zone.get("lat_range"))
+        danger_min_lon, danger_max_lon = _bounds(zone.get("lon_range"))
+        risk_level = _number(entry.get("risk_level"))
+        points.append({
+            "forecast_id": forecast_id,
+            "storm_id": storm_id,
+            "source": source,
+            "issued_at": issued_at,
+            "valid_at": valid_at,
+            "lead_hours": round((valid_at - issued_at).total_seconds() / 3600),
+            "lat": lat,
+            "lon": lon,
+            "wind": _number(intensity.get("wind")),
+            "gust": _number(intensity.get("gust")),
+            "risk_level": None if risk_level is None else int(risk_level),
+            "danger_min_lat": danger_min_lat,
+            "danger_max_lat": danger_max_lat,
+            "danger_min_lon": danger_min_lon,
+            "danger_max_lon": danger_max_lon,
+        })
+    return points
+
+
+def forecast_points(forecast_id: int, storm_id: str, payloads: Dict[str, Optional[dict]]) -> List[Dict[str, Any]]:
+    """Rows for every source present in ``payloads`` (source -> bulletin)."""
+    return [
+        point
+        for source in SOURCES if source in payloads
+        for point in flatten_forecast(forecast_id, storm_id, source, payloads[source])
+    ]
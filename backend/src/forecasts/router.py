@@ -1,9 +1,12 @@
-from typing import List, Optional
-from fastapi import APIRouter, Query, status
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Query, Response, status
 
-from src.dependencies import DBSession
-from src.schemas import ForecastCreate, ForecastUpdate, ForecastResponse
+from src.dependencies import DBSession, ReadOnlyDBSession, Cursor, StormCache, FastPath
+from src.serialization import rows_response, rows_to_json
+from src.export import ExportFormat, stream_export
+from src.schemas import ForecastCreate, ForecastUpdate, ForecastResponse, ForecastDiffResponse, ForecastPointResponse
 from src.forecasts.service import ForecastService
+from src.forecasts.model import FORECAST_POINT_SORT_KEY, FORECAST_SORT_KEY, ForecastModel
 
 router = APIRouter(prefix="/api/v1/forecasts", tags=["forecasts"])
 
@@ -17,15 +20,22 @@ router = APIRouter(prefix="/api/v1/forecasts", tags=["forecasts"])
 )
 async def create_forecast(
     forecast_data: ForecastCreate,
-    db: DBSession
+    db: DBSession,
+    response: Response
 ):
     """
     Create a new forecast with the following fields:
     - **storm_id**: ID of the storm (foreign key)
     - **nchmf**: JSON data from National Center for Hydro-Meteorological Forecasting (optional)
     - **jtwc**: JSON data from Joint Typhoon Warning Center (optional)
+
+    Posting the same content as the storm's latest forecast creates nothing:
+    the latest forecast is returned with 200 instead of 201.
     """
-    return await ForecastService.create_forecast(db, forecast_data)
+    forecast, created = await ForecastService.create_forecast(db, forecast_data)
+    if not created:
+        response.status_code = status.HTTP_200_OK
+    return forecast
 
 
 @router.get(
@@ -35,14 +45,104 @@ async def create_forecast(
     description="Retrieve all forecasts with pagination support"
 )
 async def get_all_forecasts(
-    db: DBSession,
+    db: ReadOnlyDBSession,
+    keyset: Cursor,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
-    limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return")
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
+    fast: FastPath = False
 ):
     """
     Get all forecasts with pagination.
     """
-    return await ForecastService.get_all_forecasts(db, skip, limit)
+    forecasts = await ForecastService.get_all_forecasts(db, skip, limit, keyset.cursor, as_rows=fast)
+    page = keyset.page(forecasts, limit, FORECAST_SORT_KEY)
+    if fast:
+        return rows_response(page, keyset.response)
+    return page
+
+
+@router.get(
+    "/export",
+    summary="Export forecasts",
+    description="Stream every forecast (optionally for one storm) as NDJSON or CSV over a server-side cursor"
+)
+async def export_forecasts(
+    db: ReadOnlyDBSession,
+    export_format: ExportFormat = "ndjson",
+    storm_id: Optional[str] = Query(None, description="Only export rows for this storm")
+):
+    """
+    Export forecasts without pagination; the response starts streaming immediately.
+    """
+    query = await ForecastService.export_forecasts(db, storm_id)
+    return stream_export(query, export_format, f"forecasts_{storm_id or 'all'}", transform=ForecastModel.restore)
+
+
+@router.get(
+    "/latest",
+    response_model=List[ForecastResponse],
+    summary="Get the latest forecast of every active storm",
+    description="Retrieve the most recent forecast of each active storm, or of each listed storm, in one query"
+)
+async def get_latest_forecasts(
+    db: ReadOnlyDBSession,
+    storm_id: Optional[List[str]] = Query(
+        None, max_length=1000, description="Storms to return the latest forecast of; default every active storm"
+    ),
+    fast: FastPath = False
+):
+    """
+    Get the latest forecast per storm, ordered by storm_id.
+    Storms without forecasts are left out.
+    """
+    forecasts = await ForecastService.get_latest_forecasts(db, storm_id, as_rows=fast)
+    if fast:
+        return Response(content=rows_to_json(forecasts), media_type="application/json")
+    return forecasts
+
+
+@router.get(
+    "/verification",
+    summary="Verify a season's forecasts",
+    description="Position and intensity errors of NCHMF vs JTWC forecasts at 24/48/72h against the actual tracks, over every storm that started in the season"
+)
+async def get_season_verification(
+    db: ReadOnlyDBSession,
+    season: int = Query(..., ge=1900, le=2100, description="Year the storms started in")
+):
+    """
+    Get the mean/median position error (km), intensity bias and mean absolute
+    intensity error (Beaufort levels) per source and lead time.
+    """
+    body = await ForecastService.get_season_verification(db, season)
+    return Response(content=body, media_type="application/json")
+
+
+@router.get(
+    "/points",
+    response_model=List[ForecastPointResponse],
+    summary="Query forecast points",
+    description="Forecast positions flattened from the NCHMF/JTWC bulletins, filtered by storm, source, lead time and bounding box"
+)
+async def get_forecast_points(
+    db: ReadOnlyDBSession,
+    keyset: Cursor,
+    storm_id: Optional[str] = Query(None, description="Only points of this storm"),
+    source: Optional[Literal["nchmf", "jtwc"]] = Query(None, description="Only points of this agency's bulletins"),
+    lead_hours: Optional[int] = Query(None, ge=0, description="Exact lead time in hours; 0 is the current position"),
+    min_lead_hours: Optional[int] = Query(None, ge=0, description="Minimum lead time in hours"),
+    max_lead_hours: Optional[int] = Query(None, ge=0, description="Maximum lead time in hours"),
+    bbox: Optional[str] = Query(None, description="min_lon,min_lat,max_lon,max_lat the forecast position lies in"),
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: int = Query(1000, ge=1, le=5000, description="Maximum number of records to return")
+):
+    """
+    Get forecast points ordered by storm, lead time and point id.
+    """
+    points = await ForecastService.get_forecast_points(
+        db, storm_id, source, lead_hours, min_lead_hours, max_lead_hours, bbox, skip, limit, keyset.cursor
+    )
+    return rows_response(keyset.page(points, limit, FORECAST_POINT_SORT_KEY), keyset.response)
 
 
 @router.get(
@@ -53,7 +153,7 @@ async def get_all_forecasts(
 )
 async def get_forecast_by_id(
     forecast_id: int,
-    db: DBSession
+    db: ReadOnlyDBSession
 ):
     """
     Get a specific forecast by ID.
@@ -61,6 +161,23 @@ async def get_forecast_by_id(
     return await ForecastService.get_forecast_by_id(db, forecast_id)
 
 
+@router.get(
+    "/{forecast_id}/diff",
+    response_model=ForecastDiffResponse,
+    summary="Diff two forecasts",
+    description="JSON Patch (RFC 6902) per source from an earlier forecast of the same storm to this one"
+)
+async def get_forecast_diff(
+    forecast_id: int,
+    db: ReadOnlyDBSession,
+    against: Optional[int] = Query(None, description="Forecast to diff against; default the storm's previous forecast")
+):
+    """
+    Get what changed between two forecast versions of a storm.
+    """
+    return await ForecastService.get_forecast_diff(db, forecast_id, against)
+
+
 @router.get(
     "/storm/{storm_id}",
     response_model=List[ForecastResponse],
@@ -69,14 +186,24 @@ async def get_forecast_by_id(
 )
 async def get_forecasts_by_storm(
     storm_id: str,
-    db: DBSession,
+    cache: StormCache,
+    db: ReadOnlyDBSession,
+    keyset: Cursor,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
-    limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return")
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
+    fast: FastPath = False
 ):
     """
     Get all forecasts for a specific storm with pagination.
     """
-    return await ForecastService.get_forecasts_by_storm(db, storm_id, skip, limit)
+    cached = cache.lookup(storm_id)
+    if cached is not None:
+        return cached
+    forecasts = await ForecastService.get_forecasts_by_storm(db, storm_id, skip, limit, keyset.cursor, as_rows=fast)
+    page = keyset.page(forecasts, limit, FORECAST_SORT_KEY)
+    if fast:
+        return cache.store_json(rows_to_json(page))
+    return cache.store(page, List[ForecastResponse])
 
 
 @router.get(
@@ -87,13 +214,83 @@ async def get_forecasts_by_storm(
 )
 async def get_latest_forecast_by_storm(
     storm_id: str,
-    db: DBSession
+    cache: StormCache,
+    db: ReadOnlyDBSession
 ):
     """
     Get the latest forecast for a specific storm.
     Returns null if no forecasts exist for the storm.
     """
-    return await ForecastService.get_latest_forecast_by_storm(db, storm_id)
+    cached = cache.lookup(storm_id)
+    if cached is not None:
+        return cached
+    forecast = await ForecastService.get_latest_forecast_by_storm(db, storm_id)
+    return cache.store(forecast, Optional[ForecastResponse])
+
+
+@router.get(
+    "/storm/{storm_id}/latest/cone.geojson",
+    summary="Get the latest forecast cone for a storm",
+    description="Merged and per-source uncertainty cones of the storm's most recent forecast as a GeoJSON FeatureCollection"
+)
+async def get_latest_forecast_cone(
+    storm_id: str,
+    cache: StormCache,
+    db: ReadOnlyDBSession
+):
+    """
+    Get the union of the danger zones along the latest forecast's path, merged
+    across sources and per source. Empty when the storm has no forecasts.
+    """
+    cached = cache.lookup(storm_id)
+    if cached is not None:
+        return cached
+    body = await ForecastService.get_latest_cone(db, storm_id)
+    return cache.store_json(body, media_type="application/geo+json")
+
+
+@router.get(
+    "/storm/{storm_id}/latest/impact",
+    summary="Get what lies in the latest forecast's danger zones",
+    description="Pending rescue requests and damage locations of the storm inside the danger zones of its most recent forecast, grouped by lead time"
+)
+async def get_danger_zone_impact(
+    storm_id: str,
+    cache: StormCache,
+    db: ReadOnlyDBSession
+):
+    """
+    Get the pending rescue requests and damage details inside any source's
+    danger zone, each under the earliest lead time that reaches it. Cached
+    until the storm's forecasts, rescue requests or damage details change.
+    """
+    cached = cache.lookup(storm_id)
+    if cached is not None:
+        return cached
+    body = await ForecastService.get_danger_zone_impact(db, storm_id)
+    return cache.store_json(body)
+
+
+@router.get(
+    "/storm/{storm_id}/verification",
+    summary="Verify a storm's forecasts",
+    description="Every forecast position of the storm compared with its track interpolated at the valid time, with a summary at 24/48/72h"
+)
+async def get_storm_verification(
+    storm_id: str,
+    cache: StormCache,
+    db: ReadOnlyDBSession
+):
+    """
+    Get the great-circle position error (km) and intensity error (Beaufort
+    levels, forecast minus actual) of each forecast point whose valid time is
+    covered by the track, and their summary per source and lead time.
+    """
+    cached = cache.lookup(storm_id)
+    if cached is not None:
+        return cached
+    body = await ForecastService.get_storm_verification(db, storm_id)
+    return cache.store_json(body)
 
 
 @router.put(
@@ -1,9 +1,26 @@
-from typing import List, Optional
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import Select
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
 from src.forecasts.model import ForecastModel
-from src.schemas import ForecastCreate, ForecastUpdate, ForecastResponse
+from src.forecasts.points import SOURCES
+from src.forecasts.versions import json_diff
+from src.forecasts.impact import PENDING_STATUS, impact_json, zone_bbox
+from src.forecasts.verification import (
+    VerificationTable, season_verification_json, storm_verification_json, verification_cache, verification_table
+)
+from src.caching import FORECASTS, TRACKS, storm_versions
+from src.storms.interpolation import build_track_arrays
+from src.storms.model import storms, storm_tracks
+from src.rescue.model import rescue_requests
+from src.damage_details.model import damage_details
+from src.storms.spatial import parse_bbox
+from src.schemas import ForecastCreate, ForecastUpdate, ForecastResponse, ForecastDiffResponse
+
+# Cone layer body for a storm whose latest forecast has no cone
+EMPTY_FEATURE_COLLECTION = b'{"type":"FeatureCollection","features":[]}'
 
 
 class ForecastService:
@@ -13,8 +30,8 @@ class ForecastService:
     async def create_forecast(
         db: AsyncSession, 
         forecast_data: ForecastCreate
-    ) -> ForecastResponse:
-        """Create a new forecast."""
+    ) -> Tuple[ForecastResponse, bool]:
+        """Create a new forecast; False when it repeats the storm's latest one, which is returned instead."""
         # Verify storm exists
         storm_exists = await ForecastModel.verify_storm_exists(db, forecast_data.storm_id)
         if not storm_exists:
@@ -24,8 +41,8 @@ class ForecastService:
             )
 
         # Create forecast
-        forecast = await ForecastModel.create(db, forecast_data.model_dump())
-        return ForecastResponse.model_validate(forecast)
+        forecast, created = await ForecastModel.create(db, forecast_data.model_dump())
+        return ForecastResponse.model_validate(forecast), created
 
     @staticmethod
     async def get_forecast_by_id(
@@ -41,14 +58,57 @@ class ForecastService:
             )
         return ForecastResponse.model_validate(forecast)
 
+    @staticmethod
+    async def get_forecast_diff(
+        db: AsyncSession,
+        forecast_id: int,
+        against_id: Optional[int] = None
+    ) -> ForecastDiffResponse:
+        """JSON Patch per source from ``against_id`` (default the storm's previous forecast) to ``forecast_id``."""
+        forecast = await ForecastModel.get_by_id(db, forecast_id)
+        if not forecast:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Forecast with id {forecast_id} not found"
+            )
+        if against_id is None:
+            against = await ForecastModel.get_previous(db, forecast)
+            if against is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Forecast with id {forecast_id} has no previous version"
+                )
+        else:
+            against = await ForecastModel.get_by_id(db, against_id)
+            if not against:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Forecast with id {against_id} not found"
+                )
+            if against.storm_id != forecast.storm_id:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                    detail=f"Forecasts {forecast_id} and {against_id} belong to different storms"
+                )
+        return ForecastDiffResponse(
+            forecast_id=forecast.forecast_id,
+            against_id=against.forecast_id,
+            storm_id=forecast.storm_id,
+            **{source: json_diff(getattr(against, source), getattr(forecast, source)) for source in SOURCES}
+        )
+
     @staticmethod
     async def get_all_forecasts(
         db: AsyncSession, 
         skip: int = 0, 
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        as_rows: bool = False
     ) -> List[ForecastResponse]:
         """Get all forecasts with pagination."""
-        forecasts = await ForecastModel.get_all(db, skip, limit)
+        forecasts = await ForecastModel.get_all(db, skip, limit, cursor, as_rows)
+        if as_rows:
+            return forecasts
         return [ForecastResponse.model_validate(f) for f in forecasts]
 
     @staticmethod
@@ -56,18 +116,20 @@ class ForecastService:
         db: AsyncSession, 
         storm_id: str, 
         skip: int = 0, 
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        as_rows: bool = False
     ) -> List[ForecastResponse]:
         """Get all forecasts for a specific storm."""
-        # Verify storm exists
-        storm_exists = await ForecastModel.verify_storm_exists(db, storm_id)
-        if not storm_exists:
+        forecasts = await ForecastModel.get_by_storm_id(db, storm_id, skip, limit, cursor, as_rows)
+        # Only an empty page needs the storm existence check
+        if not forecasts and not await ForecastModel.verify_storm_exists(db, storm_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Storm with id '{storm_id}' not found"
             )
-
-        forecasts = await ForecastModel.get_by_storm_id(db, storm_id, skip, limit)
+        if as_rows:
+            return forecasts
         return [ForecastResponse.model_validate(f) for f in forecasts]
 
     @staticmethod
@@ -76,18 +138,152 @@ class ForecastService:
         storm_id: str
     ) -> Optional[ForecastResponse]:
         """Get the latest forecast for a specific storm."""
-        # Verify storm exists
-        storm_exists = await ForecastModel.verify_storm_exists(db, storm_id)
-        if not storm_exists:
+        forecast = await ForecastModel.get_latest_by_storm_id(db, storm_id)
+        if not forecast:
+            if not await ForecastModel.verify_storm_exists(db, storm_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Storm with id '{storm_id}' not found"
+                )
+            return None
+        return ForecastResponse.model_validate(forecast)
+
+    @staticmethod
+    async def get_latest_forecasts(
+        db: AsyncSession,
+        storm_ids: Optional[List[str]] = None,
+        as_rows: bool = False
+    ) -> List[ForecastResponse]:
+        """Latest forecast of each listed storm, or of each active storm; storms without forecasts are left out."""
+        forecasts = await ForecastModel.get_latest_per_storm(db, storm_ids, as_rows)
+        if as_rows:
+            return forecasts
+        return [ForecastResponse.model_validate(f) for f in forecasts]
+
+    @staticmethod
+    async def get_latest_cone(db: AsyncSession, storm_id: str) -> bytes:
+        """Cone FeatureCollection of the storm's latest forecast; empty when it has none."""
+        cone = await ForecastModel.get_latest_cone(db, storm_id)
+        if cone is None:
+            if not await ForecastModel.verify_storm_exists(db, storm_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Storm with id '{storm_id}' not found"
+                )
+            return EMPTY_FEATURE_COLLECTION
+        return cone.encode()
+
+    @staticmethod
+    async def get_forecast_points(
+        db: AsyncSession,
+        storm_id: Optional[str] = None,
+        source: Optional[str] = None,
+        lead_hours: Optional[int] = None,
+        min_lead_hours: Optional[int] = None,
+        max_lead_hours: Optional[int] = None,
+        bbox: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 1000,
+        cursor: Optional[str] = None
+    ) -> List[Any]:
+        """Flattened forecast positions filtered by storm, source, lead time and bounding box."""
+        if lead_hours is not None:
+            min_lead_hours = max_lead_hours = lead_hours
+        box = None
+        if bbox is not None:
+            try:
+                box = parse_bbox(bbox)
+            except ValueError as e:
+                raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(e))
+        points = await ForecastModel.get_points(
+            db, storm_id, source, min_lead_hours, max_lead_hours, box, skip, limit, cursor
+        )
+        if not points and storm_id is not None and not await ForecastModel.verify_storm_exists(db, storm_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Storm with id '{storm_id}' not found"
             )
+        return points
 
-        forecast = await ForecastModel.get_latest_by_storm_id(db, storm_id)
-        if not forecast:
-            return None
-        return ForecastResponse.model_validate(forecast)
+    @staticmethod
+    async def verification_tables(db: AsyncSession, storm_ids: List[str]) -> Dict[str, VerificationTable]:
+        """
+        Verification table of each of ``storm_ids``. Tables are cached under
+        the storm's track and forecast versions, so one is rebuilt after a
+        write to either (by any worker, while the version listener is
+        connected; otherwise also once per lease window). The storms that
+        need it are read together and compared off the event loop.
+        """
+        versions = {
+            storm_id: f"{storm_versions.token(storm_id, TRACKS)}/{storm_versions.token(storm_id, FORECASTS)}"
+            for storm_id in storm_ids
+        }
+        tables = {}
+        for storm_id, version in versions.items():
+            table = verification_cache.get(storm_id, version)
+            if table is not None:
+                tables[storm_id] = table
+
+        missing = [storm_id for storm_id in storm_ids if storm_id not in tables]
+        if missing:
+            points = await ForecastModel.get_verification_points(db, missing)
+            tracks = await storm_tracks.get_track_points_by_storm(db, missing)
+
+            def build():
+                return {
+                    storm_id: verification_table(points[storm_id], build_track_arrays(tracks[storm_id]))
+                    for storm_id in missing
+                }
+
+            for storm_id, table in (await asyncio.to_thread(build)).items():
+                if storm_versions.settled(storm_id, TRACKS) and storm_versions.settled(storm_id, FORECASTS):
+                    verification_cache.put(storm_id, versions[storm_id], table)
+                tables[storm_id] = table
+        return tables
+
+    @staticmethod
+    async def get_storm_verification(db: AsyncSession, storm_id: str) -> bytes:
+        """Errors of every forecast point of the storm against its track, and their summary by source and lead."""
+        if not await ForecastModel.verify_storm_exists(db, storm_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Storm with id '{storm_id}' not found"
+            )
+        tables = await ForecastService.verification_tables(db, [storm_id])
+        return storm_verification_json(storm_id, tables[storm_id])
+
+    @staticmethod
+    async def get_season_verification(db: AsyncSession, season: int) -> bytes:
+        """Summary by source and lead over every forecast of the storms that started in ``season``."""
+        storm_ids = await storms.get_season_storm_ids(db, season)
+        tables = await ForecastService.verification_tables(db, storm_ids)
+        return season_verification_json(season, tables)
+
+    @staticmethod
+    async def get_danger_zone_impact(db: AsyncSession, storm_id: str) -> bytes:
+        """The storm's pending rescue requests and damage details inside its latest forecast's danger zones."""
+        if not await ForecastModel.verify_storm_exists(db, storm_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Storm with id '{storm_id}' not found"
+            )
+        zones = await ForecastModel.get_latest_danger_zones(db, storm_id)
+        # Each table is searched once for every zone together, through its coordinate index
+        bboxes = list({zone_bbox(zone) for zone in zones})
+        requests = await rescue_requests.get_requests_in_boxes(db, storm_id, PENDING_STATUS, bboxes)
+        details = await damage_details.get_damage_details_in_boxes(db, storm_id, bboxes)
+        forecast_id = zones[0].forecast_id if zones else None
+        return impact_json(storm_id, forecast_id, zones, requests, details)
+
+    @staticmethod
+    async def export_forecasts(db: AsyncSession, storm_id: Optional[str] = None) -> Select:
+        """Query streaming every forecast, optionally for one storm."""
+        if storm_id is not None and not await ForecastModel.verify_storm_exists(db, storm_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Storm with id '{storm_id}' not found"
+            )
+        return ForecastModel.export_query(storm_id)
 
     @staticmethod
     async def update_forecast(
@@ -128,15 +324,12 @@ class ForecastService:
     @staticmethod
     async def delete_forecasts_by_storm(db: AsyncSession, storm_id: str) -> dict:
         """Delete all forecasts for a specific storm."""
-        # Verify storm exists
-        storm_exists = await ForecastModel.verify_storm_exists(db, storm_id)
-        if not storm_exists:
+        count = await ForecastModel.delete_by_storm_id(db, storm_id)
+        if not count and not await ForecastModel.verify_storm_exists(db, storm_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Storm with id '{storm_id}' not found"
             )
-
-        count = await ForecastModel.delete_by_storm_id(db, storm_id)
         return {
             "message": f"Deleted {count} forecast(s) for storm '{storm_id}'",
             "count": count
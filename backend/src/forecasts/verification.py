@@ -0,0 +1,160 @@
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import orjson
+from sqlalchemy import Row
+
+from src.config import config
+from src.forecasts.points import SOURCES
+from src.storms.best_track import beaufort_level
+from src.storms.interpolation import TrackArrays, interpolate, to_epoch_seconds
+from src.storms.spatial import haversine_km
+
+# Lead times (hours) the summaries report
+VERIFICATION_LEADS = (24, 48, 72)
+
+
+class VerificationTable(NamedTuple):
+    """
+    One storm's verified forecast positions as parallel arrays: every
+    forecast point whose valid time falls within the storm's track. Wind is
+    compared as a Beaufort level, the unit of both agencies' bulletins; NaN
+    marks a missing forecast or actual intensity.
+    """
+    forecast_id: np.ndarray
+    source: np.ndarray
+    issued_at: np.ndarray  # datetime64[us]
+    valid_at: np.ndarray
+    lead_hours: np.ndarray
+    lat: np.ndarray
+    lon: np.ndarray
+    wind: np.ndarray
+    actual_lat: np.ndarray
+    actual_lon: np.ndarray
+    actual_wind: np.ndarray
+    position_error_km: np.ndarray
+    intensity_error: np.ndarray  # forecast minus actual, in Beaufort levels
+
+
+def _times(values: Sequence[Any]) -> np.ndarray:
+    return np.array(values, dtype="datetime64[us]")
+
+
+def verification_table(points: Sequence[Row], track: TrackArrays) -> VerificationTable:
+    """
+    Compare forecast points (forecast_id, source, issued_at, valid_at,
+    lead_hours, lat, lon, wind) with the storm's track interpolated at their
+    valid times, all points at once.
+    """
+    actual = interpolate(track, to_epoch_seconds([p.valid_at for p in points]))
+    verified = ~np.isnan(actual["lat"])
+    rows = [p for p, keep in zip(points, verified.tolist()) if keep]
+
+    lat = np.array([p.lat for p in rows], dtype=float)
+    lon = np.array([p.lon for p in rows], dtype=float)
+    wind = np.array([np.nan if p.wind is None else p.wind for p in rows], dtype=float)
+    actual_lat, actual_lon = actual["lat"][verified], actual["lon"][verified]
+    # The track's category is its Beaufort level; points stored without one fall back to the wind speed
+    wind_kmh, category = actual["wind_speed"][verified], actual["category"][verified]
+    actual_wind = np.where(
+        np.isnan(category), np.where(np.isnan(wind_kmh), np.nan, beaufort_level(np.nan_to_num(wind_kmh))), category
+    )
+    return VerificationTable(
+        forecast_id=np.array([p.forecast_id for p in rows], dtype=np.int64),
+        source=np.array([p.source for p in rows], dtype=object),
+        issued_at=_times([p.issued_at for p in rows]),
+        valid_at=_times([p.valid_at for p in rows]),
+        lead_hours=np.array([p.lead_hours for p in rows], dtype=np.int64),
+        lat=lat,
+        lon=lon,
+        wind=wind,
+        actual_lat=actual_lat,
+        actual_lon=actual_lon,
+        actual_wind=actual_wind,
+        position_error_km=np.round(haversine_km(lat, lon, actual_lat, actual_lon), 1),
+        intensity_error=wind - actual_wind,
+    )
+
+
+def _concat(tables: Sequence[VerificationTable]) -> VerificationTable:
+    return VerificationTable(*(np.concatenate(columns) for columns in zip(*tables)))
+
+
+def _mean(values: np.ndarray) -> Optional[float]:
+    values = values[~np.isnan(values)]
+    return round(float(values.mean()), 2) if len(values) else None
+
+
+def summarize(tables: Sequence[VerificationTable]) -> List[Dict[str, Any]]:
+    """
+    Mean and median position error, intensity bias and mean absolute
+    intensity error per source at each of VERIFICATION_LEADS, over every
+    table (e.g. a whole season) at once.
+    """
+    table = _concat(tables) if tables else None
+    summary = []
+    for source in SOURCES:
+        for lead in VERIFICATION_LEADS:
+            if table is None:
+                mask = np.zeros(0, dtype=bool)
+                errors = intensity = np.zeros(0)
+            else:
+                mask = (table.source == source) & (table.lead_hours == lead)
+                errors, intensity = table.position_error_km[mask], table.intensity_error[mask]
+            summary.append({
+                "source": source,
+                "lead_hours": lead,
+                "count": int(mask.sum()),
+                "mean_position_error_km": _mean(errors),
+                "median_position_error_km": round(float(np.median(errors)), 1) if len(errors) else None,
+                "intensity_count": int((~np.isnan(intensity)).sum()),
+                "intensity_bias": _mean(intensity),
+                "mean_abs_intensity_error": _mean(np.abs(intensity)),
+            })
+    return summary
+
+
+def table_rows(table: VerificationTable) -> List[Dict[str, Any]]:
+    """One dict per verified point, in table order."""
+    columns = {
+        key: [None if isinstance(v, float) and np.isnan(v) else v for v in array.tolist()]
+        for key, array in table._asdict().items()
+    }
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+def storm_verification_json(storm_id: str, table: VerificationTable) -> bytes:
+    return orjson.dumps({"storm_id": storm_id, "summary": summarize([table]), "errors": table_rows(table)})
+
+
+def season_verification_json(season: int, tables: Dict[str, VerificationTable]) -> bytes:
+    return orjson.dumps({
+        "season": season,
+        "storm_ids": sorted(tables),
+        "summary": summarize(list(tables.values())),
+    })
+
+
+class VerificationCache:
+    """LRU of per-storm VerificationTables, each valid for the storm track and forecast versions it was built under."""
+
+    def __init__(self, max_storms: int):
+        self.max_storms = max_storms
+        self._entries: "OrderedDict[str, Tuple[str, VerificationTable]]" = OrderedDict()
+
+    def get(self, storm_id: str, version: str) -> Optional[VerificationTable]:
+        entry = self._entries.get(storm_id)
+        if entry is None or entry[0] != version:
+            return None
+        self._entries.move_to_end(storm_id)
+        return entry[1]
+
+    def put(self, storm_id: str, version: str, table: VerificationTable) -> None:
+        self._entries[storm_id] = (version, table)
+        self._entries.move_to_end(storm_id)
+        while len(self._entries) > self.max_storms:
+            self._entries.popitem(last=False)
+
+
+verification_cache = VerificationCache(config.FORECAST_VERIFICATION_CACHE_MAX_STORMS)
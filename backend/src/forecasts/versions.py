@@ -0,0 +1,82 @@
+import copy
+import hashlib
+from typing import Any, Dict, List, Optional
+
+import orjson
+
+from src.forecasts.points import SOURCES
+
+# (source -> bulletin) of one forecast version
+Payloads = Dict[str, Any]
+# RFC 6902 JSON Patch operations
+Patch = List[Dict[str, Any]]
+
+
+def content_hash(payloads: Payloads) -> str:
+    """SHA-256 of the bulletins as canonical JSON, so re-posted identical content hashes the same."""
+    canonical = orjson.dumps({source: payloads.get(source) for source in SOURCES}, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(canonical).hexdigest()
+
+
+def _escape(key: str) -> str:
+    return key.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def json_diff(old: Any, new: Any, path: str = "") -> Patch:
+    """
+    JSON Patch turning ``old`` into ``new``: objects are compared key by key
+    and equal-length arrays item by item; anything else that differs is
+    replaced whole.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = [{"op": "remove", "path": f"{path}/{_escape(key)}"} for key in sorted(old.keys() - new.keys())]
+        for key, value in new.items():
+            if key in old:
+                ops += json_diff(old[key], value, f"{path}/{_escape(key)}")
+            else:
+                ops.append({"op": "add", "path": f"{path}/{_escape(key)}", "value": value})
+        return ops
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        return [op for i, (a, b) in enumerate(zip(old, new)) for op in json_diff(a, b, f"{path}/{i}")]
+    if type(old) is type(new) and old == new:
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_patch(document: Any, patch: Patch) -> Any:
+    """Apply a json_diff patch to a copy of ``document``."""
+    document = copy.deepcopy(document)
+    for op in patch:
+        tokens = [_unescape(token) for token in op["path"].split("/")[1:]]
+        if not tokens:
+            document = None if op["op"] == "remove" else copy.deepcopy(op["value"])
+            continue
+        parent = document
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        last = int(tokens[-1]) if isinstance(parent, list) else tokens[-1]
+        if op["op"] == "remove":
+            del parent[last]
+        else:
+            parent[last] = copy.deepcopy(op["value"])
+    return document
+
+
+def payload_delta(base: Payloads, payloads: Payloads) -> Optional[Dict[str, Patch]]:
+    """
+    Per-source patches from ``base`` to ``payloads``, or None when storing
+    ``payloads`` whole would take no more space than the patches.
+    """
+    delta = {source: json_diff(base.get(source), payloads.get(source)) for source in SOURCES}
+    full = {source: payloads.get(source) for source in SOURCES}
+    if len(orjson.dumps(delta)) >= len(orjson.dumps(full)):
+        return None
+    return delta
+
+
+def apply_delta(base: Payloads, delta: Dict[str, Patch]) -> Payloads:
+    return {source: apply_patch(base.get(source), delta.get(source, [])) for source in SOURCES}
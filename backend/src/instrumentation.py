@@ -0,0 +1,199 @@
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, status
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.datastructures import MutableHeaders
+
+from src.config import config
+from src.constants import Environment
+from src.logger import logger
+from src.schemas import DBMetricsResponse
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time-Ms"
+POOL_WAIT_HEADER = "X-DB-Pool-Wait-Ms"
+
+# Collected, exposed in headers and served at /metrics/db outside production
+# unless DB_INSTRUMENTATION_ENABLED says otherwise
+INSTRUMENTATION_ENABLED = (
+    config.DB_INSTRUMENTATION_ENABLED
+    if config.DB_INSTRUMENTATION_ENABLED is not None
+    else config.APP_ENV != Environment.PRODUCTION
+)
+
+# A run of positional placeholders; expanded IN lists of any length share one shape
+_PLACEHOLDERS = re.compile(r"\$\d+(?:\s*,\s*\$\d+)*")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    return _WHITESPACE.sub(" ", _PLACEHOLDERS.sub("?", statement)).strip()
+
+
+class RequestStats:
+    """Database activity of one HTTP request."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.pool_wait = 0.0
+        self.shapes: Counter = Counter()
+
+    def repeated_statements(self, threshold: int) -> List[Tuple[str, int]]:
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("db_request_stats", default=None)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that charges the time spent waiting for a connection to the current request."""
+
+    def _do_get(self):
+        stats = _request_stats.get()
+        if stats is None:
+            return super()._do_get()
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            stats.pool_wait += time.perf_counter() - start
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Count and time every statement ``engine`` executes on behalf of an HTTP request."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _request_stats.get() is not None:
+            conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _request_stats.get()
+        if stats is None or not conn.info.get("query_start_time"):
+            return
+        stats.db_time += time.perf_counter() - conn.info["query_start_time"].pop()
+        stats.queries += 1
+        stats.shapes[statement_shape(statement)] += 1
+
+
+class RouteStats:
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.max_queries = 0
+        self.db_time = 0.0
+        self.pool_wait = 0.0
+        # Statement shape -> highest repeat count seen in one request, for shapes over the threshold
+        self.repeated_statements: Dict[str, int] = {}
+
+    def add(self, stats: RequestStats, repeated: List[Tuple[str, int]]) -> None:
+        self.requests += 1
+        self.queries += stats.queries
+        self.max_queries = max(self.max_queries, stats.queries)
+        self.db_time += stats.db_time
+        self.pool_wait += stats.pool_wait
+        for shape, count in repeated:
+            self.repeated_statements[shape] = max(count, self.repeated_statements.get(shape, 0))
+
+    def as_dict(self, method: str, route: str) -> dict:
+        return {
+            "method": method,
+            "route": route,
+            "requests": self.requests,
+            "queries": self.queries,
+            "avg_queries": round(self.queries / self.requests, 2),
+            "max_queries": self.max_queries,
+            "db_time_ms": round(self.db_time * 1000, 2),
+            "avg_db_time_ms": round(self.db_time * 1000 / self.requests, 2),
+            "pool_wait_ms": round(self.pool_wait * 1000, 2),
+            "repeated_statements": [
+                {"statement": shape, "max_count": count}
+                for shape, count in sorted(self.repeated_statements.items(), key=lambda item: -item[1])
+            ],
+        }
+
+
+class DBMetrics:
+    """Per-route totals of the RequestStats collected since startup (or the last reset)."""
+
+    def __init__(self, repeat_threshold: int):
+        self.repeat_threshold = repeat_threshold
+        self._routes: Dict[Tuple[str, str], RouteStats] = {}
+
+    def record(self, method: str, route: str, stats: RequestStats) -> None:
+        repeated = stats.repeated_statements(self.repeat_threshold)
+        for shape, count in repeated:
+            logger.warning(f"[DB] Possible N+1: {method} {route} issued the same statement {count} times: {shape[:300]}")
+        self._routes.setdefault((method, route), RouteStats()).add(stats, repeated)
+
+    def snapshot(self) -> List[dict]:
+        routes = [stats.as_dict(method, route) for (method, route), stats in self._routes.items()]
+        return sorted(routes, key=lambda route: -route["queries"])
+
+    def reset(self) -> None:
+        self._routes.clear()
+
+
+db_metrics = DBMetrics(config.DB_QUERY_REPEAT_THRESHOLD)
+
+
+class DBInstrumentationMiddleware:
+    """
+    Collect per-request database statistics and report them per route.
+
+    The query count, DB time and pool wait accumulated up to the moment the
+    response starts are sent as X-DB-* headers; the totals for the whole
+    request, including streamed bodies and the session commit, go to
+    db_metrics. Requests that repeat one statement shape more than
+    DB_QUERY_REPEAT_THRESHOLD times are logged as possible N+1 patterns.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers[QUERY_COUNT_HEADER] = str(stats.queries)
+                headers[QUERY_TIME_HEADER] = f"{stats.db_time * 1000:.2f}"
+                headers[POOL_WAIT_HEADER] = f"{stats.pool_wait * 1000:.2f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _request_stats.reset(token)
+            # The matched route's template keeps /storms/{storm_id} as one entry
+            route = scope.get("route")
+            db_metrics.record(scope["method"], getattr(route, "path", "<unmatched>"), stats)
+
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/db", response_model=DBMetricsResponse)
+async def get_db_metrics():
+    """Per-route query count, DB time, pool wait and repeated statements since the last reset."""
+    return {"repeat_threshold": db_metrics.repeat_threshold, "routes": db_metrics.snapshot()}
+
+
+@router.delete("/db", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_db_metrics():
+    """Clear the collected per-route statistics."""
+    db_metrics.reset()
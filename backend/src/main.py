@@ -2,7 +2,9 @@ from fastapi import FastAPI, Request, Response, status
 from fastapi.concurrency import asynccontextmanager
 from src.logger import logger
 from src.config import config
-from src.database import engine, check_database
+from src.database import engine, read_engine, check_database
+from src.instrumentation import INSTRUMENTATION_ENABLED, DBInstrumentationMiddleware, router as metrics_router
+from src.storms.catalog import storm_catalog
 from datetime import datetime, timezone
 import socket
 
@@ -21,10 +23,15 @@ START_TIME = datetime.now(timezone.utc)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("🚀 FastAPI application starting up...")
+    if config.STORM_CATALOG_ENABLED:
+        await storm_catalog.start()
     logger.debug("Startup checks completed.")
     yield
     logger.info("🛑 FastAPI application shutting down...")
+    await storm_catalog.stop()
     await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
     logger.info("Database connections closed.")
     
     
@@ -38,6 +45,10 @@ app.include_router(chatbot_router)
 app.include_router(forecasts_router)
 app.include_router(damage_details_router)
 
+if INSTRUMENTATION_ENABLED:
+    app.add_middleware(DBInstrumentationMiddleware)
+    app.include_router(metrics_router)
+
 
 @app.get(
     "/health",
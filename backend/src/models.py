@@ -19,8 +19,11 @@ from sqlalchemy import (
     func,
     Float,
     BigInteger,
-    Boolean
+    Boolean,
+    Index,
+    text
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database import Base
@@ -46,6 +49,10 @@ class Storm(Base):
     damage_details = relationship("DamageDetail", back_populates="storm")
     
     
+# Transaction ids only grow, and every id below the snapshot xmin belongs to a finished transaction
+CURRENT_REVISION = text("(pg_current_xact_id())::text::bigint")
+
+
 class StormTrack(Base):
     __tablename__ = "storm_tracks"
 
@@ -56,8 +63,29 @@ class StormTrack(Base):
     lon = Column(Float)
     category = Column(Integer)
     wind_speed = Column(Float)
+    # Id of the transaction that last wrote the row; the incremental sync watermark
+    revision = Column(BigInteger, server_default=CURRENT_REVISION, nullable=False)
 
     storm = relationship("Storm", back_populates="tracks")
+
+    __table_args__ = (
+        Index("ix_storm_tracks_storm_id_timestamp", "storm_id", "timestamp", "track_id"),
+        Index("ix_storm_tracks_storm_id_revision", "storm_id", "revision", "track_id"),
+    )
+
+
+class StormTrackTombstone(Base):
+    """A deleted track point, kept so polling clients can drop it."""
+    __tablename__ = "storm_track_tombstones"
+
+    track_id = Column(Integer, primary_key=True, autoincrement=False)
+    storm_id = Column(String, ForeignKey("storms.storm_id", ondelete="CASCADE"), nullable=False)
+    revision = Column(BigInteger, server_default=CURRENT_REVISION, nullable=False)
+    deleted_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_storm_track_tombstones_storm_id_revision", "storm_id", "revision", "track_id"),
+    )
     
 class NewsSource(Base):
     __tablename__ = "news_sources"
@@ -75,6 +103,12 @@ class NewsSource(Base):
 
     storm = relationship("Storm", back_populates="news")
 
+    __table_args__ = (
+        Index("ix_news_sources_storm_id_category_published_at", "storm_id", "category", "published_at", "news_id"),
+        Index("ix_news_sources_storm_id_published_at", "storm_id", "published_at", "news_id"),
+        Index("ix_news_sources_published_at", "published_at", "news_id"),
+    )
+
 
 
 class SourceEnum(enum.Enum):
@@ -121,6 +155,15 @@ class RescueRequest(Base):
 
     storm = relationship("Storm", back_populates="rescue_requests")
 
+    __table_args__ = (
+        Index("ix_rescue_requests_storm_id_created_at", "storm_id", "created_at", "request_id"),
+        Index("ix_rescue_requests_status_created_at", "status", "created_at", "request_id"),
+        Index("ix_rescue_requests_priority_created_at", "priority", "created_at", "request_id"),
+        Index("ix_rescue_requests_created_at", "created_at", "request_id"),
+        # Requests of a storm in a given state within a bounding box (forecast danger zones)
+        Index("ix_rescue_requests_storm_id_status_lat_lon", "storm_id", "status", "lat", "lon"),
+    )
+
 
 
 class DamageAssessment(Base):
@@ -135,6 +178,11 @@ class DamageAssessment(Base):
 
     storm = relationship("Storm", back_populates="damage_assessments")
 
+    __table_args__ = (
+        Index("ix_damage_assessment_storm_id_time", "storm_id", "time", "id"),
+        Index("ix_damage_assessment_time", "time", "id"),
+    )
+
 
 class Forecast(Base):
     __tablename__ = "forecasts"
@@ -144,9 +192,59 @@ class Forecast(Base):
     nchmf = Column(JSON)  # JSON từ Trung tâm Khí tượng Thuỷ văn
     jtwc = Column(JSON)   # JSON từ JTWC (Joint Typhoon Warning Center)
     created_at = Column(DateTime, server_default=func.now())
+    # SHA-256 of the canonical nchmf/jtwc content; a re-post of the latest version is skipped
+    content_hash = Column(String(64))
+    # Version this one is stored as a diff against; nchmf/jtwc are then NULL and ``delta``
+    # holds per-source JSON Patches. NULL for versions stored whole
+    base_id = Column(Integer, ForeignKey("forecasts.forecast_id"))
+    delta = Column(JSON)
+    # Diffs between this version and the nearest one stored whole
+    delta_depth = Column(Integer, nullable=False, server_default="0")
 
     storm = relationship("Storm", back_populates="forecasts")
 
+    __table_args__ = (
+        Index("ix_forecasts_storm_id_created_at", "storm_id", "created_at", "forecast_id"),
+        Index("ix_forecasts_created_at", "created_at", "forecast_id"),
+        Index("ix_forecasts_base_id", "base_id"),
+    )
+
+
+class ForecastPoint(Base):
+    """One position of a forecast bulletin, flattened from Forecast.nchmf / Forecast.jtwc."""
+    __tablename__ = "forecast_points"
+
+    point_id = Column(Integer, primary_key=True, autoincrement=True)
+    forecast_id = Column(Integer, ForeignKey("forecasts.forecast_id", ondelete="CASCADE"), nullable=False)
+    storm_id = Column(String, ForeignKey("storms.storm_id"), nullable=False)
+    source = Column(String, nullable=False)  # "nchmf" or "jtwc"
+    issued_at = Column(DateTime, nullable=False)
+    valid_at = Column(DateTime, nullable=False)
+    lead_hours = Column(Integer, nullable=False)  # 0 for the bulletin's current position
+    lat = Column(Float, nullable=False)
+    lon = Column(Float, nullable=False)
+    wind = Column(Float)  # Beaufort level, as in the bulletins
+    gust = Column(Float)
+    risk_level = Column(Integer)
+    danger_min_lat = Column(Float)
+    danger_max_lat = Column(Float)
+    danger_min_lon = Column(Float)
+    danger_max_lon = Column(Float)
+
+    __table_args__ = (
+        Index("ix_forecast_points_forecast_id", "forecast_id"),
+        Index("ix_forecast_points_storm_id_lead_hours", "storm_id", "lead_hours", "point_id"),
+        Index("ix_forecast_points_lead_hours_lat_lon", "lead_hours", "lat", "lon"),
+    )
+
+
+class ForecastCone(Base):
+    """A forecast's uncertainty cones, computed when the forecast is written."""
+    __tablename__ = "forecast_cones"
+
+    forecast_id = Column(Integer, ForeignKey("forecasts.forecast_id", ondelete="CASCADE"), primary_key=True)
+    geojson = Column(Text, nullable=False)  # Serialized FeatureCollection, served as stored
+
 
 class LiveTracking(Base):
     __tablename__ = "live_tracking"
@@ -184,5 +282,41 @@ class DamageDetail(Base):
     content = Column(JSON, nullable=False)  # JSON chứa chi tiết thiệt hại
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
     modified_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+    # content's latitude/longitude, copied on write so they can be indexed; NULL when missing or invalid
+    lat = Column(Float)
+    lon = Column(Float)
 
     storm = relationship("Storm", back_populates="damage_details")
+
+    __table_args__ = (
+        Index("ix_damage_details_storm_id_created_at", "storm_id", "created_at", "id"),
+        Index("ix_damage_details_created_at", "created_at", "id"),
+        Index("ix_damage_details_storm_id_lat_lon", "storm_id", "lat", "lon"),
+    )
+
+
+class StormSummary(Base):
+    """Per-storm overview kept up to date by the write helpers (src/storms/summary.py)."""
+    __tablename__ = "storm_summary"
+
+    storm_id = Column(String, ForeignKey("storms.storm_id", ondelete="CASCADE"), primary_key=True)
+    track_count = Column(Integer, nullable=False, server_default="0")
+    first_track_at = Column(DateTime)
+    first_lat = Column(Float)
+    first_lon = Column(Float)
+    last_track_at = Column(DateTime)
+    last_lat = Column(Float)
+    last_lon = Column(Float)
+    max_wind_speed = Column(Float)
+    min_lat = Column(Float)
+    max_lat = Column(Float)
+    min_lon = Column(Float)
+    max_lon = Column(Float)
+    rescue_count = Column(Integer, nullable=False, server_default="0")
+    rescue_by_status = Column(JSONB, nullable=False, server_default="{}")  # {"pending": 3, ...}
+    rescue_by_priority = Column(JSONB, nullable=False, server_default="{}")  # {"1": 2, ...}
+    latest_forecast_id = Column(Integer)
+    latest_damage_id = Column(Integer)
+    latest_damage_time = Column(DateTime)
+    latest_damage_detail_id = Column(Integer)
+    updated_at = Column(DateTime, server_default=func.now(), nullable=False)
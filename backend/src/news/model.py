@@ -3,7 +3,12 @@ from datetime import datetime
 from src.models import NewsSource as NewsSourceDB
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import Select, delete, insert, select, update, func
+from src.pagination import paginate
+from src.caching import mark_storm_changed
+
+NEWS_SORT_KEY = (NewsSourceDB.published_at, NewsSourceDB.news_id)
+NEWS_COLUMNS = tuple(NewsSourceDB.__table__.columns)
 
 
 class NewsSourceTables:
@@ -22,21 +27,20 @@ class NewsSourceTables:
     ) -> NewsSourceDB:
         published_at_obj = datetime.strptime(published_at, "%d-%m-%Y %H:%M") if published_at else None
         
-        new_news = NewsSourceDB(
-            storm_id=storm_id,
-            title=title,
-            content=content,
-            source_url=source_url,
-            published_at=published_at_obj,
-            lat=lat,
-            lon=lon,
-            thumbnail_url=thumbnail_url,
-            category=category
+        mark_storm_changed(session, storm_id)
+        return await session.scalar(
+            insert(NewsSourceDB).values(
+                storm_id=storm_id,
+                title=title,
+                content=content,
+                source_url=source_url,
+                published_at=published_at_obj,
+                lat=lat,
+                lon=lon,
+                thumbnail_url=thumbnail_url,
+                category=category
+            ).returning(NewsSourceDB)
         )
-        session.add(new_news)
-        await session.flush()
-        await session.refresh(new_news)
-        return new_news
     
     async def get_news_by_id(
         self,
@@ -50,11 +54,15 @@ class NewsSourceTables:
         session: AsyncSession,
         storm_id: str,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[NewsSourceDB]:
-        query = select(NewsSourceDB).where(
-            NewsSourceDB.storm_id == storm_id
-        ).order_by(NewsSourceDB.published_at.desc()).offset(skip).limit(limit)
+        query = paginate(
+            select(NewsSourceDB).where(
+                NewsSourceDB.storm_id == storm_id
+            ),
+            NEWS_SORT_KEY, skip, limit, cursor, descending=True
+        )
         result = await session.execute(query)
         return result.scalars().all()
     
@@ -64,12 +72,16 @@ class NewsSourceTables:
         storm_id: str,
         category: str,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[NewsSourceDB]:
-        query = select(NewsSourceDB).where(
-            NewsSourceDB.storm_id == storm_id,
-            NewsSourceDB.category == category
-        ).order_by(NewsSourceDB.published_at.desc()).offset(skip).limit(limit)
+        query = paginate(
+            select(NewsSourceDB).where(
+                NewsSourceDB.storm_id == storm_id,
+                NewsSourceDB.category == category
+            ),
+            NEWS_SORT_KEY, skip, limit, cursor, descending=True
+        )
         result = await session.execute(query)
         return result.scalars().all()
     
@@ -77,14 +89,23 @@ class NewsSourceTables:
         self,
         session: AsyncSession,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[NewsSourceDB]:
-        query = select(NewsSourceDB).order_by(
-            NewsSourceDB.published_at.desc()
-        ).offset(skip).limit(limit)
+        query = paginate(
+            select(NewsSourceDB),
+            NEWS_SORT_KEY, skip, limit, cursor, descending=True
+        )
         result = await session.execute(query)
         return result.scalars().all()
     
+    def export_query(self, storm_id: Optional[str] = None) -> Select:
+        """Every news source (optionally for one storm) in sort-key order, as plain columns."""
+        query = select(*NEWS_COLUMNS).order_by(*NEWS_SORT_KEY)
+        if storm_id is not None:
+            query = query.where(NewsSourceDB.storm_id == storm_id)
+        return query
+    
     async def update_news(
         self,
         session: AsyncSession,
@@ -99,44 +120,50 @@ class NewsSourceTables:
         category: Optional[str] = None,
         summary: Optional[str] = None
     ) -> Optional[NewsSourceDB]:
-        news = await self.get_news_by_id(session, news_id)
-        if not news:
-            return None
-        
+        values = {}
         if title is not None:
-            news.title = title
+            values["title"] = title
         if content is not None:
-            news.content = content
+            values["content"] = content
         if source_url is not None:
-            news.source_url = source_url
+            values["source_url"] = source_url
         if published_at is not None:
-            news.published_at = datetime.strptime(published_at, "%d-%m-%Y %H:%M")
+            values["published_at"] = datetime.strptime(published_at, "%d-%m-%Y %H:%M")
         if lat is not None:
-            news.lat = lat
+            values["lat"] = lat
         if lon is not None:
-            news.lon = lon
+            values["lon"] = lon
         if thumbnail_url is not None:
-            news.thumbnail_url = thumbnail_url
+            values["thumbnail_url"] = thumbnail_url
         if category is not None:
-            news.category = category
-        if summary is not None:
-            news.summary = summary
+            values["category"] = category
+        # summary has no column on news_sources; it was never persisted.
+        
+        if not values:
+            return await self.get_news_by_id(session, news_id)
         
-        await session.flush()
-        await session.refresh(news)
-        return news
+        updated = await session.scalar(
+            update(NewsSourceDB)
+            .where(NewsSourceDB.news_id == news_id)
+            .values(**values)
+            .returning(NewsSourceDB)
+            .execution_options(populate_existing=True)
+        )
+        if updated is not None:
+            mark_storm_changed(session, updated.storm_id)
+        return updated
     
     async def delete_news(
         self,
         session: AsyncSession,
         news_id: int
     ) -> bool:
-        news = await self.get_news_by_id(session, news_id)
-        if not news:
+        deleted = (await session.execute(
+            delete(NewsSourceDB).where(NewsSourceDB.news_id == news_id).returning(NewsSourceDB.storm_id)
+        )).first()
+        if deleted is None:
             return False
-        
-        await session.delete(news)
-        await session.flush()
+        mark_storm_changed(session, deleted.storm_id)
         return True
 
 
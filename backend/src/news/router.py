@@ -8,13 +8,15 @@ from fastapi import (
     Query,
     status,
 )
-from src.dependencies import DBSession
+from src.dependencies import DBSession, ReadOnlyDBSession, Cursor, StormCache
+from src.export import ExportFormat, stream_export
 from src.schemas import (
     NewsSourceCreate, NewsSourceUpdate, NewsSourceResponse,
     PaginationRequest
 )
 
 from src.news.service import NewsSourceService
+from src.news.model import NEWS_SORT_KEY
 
 service = NewsSourceService()
 router = APIRouter(prefix="/api/v1/news", tags=["news"])
@@ -33,50 +35,79 @@ async def create_news(
 @router.get("/", response_model=List[NewsSourceResponse])
 async def get_all_news(
     pagination: Annotated[PaginationRequest, Depends()],
-    session: DBSession = None,
+    keyset: Cursor,
+    session: ReadOnlyDBSession = None,
 ):
     """Get all news sources with pagination"""
-    news_list = await service.get_all_news(session=session, skip=pagination.skip, limit=pagination.limit)
-    return news_list
+    news_list = await service.get_all_news(
+        session=session,
+        skip=pagination.skip,
+        limit=pagination.limit,
+        cursor=keyset.cursor
+    )
+    return keyset.page(news_list, pagination.limit, NEWS_SORT_KEY)
 
 
 @router.get("/storm/{storm_id}", response_model=List[NewsSourceResponse])
 async def get_news_by_storm(
     storm_id: str,
     pagination: Annotated[PaginationRequest, Depends()],
-    session: DBSession = None,
+    keyset: Cursor,
+    cache: StormCache,
+    session: ReadOnlyDBSession = None,
 ):
     """Get all news sources for a specific storm"""
+    cached = cache.lookup(storm_id)
+    if cached is not None:
+        return cached
     news_list = await service.get_news_by_storm(
         session=session,
         storm_id=storm_id,
         skip=pagination.skip,
-        limit=pagination.limit
+        limit=pagination.limit,
+        cursor=keyset.cursor
     )
-    return news_list
+    return cache.store(keyset.page(news_list, pagination.limit, NEWS_SORT_KEY), List[NewsSourceResponse])
 
 
 @router.get("/storm/{storm_id}/damage", response_model=List[NewsSourceResponse])
 async def get_damage_news_by_storm(
     storm_id: str,
     pagination: Annotated[PaginationRequest, Depends()],
-    session: DBSession = None,
+    keyset: Cursor,
+    cache: StormCache,
+    session: ReadOnlyDBSession = None,
 ):
     """Get damage-related news for a specific storm (category: Thiet_hai_Hau_qua)"""
+    cached = cache.lookup(storm_id)
+    if cached is not None:
+        return cached
     news_list = await service.get_news_by_storm_and_category(
         session=session,
         storm_id=storm_id,
         category="Thiet_hai_Hau_qua",
         skip=pagination.skip,
-        limit=pagination.limit
+        limit=pagination.limit,
+        cursor=keyset.cursor
     )
-    return news_list
+    return cache.store(keyset.page(news_list, pagination.limit, NEWS_SORT_KEY), List[NewsSourceResponse])
+
+
+@router.get("/export")
+async def export_news(
+    export_format: ExportFormat = "ndjson",
+    storm_id: Optional[str] = Query(None, description="Only export rows for this storm"),
+    session: ReadOnlyDBSession = None,
+):
+    """Stream every news source (optionally for one storm) as NDJSON or CSV"""
+    query = await service.export_news(session=session, storm_id=storm_id)
+    return stream_export(query, export_format, f"news_{storm_id or 'all'}")
 
 
 @router.get("/{news_id}", response_model=NewsSourceResponse)
 async def get_news(
     news_id: int = Path(...),
-    session: DBSession = None,
+    session: ReadOnlyDBSession = None,
 ):
     """Get a news source by ID"""
     news = await service.get_news(session=session, news_id=news_id)
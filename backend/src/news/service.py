@@ -2,9 +2,10 @@ import asyncio
 from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi import HTTPException, status
+from sqlalchemy import Select
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.news.model import news_sources
-from src.storms.model import storms
+from src.storms.registry import storm_registry
 from src.models import NewsSource as NewsSourceDB
 
 
@@ -15,8 +16,7 @@ class NewsSourceService:
         news_data: Dict[str, Any]
     ) -> NewsSourceDB:
         # Verify storm exists
-        storm = await storms.get_storm_by_id(session, news_data["storm_id"])
-        if not storm:
+        if not await storm_registry.exists(session, news_data["storm_id"]):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Storm with id {news_data['storm_id']} not found"
@@ -54,16 +54,16 @@ class NewsSourceService:
         session: AsyncSession,
         storm_id: str,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[NewsSourceDB]:
-        # Verify storm exists
-        storm = await storms.get_storm_by_id(session, storm_id)
-        if not storm:
+        news_list = await news_sources.get_news_by_storm(session, storm_id, skip, limit, cursor)
+        if not news_list and not await storm_registry.exists(session, storm_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Storm with id {storm_id} not found"
             )
-        return await news_sources.get_news_by_storm(session, storm_id, skip, limit)
+        return news_list
     
     async def get_news_by_storm_and_category(
         self,
@@ -71,24 +71,39 @@ class NewsSourceService:
         storm_id: str,
         category: str,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[NewsSourceDB]:
-        # Verify storm exists
-        storm = await storms.get_storm_by_id(session, storm_id)
-        if not storm:
+        news_list = await news_sources.get_news_by_storm_and_category(
+            session, storm_id, category, skip, limit, cursor
+        )
+        if not news_list and not await storm_registry.exists(session, storm_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Storm with id {storm_id} not found"
             )
-        return await news_sources.get_news_by_storm_and_category(session, storm_id, category, skip, limit)
+        return news_list
     
     async def get_all_news(
         self,
         session: AsyncSession,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[NewsSourceDB]:
-        return await news_sources.get_all_news(session, skip, limit)
+        return await news_sources.get_all_news(session, skip, limit, cursor)
+    
+    async def export_news(
+        self,
+        session: AsyncSession,
+        storm_id: Optional[str] = None
+    ) -> Select:
+        if storm_id is not None and not await storm_registry.exists(session, storm_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Storm with id {storm_id} not found"
+            )
+        return news_sources.export_query(storm_id)
     
     async def update_news(
         self,
@@ -0,0 +1,96 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import ColumnElement, DateTime, Select, and_, false, or_, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort-key values of the last row into an opaque cursor."""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[InstrumentedAttribute]) -> List[Any]:
+    """Decode a cursor produced by encode_cursor for the given sort key."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match sort key")
+        return [
+            datetime.fromisoformat(v) if v is not None and isinstance(col.type, DateTime) else v
+            for col, v in zip(columns, values)
+        ]
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def _same(column: InstrumentedAttribute, value: Any) -> ColumnElement:
+    return column.is_(None) if value is None else column == value
+
+
+def _past(column: InstrumentedAttribute, value: Any, descending: bool) -> ColumnElement:
+    # NULL sorts after every value ascending and before every value descending
+    if descending:
+        return column.isnot(None) if value is None else column < value
+    if value is None:
+        return false()
+    return or_(column > value, column.is_(None)) if column.expression.nullable else column > value
+
+
+def _seek(columns: Sequence[InstrumentedAttribute], values: List[Any], descending: bool) -> ColumnElement:
+    """Rows after ``values`` in the (NULL-aware) order of ``columns``."""
+    nullable = [c.expression.nullable for c in columns]
+    if None not in values and (descending or not any(nullable)):
+        # A row-value comparison leaves out NULL-keyed rows, which here all
+        # sort before the cursor, and stays an index range scan
+        key, after = tuple_(*columns), tuple_(*values)
+        return key < after if descending else key > after
+    if None not in values:
+        # Ascending NULLs come last: the row-value range plus, for each
+        # nullable key, the rows tied on the keys before it and NULL in it
+        return or_(
+            tuple_(*columns) > tuple_(*values),
+            *(
+                and_(*(c == v for c, v in zip(columns[:i], values[:i])), columns[i].is_(None))
+                for i in range(len(columns)) if nullable[i]
+            )
+        )
+    return or_(*(
+        and_(*(_same(c, v) for c, v in zip(columns[:i], values[:i])), _past(columns[i], values[i], descending))
+        for i in range(len(columns))
+    ))
+
+
+def paginate(
+    query: Select,
+    columns: Sequence[InstrumentedAttribute],
+    skip: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+) -> Select:
+    """
+    Order ``query`` by ``columns`` and apply either OFFSET or keyset pagination.
+
+    With a cursor the query seeks past the last row of the previous page with a
+    row-value comparison, so every page is an index range scan of ``limit`` rows.
+    NULL keys sort last ascending and first descending, as the indexes store
+    them; rows with NULL keys are kept on later pages by an explicit predicate.
+    """
+    order = [c.desc().nulls_first() for c in columns] if descending else [c.asc().nulls_last() for c in columns]
+    query = query.order_by(*order)
+    if cursor is None:
+        return query.offset(skip).limit(limit)
+
+    return query.where(_seek(columns, decode_cursor(cursor, columns), descending)).limit(limit)
@@ -1,9 +1,15 @@
-from typing import Optional, List
+from typing import Any, Optional, List, Sequence, Tuple
 from datetime import datetime
 from src.models import RescueRequest as RescueRequestDB
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Select, and_, delete, insert, or_, select, update
+from src.pagination import paginate
+from src.caching import mark_storm_changed
+from src.storms.summary import storm_summaries
+
+RESCUE_SORT_KEY = (RescueRequestDB.created_at, RescueRequestDB.request_id)
+RESCUE_COLUMNS = tuple(RescueRequestDB.__table__.columns)
 
 
 class RescueRequestTables:
@@ -23,24 +29,25 @@ class RescueRequestTables:
         verified: Optional[bool] = False,
         note: Optional[str] = None
     ) -> RescueRequestDB:
-        new_request = RescueRequestDB(
-            storm_id=storm_id,
-            name=name,
-            phone=phone,
-            address=address,
-            lat=lat,
-            lon=lon,
-            priority=priority,
-            status=status,
-            type=type,
-            people_detail=people_detail,
-            verified=verified,
-            note=note
+        mark_storm_changed(session, storm_id)
+        request = await session.scalar(
+            insert(RescueRequestDB).values(
+                storm_id=storm_id,
+                name=name,
+                phone=phone,
+                address=address,
+                lat=lat,
+                lon=lon,
+                priority=priority,
+                status=status,
+                type=type,
+                people_detail=people_detail,
+                verified=verified,
+                note=note
+            ).returning(RescueRequestDB)
         )
-        session.add(new_request)
-        await session.flush()
-        await session.refresh(new_request)
-        return new_request
+        await storm_summaries.rescue_counted(session, storm_id, status, priority, 1)
+        return request
     
     async def get_request_by_id(
         self,
@@ -54,11 +61,15 @@ class RescueRequestTables:
         session: AsyncSession,
         storm_id: str,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[RescueRequestDB]:
-        query = select(RescueRequestDB).where(
-            RescueRequestDB.storm_id == storm_id
-        ).order_by(RescueRequestDB.created_at.desc()).offset(skip).limit(limit)
+        query = paginate(
+            select(RescueRequestDB).where(
+                RescueRequestDB.storm_id == storm_id
+            ),
+            RESCUE_SORT_KEY, skip, limit, cursor, descending=True
+        )
         result = await session.execute(query)
         return result.scalars().all()
     
@@ -67,11 +78,15 @@ class RescueRequestTables:
         session: AsyncSession,
         status: str,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[RescueRequestDB]:
-        query = select(RescueRequestDB).where(
-            RescueRequestDB.status == status
-        ).order_by(RescueRequestDB.created_at.desc()).offset(skip).limit(limit)
+        query = paginate(
+            select(RescueRequestDB).where(
+                RescueRequestDB.status == status
+            ),
+            RESCUE_SORT_KEY, skip, limit, cursor, descending=True
+        )
         result = await session.execute(query)
         return result.scalars().all()
     
@@ -80,11 +95,15 @@ class RescueRequestTables:
         session: AsyncSession,
         priority: int,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[RescueRequestDB]:
-        query = select(RescueRequestDB).where(
-            RescueRequestDB.priority == priority
-        ).order_by(RescueRequestDB.created_at.desc()).offset(skip).limit(limit)
+        query = paginate(
+            select(RescueRequestDB).where(
+                RescueRequestDB.priority == priority
+            ),
+            RESCUE_SORT_KEY, skip, limit, cursor, descending=True
+        )
         result = await session.execute(query)
         return result.scalars().all()
     
@@ -93,11 +112,15 @@ class RescueRequestTables:
         session: AsyncSession,
         verified: bool = True,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[RescueRequestDB]:
-        query = select(RescueRequestDB).where(
-            RescueRequestDB.verified == verified
-        ).order_by(RescueRequestDB.created_at.desc()).offset(skip).limit(limit)
+        query = paginate(
+            select(RescueRequestDB).where(
+                RescueRequestDB.verified == verified
+            ),
+            RESCUE_SORT_KEY, skip, limit, cursor, descending=True
+        )
         result = await session.execute(query)
         return result.scalars().all()
     
@@ -105,14 +128,44 @@ class RescueRequestTables:
         self,
         session: AsyncSession,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[RescueRequestDB]:
-        query = select(RescueRequestDB).order_by(
-            RescueRequestDB.created_at.desc()
-        ).offset(skip).limit(limit)
+        query = paginate(
+            select(RescueRequestDB),
+            RESCUE_SORT_KEY, skip, limit, cursor, descending=True
+        )
         result = await session.execute(query)
         return result.scalars().all()
     
+    async def get_requests_in_boxes(
+        self,
+        session: AsyncSession,
+        storm_id: str,
+        status: str,
+        bboxes: Sequence[Tuple[float, float, float, float]]
+    ) -> List[Any]:
+        """The storm's requests in ``status`` located in any of ``bboxes`` ((min_lon, min_lat, max_lon, max_lat) each)."""
+        if not bboxes:
+            return []
+        query = select(*RESCUE_COLUMNS).where(
+            RescueRequestDB.storm_id == storm_id,
+            RescueRequestDB.status == status,
+            or_(*(
+                and_(RescueRequestDB.lat.between(min_lat, max_lat), RescueRequestDB.lon.between(min_lon, max_lon))
+                for min_lon, min_lat, max_lon, max_lat in bboxes
+            ))
+        )
+        result = await session.execute(query)
+        return result.all()
+    
+    def export_query(self, storm_id: Optional[str] = None) -> Select:
+        """Every rescue request (optionally for one storm) in sort-key order, as plain columns."""
+        query = select(*RESCUE_COLUMNS).order_by(*RESCUE_SORT_KEY)
+        if storm_id is not None:
+            query = query.where(RescueRequestDB.storm_id == storm_id)
+        return query
+    
     async def update_request(
         self,
         session: AsyncSession,
@@ -129,48 +182,61 @@ class RescueRequestTables:
         verified: Optional[bool] = None,
         note: Optional[str] = None
     ) -> Optional[RescueRequestDB]:
-        request = await self.get_request_by_id(session, request_id)
-        if not request:
-            return None
-        
+        values = {}
         if name is not None:
-            request.name = name
+            values["name"] = name
         if phone is not None:
-            request.phone = phone
+            values["phone"] = phone
         if address is not None:
-            request.address = address
+            values["address"] = address
         if lat is not None:
-            request.lat = lat
+            values["lat"] = lat
         if lon is not None:
-            request.lon = lon
+            values["lon"] = lon
         if priority is not None:
-            request.priority = priority
+            values["priority"] = priority
         if status is not None:
-            request.status = status
+            values["status"] = status
         if type is not None:
-            request.type = type
+            values["type"] = type
         if people_detail is not None:
-            request.people_detail = people_detail
+            values["people_detail"] = people_detail
         if verified is not None:
-            request.verified = verified
+            values["verified"] = verified
         if note is not None:
-            request.note = note
+            values["note"] = note
         
-        await session.flush()
-        await session.refresh(request)
-        return request
+        if not values:
+            return await self.get_request_by_id(session, request_id)
+        
+        updated = await session.scalar(
+            update(RescueRequestDB)
+            .where(RescueRequestDB.request_id == request_id)
+            .values(**values)
+            .returning(RescueRequestDB)
+            .execution_options(populate_existing=True)
+        )
+        if updated is not None:
+            mark_storm_changed(session, updated.storm_id)
+            if updated.storm_id is not None and ("status" in values or "priority" in values):
+                await storm_summaries.rescue_changed(session, updated.storm_id)
+        return updated
     
     async def delete_request(
         self,
         session: AsyncSession,
         request_id: int
     ) -> bool:
-        request = await self.get_request_by_id(session, request_id)
-        if not request:
+        deleted = (await session.execute(
+            delete(RescueRequestDB)
+            .where(RescueRequestDB.request_id == request_id)
+            .returning(RescueRequestDB.storm_id, RescueRequestDB.status, RescueRequestDB.priority)
+        )).first()
+        if deleted is None:
             return False
-        
-        await session.delete(request)
-        await session.flush()
+        mark_storm_changed(session, deleted.storm_id)
+        if deleted.storm_id is not None:
+            await storm_summaries.rescue_counted(session, deleted.storm_id, deleted.status, deleted.priority, -1)
         return True
 
 
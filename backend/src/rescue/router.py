@@ -1,4 +1,4 @@
-from typing import List, Annotated
+from typing import List, Annotated, Optional
 from fastapi import (
     APIRouter,
     Body,
@@ -7,7 +7,8 @@ from fastapi import (
     Query,
     status,
 )
-from src.dependencies import DBSession
+from src.dependencies import DBSession, ReadOnlyDBSession, Cursor, StormCache
+from src.export import ExportFormat, stream_export
 from src.schemas import (
     RescueRequestCreate,
     RescueRequestUpdate,
@@ -16,6 +17,7 @@ from src.schemas import (
 )
 
 from src.rescue.service import RescueRequestService
+from src.rescue.model import RESCUE_SORT_KEY
 
 service = RescueRequestService()
 router = APIRouter(prefix="/api/v1/rescue", tags=["rescue-requests"])
@@ -34,81 +36,110 @@ async def create_rescue_request(
 @router.get("/", response_model=List[RescueRequestResponse])
 async def get_all_rescue_requests(
     pagination: Annotated[PaginationRequest, Depends()],
-    session: DBSession = None,
+    keyset: Cursor,
+    session: ReadOnlyDBSession = None,
 ):
     """Get all rescue requests with pagination"""
-    requests_list = await service.get_all_rescue_requests(session=session, skip=pagination.skip, limit=pagination.limit)
-    return requests_list
+    requests_list = await service.get_all_rescue_requests(
+        session=session,
+        skip=pagination.skip,
+        limit=pagination.limit,
+        cursor=keyset.cursor
+    )
+    return keyset.page(requests_list, pagination.limit, RESCUE_SORT_KEY)
 
 
 @router.get("/storm/{storm_id}", response_model=List[RescueRequestResponse])
 async def get_requests_by_storm(
     storm_id: str,
     pagination: Annotated[PaginationRequest, Depends()],
-    session: DBSession = None,
+    keyset: Cursor,
+    cache: StormCache,
+    session: ReadOnlyDBSession = None,
 ):
     """Get all rescue requests for a specific storm"""
+    cached = cache.lookup(storm_id)
+    if cached is not None:
+        return cached
     requests_list = await service.get_requests_by_storm(
         session=session,
         storm_id=storm_id,
         skip=pagination.skip,
-        limit=pagination.limit
+        limit=pagination.limit,
+        cursor=keyset.cursor
     )
-    return requests_list
+    return cache.store(keyset.page(requests_list, pagination.limit, RESCUE_SORT_KEY), List[RescueRequestResponse])
 
 
 @router.get("/status/{status_filter}", response_model=List[RescueRequestResponse])
 async def get_requests_by_status(
     status_filter: str,
     pagination: Annotated[PaginationRequest, Depends()],
-    session: DBSession = None,
+    keyset: Cursor,
+    session: ReadOnlyDBSession = None,
 ):
     """Get rescue requests by status"""
     requests_list = await service.get_requests_by_status(
         session=session,
         status_filter=status_filter,
         skip=pagination.skip,
-        limit=pagination.limit
+        limit=pagination.limit,
+        cursor=keyset.cursor
     )
-    return requests_list
+    return keyset.page(requests_list, pagination.limit, RESCUE_SORT_KEY)
 
 
 @router.get("/priority/{priority}", response_model=List[RescueRequestResponse])
 async def get_requests_by_priority(
     priority: int,
     pagination: Annotated[PaginationRequest, Depends()],
-    session: DBSession = None,
+    keyset: Cursor,
+    session: ReadOnlyDBSession = None,
 ):
     """Get rescue requests by priority level"""
     requests_list = await service.get_requests_by_priority(
         session=session,
         priority=priority,
         skip=pagination.skip,
-        limit=pagination.limit
+        limit=pagination.limit,
+        cursor=keyset.cursor
     )
-    return requests_list
+    return keyset.page(requests_list, pagination.limit, RESCUE_SORT_KEY)
 
 
 @router.get("/verified", response_model=List[RescueRequestResponse])
 async def get_verified_requests(
     pagination: Annotated[PaginationRequest, Depends()],
+    keyset: Cursor,
     verified: bool = Query(True, description="Filter by verified status"),
-    session: DBSession = None,
+    session: ReadOnlyDBSession = None,
 ):
     """Get verified or unverified rescue requests"""
     requests_list = await service.get_verified_requests(
         session=session,
         verified=verified,
         skip=pagination.skip,
-        limit=pagination.limit
+        limit=pagination.limit,
+        cursor=keyset.cursor
     )
-    return requests_list
+    return keyset.page(requests_list, pagination.limit, RESCUE_SORT_KEY)
+
+
+@router.get("/export")
+async def export_rescue_requests(
+    export_format: ExportFormat = "ndjson",
+    storm_id: Optional[str] = Query(None, description="Only export rows for this storm"),
+    session: ReadOnlyDBSession = None,
+):
+    """Stream every rescue request (optionally for one storm) as NDJSON or CSV"""
+    query = await service.export_rescue_requests(session=session, storm_id=storm_id)
+    return stream_export(query, export_format, f"rescue_requests_{storm_id or 'all'}")
 
 
 @router.get("/{request_id}", response_model=RescueRequestResponse)
 async def get_rescue_request(
     request_id: int = Path(...),
-    session: DBSession = None,
+    session: ReadOnlyDBSession = None,
 ):
     """Get a rescue request by ID"""
     request = await service.get_rescue_request(session=session, request_id=request_id)
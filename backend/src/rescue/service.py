@@ -1,9 +1,10 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from fastapi import HTTPException, status
+from sqlalchemy import Select
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.rescue.model import rescue_requests
-from src.storms.model import storms
+from src.storms.registry import storm_registry
 from src.models import RescueRequest as RescueRequestDB
 
 
@@ -14,8 +15,7 @@ class RescueRequestService:
         request_data: Dict[str, Any]
     ) -> RescueRequestDB:
         # Verify storm exists
-        storm = await storms.get_storm_by_id(session, request_data["storm_id"])
-        if not storm:
+        if not await storm_registry.exists(session, request_data["storm_id"]):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Storm with id {request_data['storm_id']} not found"
@@ -56,51 +56,67 @@ class RescueRequestService:
         session: AsyncSession,
         storm_id: str,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[RescueRequestDB]:
-        # Verify storm exists
-        storm = await storms.get_storm_by_id(session, storm_id)
-        if not storm:
+        requests_list = await rescue_requests.get_requests_by_storm(session, storm_id, skip, limit, cursor)
+        if not requests_list and not await storm_registry.exists(session, storm_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Storm with id {storm_id} not found"
             )
-        return await rescue_requests.get_requests_by_storm(session, storm_id, skip, limit)
+        return requests_list
     
     async def get_requests_by_status(
         self,
         session: AsyncSession,
         status_filter: str,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[RescueRequestDB]:
-        return await rescue_requests.get_requests_by_status(session, status_filter, skip, limit)
+        return await rescue_requests.get_requests_by_status(session, status_filter, skip, limit, cursor)
     
     async def get_requests_by_priority(
         self,
         session: AsyncSession,
         priority: int,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[RescueRequestDB]:
-        return await rescue_requests.get_requests_by_priority(session, priority, skip, limit)
+        return await rescue_requests.get_requests_by_priority(session, priority, skip, limit, cursor)
     
     async def get_verified_requests(
         self,
         session: AsyncSession,
         verified: bool = True,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[RescueRequestDB]:
-        return await rescue_requests.get_verified_requests(session, verified, skip, limit)
+        return await rescue_requests.get_verified_requests(session, verified, skip, limit, cursor)
     
     async def get_all_rescue_requests(
         self,
         session: AsyncSession,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[RescueRequestDB]:
-        return await rescue_requests.get_all_requests(session, skip, limit)
+        return await rescue_requests.get_all_requests(session, skip, limit, cursor)
+    
+    async def export_rescue_requests(
+        self,
+        session: AsyncSession,
+        storm_id: Optional[str] = None
+    ) -> Select:
+        if storm_id is not None and not await storm_registry.exists(session, storm_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Storm with id {storm_id} not found"
+            )
+        return rescue_requests.export_query(storm_id)
     
     async def update_rescue_request(
         self,
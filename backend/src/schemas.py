@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Literal, Optional, List
+from typing import Dict, Literal, Optional, List
 from datetime import datetime
 
 class HealthResponse(BaseModel):
@@ -14,6 +14,29 @@ class HealthResponse(BaseModel):
     hostname: str = Field(..., description="Machine hostname")
 
 
+class RepeatedStatement(BaseModel):
+    statement: str
+    max_count: int  # Most executions of this statement shape within one request
+
+
+class RouteDBMetrics(BaseModel):
+    method: str
+    route: str
+    requests: int
+    queries: int
+    avg_queries: float
+    max_queries: int
+    db_time_ms: float
+    avg_db_time_ms: float
+    pool_wait_ms: float
+    repeated_statements: List[RepeatedStatement] = []
+
+
+class DBMetricsResponse(BaseModel):
+    repeat_threshold: int
+    routes: List[RouteDBMetrics]
+
+
 class StormBase(BaseModel):
     name: str
     start_date: datetime
@@ -46,6 +69,40 @@ class StormResponse(BaseModel):
     description: Optional[str] = None
 
 
+class StormSummaryResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    storm_id: str
+    track_count: int
+    first_track_at: Optional[datetime] = None
+    first_lat: Optional[float] = None
+    first_lon: Optional[float] = None
+    last_track_at: Optional[datetime] = None
+    last_lat: Optional[float] = None
+    last_lon: Optional[float] = None
+    max_wind_speed: Optional[float] = None
+    min_lat: Optional[float] = None
+    max_lat: Optional[float] = None
+    min_lon: Optional[float] = None
+    max_lon: Optional[float] = None
+    rescue_count: int
+    rescue_by_status: Dict[str, int] = {}
+    rescue_by_priority: Dict[str, int] = {}  # keyed by priority as text; "unknown" when unset
+    latest_forecast_id: Optional[int] = None
+    latest_damage_id: Optional[int] = None
+    latest_damage_detail_id: Optional[int] = None
+    updated_at: datetime
+
+
+class StormProximityResponse(BaseModel):
+    storm_id: str
+    name: Optional[str] = None
+    distance_km: float  # Closest approach along the track (to the bbox centre for bbox queries)
+    closest_time: datetime
+    closest_lat: float
+    closest_lon: float
+
+
 # StormTrack Schemas
 class StormTrackCreate(BaseModel):
     storm_id: str
@@ -76,6 +133,54 @@ class StormTrackResponse(BaseModel):
     wind_speed: Optional[float] = None
 
 
+class StormTrackChangesResponse(BaseModel):
+    tracks: List[StormTrackResponse]
+    # track_ids deleted since the previous watermark
+    deleted: List[int]
+    # Pass back as ``since`` on the next poll
+    watermark: str
+    has_more: bool
+
+
+class StormTrackBulkError(BaseModel):
+    row: int  # 1-based index / line of the rejected point in the payload
+    error: str
+
+
+class StormTrackBulkResponse(BaseModel):
+    inserted: int
+    rejected: int
+    errors: List[StormTrackBulkError] = []
+
+
+class StormPositionBatchRequest(BaseModel):
+    timestamps: List[datetime] = Field(..., min_length=1, max_length=10000)
+
+
+class StormPositionResponse(BaseModel):
+    # Interpolated from the stored track; lat/lon are null outside the tracked period
+    timestamp: datetime
+    lat: Optional[float] = None
+    lon: Optional[float] = None
+    wind_speed: Optional[float] = None
+    category: Optional[int] = None
+
+
+class StormKinematicsPoint(BaseModel):
+    timestamp: datetime
+    lat: float
+    lon: float
+    wind_speed: Optional[float] = None
+    speed_kmh: Optional[float] = None  # Translation speed over the neighbouring points
+    heading_deg: Optional[float] = None  # Direction of motion, clockwise from north
+    wind_change_24h: Optional[float] = None  # Wind speed now minus 24 hours earlier
+
+
+class StormKinematicsResponse(BaseModel):
+    storm_id: str
+    points: List[StormKinematicsPoint]
+
+
 # NewsSource Schemas
 class NewsSourceCreate(BaseModel):
     storm_id: str
@@ -220,6 +325,35 @@ class ForecastResponse(BaseModel):
     created_at: datetime
 
 
+class ForecastDiffResponse(BaseModel):
+    forecast_id: int
+    against_id: int
+    storm_id: str
+    nchmf: List[dict]  # RFC 6902 JSON Patch from the ``against_id`` bulletin to this one
+    jtwc: List[dict]
+
+
+class ForecastPointResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    point_id: int
+    forecast_id: int
+    storm_id: str
+    source: Literal["nchmf", "jtwc"]
+    issued_at: datetime
+    valid_at: datetime
+    lead_hours: int
+    lat: float
+    lon: float
+    wind: Optional[float] = None
+    gust: Optional[float] = None
+    risk_level: Optional[int] = None
+    danger_min_lat: Optional[float] = None
+    danger_max_lat: Optional[float] = None
+    danger_min_lon: Optional[float] = None
+    danger_max_lon: Optional[float] = None
+
+
 # LiveTracking Schemas
 class LiveTrackingCreate(BaseModel):
     live_id: str
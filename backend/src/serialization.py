@@ -0,0 +1,25 @@
+from typing import Sequence
+
+import orjson
+from fastapi import Response
+from sqlalchemy import Row
+
+
+def rows_to_json(rows: Sequence[Row]) -> bytes:
+    """
+    Serialize column-tuple rows straight to a JSON array of objects.
+
+    Used by the ``fast`` read path: no ORM objects are built and no Pydantic
+    validation runs, so the selected columns must already match the route's
+    response model. orjson renders datetimes in the same ISO format.
+    """
+    return orjson.dumps([row._asdict() for row in rows])
+
+
+def rows_response(rows: Sequence[Row], response: Response) -> Response:
+    """JSON response for ``rows`` that keeps headers set on the injected response."""
+    return Response(
+        content=rows_to_json(rows),
+        media_type="application/json",
+        headers=dict(response.headers),
+    )
@@ -0,0 +1,145 @@
+import io
+import re
+from pathlib import Path
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+IBTRACS = "ibtracs"
+BDECK = "bdeck"
+FORMATS = (IBTRACS, BDECK)
+
+IBTRACS_COLUMNS = ["SID", "NAME", "ISO_TIME", "LAT", "LON", "USA_WIND", "WMO_WIND"]
+# b-deck (ATCF) fields: basin, cyclone number, YYYYMMDDHH, technique number, technique, tau, lat, lon, vmax (kt) ... storm name
+BDECK_FIELDS = {0: "basin", 1: "number", 2: "time", 4: "technique", 5: "tau", 6: "lat", 7: "lon", 8: "wind", 27: "name"}
+# Wider than any ATCF line, so short and long lines parse into the same columns
+BDECK_WIDTH = 64
+BDECK_FILE_NAME = re.compile(r"^b([a-z]{2})(\d{2})(\d{4})\.dat$", re.IGNORECASE)
+# Names the archives use for storms that were never named
+UNNAMED = {"", "NOT_NAMED", "UNNAMED", "NONAME", "INVEST"}
+
+KNOTS_TO_KMH = 1.852
+# Lower bounds (km/h) of Beaufort levels 1-17; the level stored in ``category``
+BEAUFORT_KMH = np.array([1, 6, 12, 20, 29, 39, 50, 62, 75, 89, 103, 118, 134, 150, 167, 184, 202])
+
+# (storm_id, name, first timestamp, last timestamp) of a storm seen in a chunk
+ArchiveStorm = Tuple[str, Optional[str], Any, Any]
+
+
+class ParsedChunk(NamedTuple):
+    storms: List[ArchiveStorm]
+    # Records in TRACK_COPY_COLUMNS order
+    tracks: List[Tuple[Any, ...]]
+    rejected: int
+
+
+def detect_format(path: Path) -> str:
+    if path.suffix.lower() == ".csv":
+        return IBTRACS
+    if path.suffix.lower() in (".dat", ".txt") or BDECK_FILE_NAME.match(path.name):
+        return BDECK
+    raise ValueError(f"Cannot tell the format of {path.name}; pass --format")
+
+
+def beaufort_level(wind_kmh: np.ndarray) -> np.ndarray:
+    return np.searchsorted(BEAUFORT_KMH, wind_kmh, side="right").astype(float)
+
+
+def _normalize(frame: pd.DataFrame) -> ParsedChunk:
+    """
+    Turn a frame of storm_id, name, timestamp, lat, lon and wind (knots) into
+    copy records. Rows without a time or a valid position are rejected, the
+    last report of a (storm, time) pair wins, longitudes are wrapped into
+    [-180, 180) and wind is converted to km/h.
+    """
+    frame = frame.assign(
+        lat=pd.to_numeric(frame["lat"], errors="coerce"),
+        lon=pd.to_numeric(frame["lon"], errors="coerce"),
+        wind=pd.to_numeric(frame["wind"], errors="coerce"),
+    )
+    valid = (
+        frame["storm_id"].notna() & frame["timestamp"].notna()
+        & frame["lat"].between(-90, 90) & frame["lon"].between(-360, 360)
+    )
+    rejected = int((~valid).sum())
+    frame = frame[valid].drop_duplicates(["storm_id", "timestamp"], keep="last")
+
+    lon = (frame["lon"].to_numpy(dtype=float) + 180) % 360 - 180
+    wind = np.round(frame["wind"].to_numpy(dtype=float) * KNOTS_TO_KMH, 1)
+    category = beaufort_level(wind)
+    timestamps = frame["timestamp"].array.to_pydatetime().tolist()
+    tracks = list(zip(
+        frame["storm_id"].tolist(),
+        timestamps,
+        frame["lat"].astype(float).tolist(),
+        lon.tolist(),
+        [None if np.isnan(c) else int(c) for c in np.where(np.isnan(wind), np.nan, category)],
+        [None if np.isnan(w) else w for w in wind.tolist()],
+    ))
+
+    names = frame["name"].where(~frame["name"].fillna("").str.strip().str.upper().isin(UNNAMED))
+    grouped = frame.assign(name=names).groupby("storm_id", sort=False)
+    storms = list(zip(
+        grouped.size().index.tolist(),
+        # A storm is often named part-way through its track; take the latest name
+        [None if pd.isna(n) else n.strip().title() for n in grouped["name"].last()],
+        grouped["timestamp"].min().array.to_pydatetime().tolist(),
+        grouped["timestamp"].max().array.to_pydatetime().tolist(),
+    ))
+    return ParsedChunk(storms, tracks, rejected)
+
+
+def parse_ibtracs(header: bytes, lines: List[bytes]) -> ParsedChunk:
+    """Parse a block of IBTrACS CSV data lines; ``header`` is the file's column line."""
+    frame = pd.read_csv(
+        io.BytesIO(header + b"".join(lines)),
+        usecols=IBTRACS_COLUMNS, dtype=str, keep_default_na=False, skipinitialspace=True,
+    )
+    # USA agency 1-minute winds where present, else the WMO agency's
+    wind = pd.to_numeric(frame["USA_WIND"], errors="coerce").fillna(pd.to_numeric(frame["WMO_WIND"], errors="coerce"))
+    return _normalize(pd.DataFrame({
+        "storm_id": frame["SID"].str.strip().replace("", None),
+        "name": frame["NAME"],
+        "timestamp": pd.to_datetime(frame["ISO_TIME"], format="%Y-%m-%d %H:%M:%S", errors="coerce"),
+        "lat": frame["LAT"],
+        "lon": frame["LON"],
+        "wind": wind,
+    }))
+
+
+def parse_bdeck(file_name: str, lines: List[bytes]) -> ParsedChunk:
+    """
+    Parse a block of JTWC/ATCF b-deck lines. Storms are identified as
+    ``<BASIN><number><year>`` (e.g. WP012024), taken from the file name when
+    it follows the bBBNNYYYY.dat convention and from the lines otherwise.
+    """
+    frame = pd.read_csv(
+        io.BytesIO(b"".join(lines)), header=None, names=range(BDECK_WIDTH),
+        dtype=str, keep_default_na=False, skipinitialspace=True,
+    )[list(BDECK_FIELDS)].rename(columns=BDECK_FIELDS).fillna("")
+    frame = frame[frame["technique"].str.strip().isin(["BEST", ""]) & frame["tau"].str.strip().isin(["0", ""])]
+    time = pd.to_datetime(frame["time"].str.strip(), format="%Y%m%d%H", errors="coerce")
+
+    match = BDECK_FILE_NAME.match(file_name)
+    if match:
+        storm_id = pd.Series(f"{match[1].upper()}{match[2]}{match[3]}", index=frame.index)
+    else:
+        cyclone = frame["basin"].str.strip().str.upper() + frame["number"].str.strip().str.zfill(2)
+        # The year the storm formed, so a track running into January keeps one id
+        year = time.groupby(cyclone).transform("min").dt.year
+        storm_id = (cyclone + year.astype("Int64").astype(str)).where(year.notna())
+
+    def degrees(field: pd.Series, negative: str) -> pd.Series:
+        # "123N" is 12.3 degrees north
+        value = pd.to_numeric(field.str.strip().str[:-1], errors="coerce") / 10
+        return value.where(field.str.strip().str[-1:].str.upper() != negative, -value)
+
+    return _normalize(pd.DataFrame({
+        "storm_id": storm_id,
+        "name": frame["name"],
+        "timestamp": time,
+        "lat": degrees(frame["lat"], "S"),
+        "lon": degrees(frame["lon"], "W"),
+        "wind": frame["wind"],
+    }))
@@ -0,0 +1,202 @@
+import asyncio
+import bisect
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import asyncpg
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.caching import VERSIONS_CHANNEL, storm_versions
+from src.config import config
+from src.database import asyncpg_dsn
+from src.logger import logger
+
+# Channel the storms table triggers notify on (see the storm catalog migration)
+CHANNEL = "storm_catalog"
+CHANGED_CATALOG_KEY = "changed_catalog"
+STORM_COLUMNS = "storm_id, name, start_date, end_date, description"
+# Longest a lost listener connection waits before reconnecting
+MAX_RECONNECT_SECONDS = 30.0
+
+
+@dataclass(frozen=True)
+class CatalogStorm:
+    """A storms row as held in memory; shaped like the ORM Storm for StormResponse and the chatbot."""
+    storm_id: str
+    name: Optional[str]
+    start_date: Optional[datetime]
+    end_date: Optional[datetime]
+    description: Optional[str]
+
+
+class StormCatalog:
+    """
+    Process-local copy of the ``storms`` table for list, detail and existence reads.
+
+    ``start`` opens a dedicated connection to the primary, LISTENs on the
+    storm_catalog channel and then loads every storm, so no committed change
+    can fall between the load and the first notification. Each notification
+    names one changed storm; a worker task re-reads queued storms in batches.
+    This process's own commits queue their storms too, without waiting for
+    the round trip. The same connection carries StormVersions' channel, so
+    storm data versions follow other workers' writes while it is up.
+
+    A storm is served from memory only while it has no re-read pending, and
+    the whole list only while nothing is pending; otherwise, and whenever the
+    connection is down, callers read the database as before. After a
+    reconnect the catalog is reloaded in full, since notifications sent
+    while disconnected are lost.
+    """
+
+    def __init__(self):
+        self._storms: Dict[str, CatalogStorm] = {}
+        self._ids: List[str] = []
+        # storm_id -> times queued; a re-read settles only the requests it saw
+        self._pending: Dict[str, int] = {}
+        self._reload_pending = False
+        self._ready = False
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._loaded: Optional[asyncio.Event] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def serves(self, storm_id: Optional[str] = None) -> bool:
+        """Whether ``storm_id`` (or, without one, the whole list) can be read from memory."""
+        if not self._ready or self._reload_pending:
+            return False
+        return storm_id not in self._pending if storm_id is not None else not self._pending
+
+    def get(self, storm_id: str) -> Optional[CatalogStorm]:
+        return self._storms.get(storm_id)
+
+    def __contains__(self, storm_id: str) -> bool:
+        return storm_id in self._storms
+
+    def page(self, skip: int, limit: int, after: Optional[str] = None) -> List[CatalogStorm]:
+        """Storms in storm_id order, past the ``after`` keyset cursor or else past ``skip``."""
+        start = bisect.bisect_right(self._ids, after) if after is not None else skip
+        return [self._storms[storm_id] for storm_id in self._ids[start:start + limit]]
+
+    def queue(self, storm_ids) -> None:
+        for storm_id in storm_ids:
+            self._pending[storm_id] = self._pending.get(storm_id, 0) + 1
+        self._wake.set()
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        message = json.loads(payload)
+        if message.get("op") == "TRUNCATE":
+            self._reload_pending = True
+            self._wake.set()
+        else:
+            self.queue([message["storm_id"]])
+
+    def _put(self, storm: CatalogStorm) -> None:
+        if storm.storm_id not in self._storms:
+            bisect.insort(self._ids, storm.storm_id)
+        self._storms[storm.storm_id] = storm
+
+    def _drop(self, storm_id: str) -> None:
+        if self._storms.pop(storm_id, None) is not None:
+            del self._ids[bisect.bisect_left(self._ids, storm_id)]
+
+    async def _reload(self, connection: asyncpg.Connection) -> None:
+        self._reload_pending = False
+        self._pending.clear()
+        rows = await connection.fetch(f"SELECT {STORM_COLUMNS} FROM storms")
+        self._storms = {row["storm_id"]: CatalogStorm(**row) for row in rows}
+        self._ids = sorted(self._storms)
+
+    async def _refresh(self, connection: asyncpg.Connection) -> None:
+        seen = dict(self._pending)
+        rows = await connection.fetch(f"SELECT {STORM_COLUMNS} FROM storms WHERE storm_id = ANY($1)", list(seen))
+        found = {row["storm_id"]: CatalogStorm(**row) for row in rows}
+        for storm_id, count in seen.items():
+            if storm_id in found:
+                self._put(found[storm_id])
+            else:
+                self._drop(storm_id)
+            if self._pending.get(storm_id) == count:
+                del self._pending[storm_id]
+
+    async def _run(self) -> None:
+        delay = 1.0
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(asyncpg_dsn(config.DATABASE_URL), statement_cache_size=0)
+                connection.add_termination_listener(lambda _: self._wake.set())
+                await connection.add_listener(CHANNEL, self._on_notify)
+                await connection.add_listener(VERSIONS_CHANNEL, storm_versions.on_notify)
+                await self._reload(connection)
+                self._ready = True
+                storm_versions.set_notified(True)
+                self._loaded.set()
+                delay = 1.0
+                logger.info(f"[CATALOG] Loaded {len(self._storms)} storms; listening on {CHANNEL}")
+                while not connection.is_closed():
+                    await self._wake.wait()
+                    self._wake.clear()
+                    if self._reload_pending:
+                        await self._reload(connection)
+                    elif self._pending:
+                        await self._refresh(connection)
+                logger.warning("[CATALOG] Listener connection lost, reading storms from the database until it reconnects")
+            except asyncio.CancelledError:
+                raise
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                logger.warning(f"[CATALOG] Listener connection failed, reading storms from the database: {e}")
+            finally:
+                self._ready = False
+                storm_versions.set_notified(False)
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_SECONDS)
+
+    async def start(self, timeout: float = 5.0) -> None:
+        """Start listening and wait (up to ``timeout``) for the first load; reads fall back to the database until then."""
+        self._loaded = asyncio.Event()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        try:
+            await asyncio.wait_for(self._loaded.wait(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("[CATALOG] Storm catalog not loaded yet; serving storms from the database meanwhile")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._ready = False
+        storm_versions.set_notified(False)
+
+
+storm_catalog = StormCatalog()
+
+
+def mark_catalog_changed(session: AsyncSession, storm_id: str) -> None:
+    """Record a write to the storms row ``storm_id``; the catalog re-reads it once the session commits."""
+    session.info.setdefault(CHANGED_CATALOG_KEY, set()).add(storm_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _queue_changed_storms(session):
+    changed = session.info.pop(CHANGED_CATALOG_KEY, None)
+    if changed and storm_catalog.ready:
+        storm_catalog.queue(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_storms(session):
+    session.info.pop(CHANGED_CATALOG_KEY, None)
@@ -0,0 +1,119 @@
+import math
+from typing import List, Optional, Sequence
+
+import numpy as np
+import orjson
+from sqlalchemy import Row
+
+# Highest zoom of each simplification band; zooms above the last band get every point
+ZOOM_BANDS = (3, 6, 9, 12)
+# Maximum deviation of the simplified line from the raw track, in screen pixels at the band's highest zoom
+TOLERANCE_PIXELS = 1.0
+TILE_SIZE = 256
+MAX_MERCATOR_LAT = 85.0511
+
+
+def band_for_zoom(zoom: Optional[int]) -> int:
+    """Index of the band covering ``zoom``; ``len(ZOOM_BANDS)`` means unsimplified."""
+    if zoom is None:
+        return len(ZOOM_BANDS)
+    for band, max_zoom in enumerate(ZOOM_BANDS):
+        if zoom <= max_zoom:
+            return band
+    return len(ZOOM_BANDS)
+
+
+def band_tolerance(band: int) -> float:
+    """Simplification tolerance of ``band`` in Web Mercator world units (the world is 1x1)."""
+    if band >= len(ZOOM_BANDS):
+        return 0.0
+    return TOLERANCE_PIXELS / (TILE_SIZE * 2 ** ZOOM_BANDS[band])
+
+
+def _web_mercator(lon: np.ndarray, lat: np.ndarray):
+    lat = np.radians(np.clip(lat, -MAX_MERCATOR_LAT, MAX_MERCATOR_LAT))
+    x = (lon + 180.0) / 360.0
+    y = np.log(np.tan(math.pi / 4 + lat / 2)) / (2 * math.pi)
+    return x, y
+
+
+def simplify(x: np.ndarray, y: np.ndarray, tolerance: float, anchors: np.ndarray) -> np.ndarray:
+    """
+    Douglas-Peucker over the polyline ``x``/``y``; returns the indices of retained vertices.
+
+    Points flagged in ``anchors`` are always kept and the line is simplified
+    independently between consecutive anchors.
+    """
+    keep = anchors.copy()
+    if tolerance <= 0:
+        keep[:] = True
+        return np.flatnonzero(keep)
+
+    anchor_indices = np.flatnonzero(anchors)
+    stack = list(zip(anchor_indices[:-1], anchor_indices[1:]))
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        dx, dy = x[last] - x[first], y[last] - y[first]
+        px, py = x[first + 1:last] - x[first], y[first + 1:last] - y[first]
+        length = math.hypot(dx, dy)
+        if length == 0:
+            distance = np.hypot(px, py)
+        else:
+            distance = np.abs(dx * py - dy * px) / length
+        farthest = int(np.argmax(distance))
+        if distance[farthest] > tolerance:
+            index = first + 1 + farthest
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    return np.flatnonzero(keep)
+
+
+def _feature(storm_id: str, band: int, points: Sequence[Row], indices: Sequence[int]) -> bytes:
+    retained = [points[i] for i in indices]
+    min_zoom = ZOOM_BANDS[band - 1] + 1 if band > 0 else 0
+    max_zoom = ZOOM_BANDS[band] if band < len(ZOOM_BANDS) else None
+    return orjson.dumps({
+        "type": "Feature",
+        "geometry": {
+            "type": "LineString",
+            "coordinates": [[point.lon, point.lat] for point in retained],
+        } if len(retained) >= 2 else None,
+        "properties": {
+            "storm_id": storm_id,
+            "min_zoom": min_zoom,
+            "max_zoom": max_zoom,
+            "source_points": len(points),
+            "points": len(retained),
+            # Per-vertex attributes, aligned with the coordinates
+            "timestamps": [point.timestamp for point in retained],
+            "category": [point.category for point in retained],
+            "wind_speed": [point.wind_speed for point in retained],
+        },
+    })
+
+
+def track_geojson_by_band(storm_id: str, points: Sequence[Row]) -> List[bytes]:
+    """
+    A GeoJSON LineString Feature of the track for every zoom band, plus the
+    unsimplified track last (index ``len(ZOOM_BANDS)``).
+
+    The first and last points and every point where the category changes are
+    always retained, so category colouring stays exact at every zoom.
+    """
+    points = [point for point in points if point.lat is not None and point.lon is not None]
+    x, y = _web_mercator(
+        np.array([point.lon for point in points], dtype=float),
+        np.array([point.lat for point in points], dtype=float),
+    )
+    anchors = np.zeros(len(points), dtype=bool)
+    if points:
+        anchors[[0, -1]] = True
+        categories = [point.category for point in points]
+        anchors[1:] |= np.array([a != b for a, b in zip(categories, categories[1:])], dtype=bool)
+    return [
+        _feature(storm_id, band, points, simplify(x, y, band_tolerance(band), anchors))
+        for band in range(len(ZOOM_BANDS) + 1)
+    ]
@@ -0,0 +1,122 @@
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import Row
+
+from src.config import config
+
+
+class TrackArrays(NamedTuple):
+    """A storm's track as parallel arrays sorted by time; NaN marks a missing wind speed or category."""
+    seconds: np.ndarray  # epoch seconds
+    xyz: np.ndarray  # (n, 3) unit vectors of the positions
+    wind_speed: np.ndarray
+    category: np.ndarray
+
+
+def to_epoch_seconds(timestamps: Sequence[datetime]) -> np.ndarray:
+    # Track timestamps are stored naive; aware inputs are compared in UTC
+    naive = [t.astimezone(timezone.utc).replace(tzinfo=None) if t.tzinfo else t for t in timestamps]
+    return np.array(naive, dtype="datetime64[us]").astype(np.int64) / 1e6
+
+
+def build_track_arrays(points: Sequence[Row]) -> TrackArrays:
+    points = [p for p in points if p.timestamp is not None and p.lat is not None and p.lon is not None]
+    lat = np.radians([p.lat for p in points])
+    lon = np.radians([p.lon for p in points])
+    xyz = np.column_stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)))
+    seconds = to_epoch_seconds([p.timestamp for p in points])
+    # Rows arrive in (timestamp, track_id) order; a stable sort keeps that for equal timestamps
+    order = np.argsort(seconds, kind="stable")
+    return TrackArrays(
+        seconds=seconds[order],
+        xyz=xyz.reshape(-1, 3)[order],
+        wind_speed=np.array([np.nan if p.wind_speed is None else p.wind_speed for p in points], dtype=float)[order],
+        category=np.array([np.nan if p.category is None else p.category for p in points], dtype=float)[order],
+    )
+
+
+def interpolate(track: TrackArrays, seconds: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Positions, wind speeds and categories at ``seconds`` (epoch), all at once.
+
+    Positions move along the great circle between the bracketing track points
+    (spherical linear interpolation), wind speed is linear in time and the
+    category is the one of the nearer point. Times outside the track give NaN.
+    """
+    n = len(track.seconds)
+    result = {key: np.full(len(seconds), np.nan) for key in ("lat", "lon", "wind_speed", "category")}
+    if n == 0:
+        return result
+
+    inside = (seconds >= track.seconds[0]) & (seconds <= track.seconds[-1])
+    t = seconds[inside]
+    if n == 1:
+        left = right = np.zeros(len(t), dtype=int)
+    else:
+        right = np.clip(np.searchsorted(track.seconds, t, side="right"), 1, n - 1)
+        left = right - 1
+    span = track.seconds[right] - track.seconds[left]
+    fraction = np.divide(t - track.seconds[left], span, out=np.zeros_like(t), where=span > 0)
+
+    a, b = track.xyz[left], track.xyz[right]
+    omega = np.arccos(np.clip(np.einsum("ij,ij->i", a, b), -1.0, 1.0))
+    sin_omega = np.sin(omega)
+    # Nearly coincident points: the chord is the arc, fall back to linear weights
+    linear = sin_omega < 1e-9
+    safe = np.where(linear, 1.0, sin_omega)
+    wa = np.where(linear, 1 - fraction, np.sin((1 - fraction) * omega) / safe)
+    wb = np.where(linear, fraction, np.sin(fraction * omega) / safe)
+    xyz = wa[:, None] * a + wb[:, None] * b
+    xyz /= np.linalg.norm(xyz, axis=1)[:, None]
+
+    result["lat"][inside] = np.round(np.degrees(np.arcsin(np.clip(xyz[:, 2], -1.0, 1.0))), 6)
+    result["lon"][inside] = np.round(np.degrees(np.arctan2(xyz[:, 1], xyz[:, 0])), 6)
+    # At a track point its own wind speed stands even when the neighbour's is missing
+    wind_left, wind_right = track.wind_speed[left], track.wind_speed[right]
+    result["wind_speed"][inside] = np.where(
+        fraction == 0, wind_left,
+        np.where(fraction == 1, wind_right, (1 - fraction) * wind_left + fraction * wind_right)
+    )
+    result["category"][inside] = np.where(fraction < 0.5, track.category[left], track.category[right])
+    return result
+
+
+def positions_as_dicts(timestamps: Sequence[datetime], values: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    columns = {key: [None if np.isnan(v) else v for v in array.tolist()] for key, array in values.items()}
+    return [
+        {
+            "timestamp": timestamp,
+            "lat": columns["lat"][i],
+            "lon": columns["lon"][i],
+            "wind_speed": columns["wind_speed"][i],
+            "category": None if columns["category"][i] is None else int(columns["category"][i]),
+        }
+        for i, timestamp in enumerate(timestamps)
+    ]
+
+
+class TrackArrayCache:
+    """LRU of per-storm TrackArrays, each valid for the storm track version it was built under."""
+
+    def __init__(self, max_storms: int):
+        self.max_storms = max_storms
+        self._entries: "OrderedDict[str, Tuple[str, TrackArrays]]" = OrderedDict()
+
+    def get(self, storm_id: str, version: str) -> Optional[TrackArrays]:
+        entry = self._entries.get(storm_id)
+        if entry is None or entry[0] != version:
+            return None
+        self._entries.move_to_end(storm_id)
+        return entry[1]
+
+    def put(self, storm_id: str, version: str, track: TrackArrays) -> None:
+        self._entries[storm_id] = (version, track)
+        self._entries.move_to_end(storm_id)
+        while len(self._entries) > self.max_storms:
+            self._entries.popitem(last=False)
+
+
+track_array_cache = TrackArrayCache(config.TRACK_ARRAY_CACHE_MAX_STORMS)
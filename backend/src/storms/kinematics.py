@@ -0,0 +1,77 @@
+from typing import Dict, Sequence
+
+import numpy as np
+import orjson
+from sqlalchemy import Row
+
+from src.storms.interpolation import to_epoch_seconds
+from src.storms.spatial import haversine_km
+
+INTENSITY_WINDOW_SECONDS = 24 * 3600
+
+
+def bearing_deg(lat1, lon1, lat2, lon2):
+    """Initial great-circle bearing from point 1 to point 2, clockwise from north in [0, 360)."""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    dlon = lon2 - lon1
+    x = np.sin(dlon) * np.cos(lat2)
+    y = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(dlon)
+    return np.degrees(np.arctan2(x, y)) % 360
+
+
+def kinematics(seconds: np.ndarray, lat: np.ndarray, lon: np.ndarray, wind_speed: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Motion and intensity change at every point of a time-ordered track.
+
+    Speed (km/h) and heading use centred differences, from the previous to
+    the next point (one-sided at the ends). The 24h intensity change is the
+    wind speed minus the wind linearly interpolated 24 hours earlier, NaN
+    until the track has that much wind history. NaN marks values that cannot
+    be computed (a single point, equal timestamps, missing wind).
+    """
+    n = len(seconds)
+    result = {key: np.full(n, np.nan) for key in ("speed_kmh", "heading_deg", "wind_change_24h")}
+    if n >= 2:
+        index = np.arange(n)
+        prev, nxt = np.maximum(index - 1, 0), np.minimum(index + 1, n - 1)
+        hours = (seconds[nxt] - seconds[prev]) / 3600
+        distance = haversine_km(lat[prev], lon[prev], lat[nxt], lon[nxt])
+        moving = hours > 0
+        result["speed_kmh"] = np.divide(distance, hours, out=np.full(n, np.nan), where=moving)
+        result["heading_deg"] = np.where(moving & (distance > 0), bearing_deg(lat[prev], lon[prev], lat[nxt], lon[nxt]), np.nan)
+
+    known = ~np.isnan(wind_speed)
+    if known.any():
+        earlier = seconds - INTENSITY_WINDOW_SECONDS
+        past_wind = np.interp(earlier, seconds[known], wind_speed[known])
+        result["wind_change_24h"] = np.where(earlier >= seconds[known][0], wind_speed - past_wind, np.nan)
+    return result
+
+
+def track_kinematics_json(storm_id: str, points: Sequence[Row]) -> bytes:
+    """``{"storm_id", "points": [...]}`` for ``points`` ordered by (timestamp, track_id), serialized."""
+    points = [p for p in points if p.timestamp is not None and p.lat is not None and p.lon is not None]
+    lat = np.array([p.lat for p in points], dtype=float)
+    lon = np.array([p.lon for p in points], dtype=float)
+    wind_speed = np.array([np.nan if p.wind_speed is None else p.wind_speed for p in points], dtype=float)
+    values = kinematics(to_epoch_seconds([p.timestamp for p in points]), lat, lon, wind_speed)
+    decimals = {"speed_kmh": 2, "heading_deg": 1, "wind_change_24h": 2}
+    columns = {
+        key: [None if np.isnan(v) else v for v in np.round(array, decimals[key]).tolist()]
+        for key, array in values.items()
+    }
+    return orjson.dumps({
+        "storm_id": storm_id,
+        "points": [
+            {
+                "timestamp": point.timestamp,
+                "lat": point.lat,
+                "lon": point.lon,
+                "wind_speed": point.wind_speed,
+                "speed_kmh": columns["speed_kmh"][i],
+                "heading_deg": columns["heading_deg"][i],
+                "wind_change_24h": columns["wind_change_24h"][i],
+            }
+            for i, point in enumerate(points)
+        ],
+    })
@@ -1,9 +1,43 @@
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Tuple, Union
 from datetime import datetime
-from src.models import Storm as StormDB, StormTrack as StormTrackDB
+from src.models import (
+    Storm as StormDB,
+    StormTrack as StormTrackDB,
+    StormTrackTombstone,
+    CURRENT_REVISION,
+    NewsSource,
+    SocialPost,
+    RescueRequest,
+)
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import ARRAY, BigInteger, DateTime, Select, String, bindparam, case, delete, insert, select, tuple_, update, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from src.pagination import decode_cursor, paginate
+from src.caching import TRACKS, mark_storm_changed
+from src.storms.catalog import CatalogStorm, mark_catalog_changed, storm_catalog
+from src.storms.registry import mark_registry_changed
+from src.storms.summary import storm_summaries
+
+STORM_SORT_KEY = (StormDB.storm_id,)
+TRACK_SORT_KEY = (StormTrackDB.storm_id, StormTrackDB.timestamp, StormTrackDB.track_id)
+# Plain columns for the fast read path; they mirror StormTrackResponse
+TRACK_COLUMNS = tuple(c for c in StormTrackDB.__table__.columns if c.key != "revision")
+# Order of changes in the incremental sync; (revision, track_id) is the watermark
+TRACK_CHANGE_KEY = (StormTrackDB.revision, StormTrackDB.track_id)
+TOMBSTONE_CHANGE_KEY = (StormTrackTombstone.revision, StormTrackTombstone.track_id)
+
+# The columns a track geometry needs, in the order they are drawn
+TRACK_POINT_COLUMNS = (
+    StormTrackDB.timestamp, StormTrackDB.lat, StormTrackDB.lon, StormTrackDB.category, StormTrackDB.wind_speed
+)
+
+TRACK_COPY_COLUMNS = ("storm_id", "timestamp", "lat", "lon", "category", "wind_speed")
+
+ARCHIVE_STORM_BATCH = 5000
+
+# Children with a nullable storm_id that the ORM used to detach on delete.
+DETACHED_ON_STORM_DELETE = (StormTrackDB, NewsSource, SocialPost, RescueRequest)
 
 
 class StormTables:
@@ -20,35 +54,67 @@ class StormTables:
         start_date_obj = datetime.strptime(start_date, "%d-%m-%Y %H:%M") if start_date else None
         end_date_obj = datetime.strptime(end_date, "%d-%m-%Y %H:%M") if end_date else None
         
-        new_storm = StormDB(
-            storm_id=storm_id,
-            name=name,
-            start_date=start_date_obj,
-            end_date=end_date_obj,
-            description=description
+        new_storm = await session.scalar(
+            insert(StormDB).values(
+                storm_id=storm_id,
+                name=name,
+                start_date=start_date_obj,
+                end_date=end_date_obj,
+                description=description
+            ).returning(StormDB)
         )
-        session.add(new_storm)
-        await session.flush()
-        await session.refresh(new_storm)
+        await storm_summaries.create(session, storm_id)
+        mark_registry_changed(session, storm_id)
+        mark_storm_changed(session, storm_id)
+        mark_catalog_changed(session, storm_id)
         return new_storm
     
     async def get_storm_by_id(
         self,
         session: AsyncSession,
         storm_id: str
-    ) -> Optional[StormDB]:
+    ) -> Optional[Union[StormDB, CatalogStorm]]:
+        if storm_catalog.serves(storm_id):
+            return storm_catalog.get(storm_id)
         return await session.get(StormDB, storm_id)
     
     async def get_all_storms(
         self,
         session: AsyncSession,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[StormDB]:
-        query = select(StormDB).offset(skip).limit(limit)
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> List[Union[StormDB, CatalogStorm]]:
+        if storm_catalog.serves():
+            after = decode_cursor(cursor, STORM_SORT_KEY)[0] if cursor is not None else None
+            return storm_catalog.page(skip, limit, after)
+        query = paginate(select(StormDB), STORM_SORT_KEY, skip, limit, cursor)
         result = await session.execute(query)
         return result.scalars().all()
     
+    async def get_active_storm_ids(
+        self,
+        session: AsyncSession
+    ) -> List[str]:
+        # A storm without an end date is still ongoing
+        result = await session.execute(
+            select(StormDB.storm_id).where(StormDB.end_date.is_(None)).order_by(*STORM_SORT_KEY)
+        )
+        return result.scalars().all()
+    
+    async def get_season_storm_ids(
+        self,
+        session: AsyncSession,
+        season: int
+    ) -> List[str]:
+        # A storm belongs to the season (calendar year) it started in
+        result = await session.execute(
+            select(StormDB.storm_id).where(
+                StormDB.start_date >= datetime(season, 1, 1), StormDB.start_date < datetime(season + 1, 1, 1)
+            ).order_by(*STORM_SORT_KEY)
+        )
+        return result.scalars().all()
+    
     async def update_storm(
         self,
         session: AsyncSession,
@@ -58,35 +124,88 @@ class StormTables:
         end_date: Optional[str] = None,
         description: Optional[str] = None
     ) -> Optional[StormDB]:
-        storm = await self.get_storm_by_id(session, storm_id)
-        if not storm:
-            return None
-        
+        values = {}
         if name is not None:
-            storm.name = name
+            values["name"] = name
         if start_date is not None:
-            storm.start_date = datetime.strptime(start_date, "%d-%m-%Y %H:%M")
+            values["start_date"] = datetime.strptime(start_date, "%d-%m-%Y %H:%M")
         if end_date is not None:
-            storm.end_date = datetime.strptime(end_date, "%d-%m-%Y %H:%M")
+            values["end_date"] = datetime.strptime(end_date, "%d-%m-%Y %H:%M")
         if description is not None:
-            storm.description = description
+            values["description"] = description
         
-        await session.flush()
-        await session.refresh(storm)
-        return storm
+        if not values:
+            return await session.get(StormDB, storm_id)
+        
+        updated = await session.scalar(
+            update(StormDB)
+            .where(StormDB.storm_id == storm_id)
+            .values(**values)
+            .returning(StormDB)
+            .execution_options(populate_existing=True)
+        )
+        if updated is not None:
+            mark_storm_changed(session, updated.storm_id)
+            mark_catalog_changed(session, updated.storm_id)
+        return updated
     
     async def delete_storm(
         self,
         session: AsyncSession,
         storm_id: str
     ) -> bool:
-        storm = await self.get_storm_by_id(session, storm_id)
-        if not storm:
-            return False
-        
-        await session.delete(storm)
-        await session.flush()
-        return True
+        # Detach nullable children in the same statement, as the ORM cascade did.
+        detach = [
+            update(child).where(child.storm_id == storm_id).values(storm_id=None).cte(f"detach_{i}")
+            for i, child in enumerate(DETACHED_ON_STORM_DELETE)
+        ]
+        deleted = await session.scalar(
+            delete(StormDB)
+            .where(StormDB.storm_id == storm_id)
+            .add_cte(*detach)
+            .returning(StormDB.storm_id)
+        )
+        if deleted is not None:
+            mark_registry_changed(session, storm_id)
+            mark_storm_changed(session, storm_id, TRACKS)
+            mark_catalog_changed(session, storm_id)
+        return deleted is not None
+    
+    async def upsert_archive_storms(
+        self,
+        session: AsyncSession,
+        archive_storms: List[Tuple[str, Optional[str], datetime, datetime]]
+    ) -> None:
+        """
+        Insert (storm_id, name, first, last) storms from a best-track archive.
+        Storms already stored keep their name unless they had none, and their
+        dates widen to cover the new points; a storm without an end date is
+        still active and keeps none.
+        """
+        # Batches keep each statement under the driver's bind parameter limit
+        for i in range(0, len(archive_storms), ARCHIVE_STORM_BATCH):
+            stmt = pg_insert(StormDB).values([
+                {"storm_id": storm_id, "name": name, "start_date": first, "end_date": last}
+                for storm_id, name, first, last in archive_storms[i:i + ARCHIVE_STORM_BATCH]
+            ])
+            await session.execute(stmt.on_conflict_do_update(
+                index_elements=[StormDB.storm_id],
+                set_={
+                    "name": func.coalesce(StormDB.name, stmt.excluded.name),
+                    "start_date": func.least(StormDB.start_date, stmt.excluded.start_date),
+                    # GREATEST skips NULLs, which would close a live storm
+                    "end_date": case(
+                        (StormDB.end_date.is_(None), None),
+                        else_=func.greatest(StormDB.end_date, stmt.excluded.end_date),
+                    ),
+                },
+            ))
+        storm_ids = [storm[0] for storm in archive_storms]
+        await storm_summaries.create_many(session, storm_ids)
+        for storm_id in storm_ids:
+            mark_registry_changed(session, storm_id)
+            mark_storm_changed(session, storm_id)
+            mark_catalog_changed(session, storm_id)
 
 
 class StormTrackTables:
@@ -102,18 +221,105 @@ class StormTrackTables:
     ) -> StormTrackDB:
         timestamp_obj = datetime.strptime(timestamp, "%d-%m-%Y %H:%M") if timestamp else None
         
-        new_track = StormTrackDB(
-            storm_id=storm_id,
-            timestamp=timestamp_obj,
-            lat=lat,
-            lon=lon,
-            category=category,
-            wind_speed=wind_speed
+        mark_storm_changed(session, storm_id, TRACKS)
+        track = await session.scalar(
+            insert(StormTrackDB).values(
+                storm_id=storm_id,
+                timestamp=timestamp_obj,
+                lat=lat,
+                lon=lon,
+                category=category,
+                wind_speed=wind_speed
+            ).returning(StormTrackDB)
+        )
+        await storm_summaries.tracks_added(session, storm_id, [(timestamp_obj, lat, lon, wind_speed)])
+        return track
+    
+    async def copy_tracks(
+        self,
+        session: AsyncSession,
+        storm_id: str,
+        records: List[Tuple[Any, ...]]
+    ) -> Optional[int]:
+        """
+        COPY pre-validated track records into storm_tracks on the session's
+        transaction. Returns the number of rows written, or None when the
+        storm does not exist.
+        """
+        # The KEY SHARE lock both opens the transaction COPY joins and stops the
+        # storm being deleted underneath the load.
+        locked = await session.scalar(
+            select(StormDB.storm_id)
+            .where(StormDB.storm_id == storm_id)
+            .with_for_update(key_share=True)
+        )
+        if locked is None:
+            return None
+        if not records:
+            return 0
+
+        mark_storm_changed(session, storm_id, TRACKS)
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        result = await raw_connection.driver_connection.copy_records_to_table(
+            StormTrackDB.__tablename__,
+            records=records,
+            columns=list(TRACK_COPY_COLUMNS),
+        )
+        columns = {name: i for i, name in enumerate(TRACK_COPY_COLUMNS)}
+        await storm_summaries.tracks_added(session, storm_id, [
+            (r[columns["timestamp"]], r[columns["lat"]], r[columns["lon"]], r[columns["wind_speed"]]) for r in records
+        ])
+        # asyncpg returns the command tag, e.g. "COPY 1500"
+        return int(result.split()[-1])
+    
+    async def replace_archive_tracks(
+        self,
+        session: AsyncSession,
+        records: List[Tuple[Any, ...]]
+    ) -> Tuple[int, int]:
+        """
+        COPY track records of several (existing) storms, first deleting stored
+        points of the same storm at the same timestamp, so loading a chunk
+        twice (e.g. when an import resumes) replaces it instead of doubling it.
+        Returns (points replaced, points written).
+        """
+        if not records:
+            return 0, 0
+        columns = {name: i for i, name in enumerate(TRACK_COPY_COLUMNS)}
+        keys = select(
+            func.unnest(bindparam("storm_ids", [r[columns["storm_id"]] for r in records], type_=ARRAY(String))).label("storm_id"),
+            func.unnest(bindparam("timestamps", [r[columns["timestamp"]] for r in records], type_=ARRAY(DateTime))).label("timestamp"),
+        ).subquery()
+        replaced = (await session.execute(
+            delete(StormTrackDB)
+            .where(StormTrackDB.storm_id == keys.c.storm_id, StormTrackDB.timestamp == keys.c.timestamp)
+            .returning(StormTrackDB.track_id, StormTrackDB.storm_id)
+        )).all()
+        await self._bury(session, replaced)
+        
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        result = await raw_connection.driver_connection.copy_records_to_table(
+            StormTrackDB.__tablename__,
+            records=records,
+            columns=list(TRACK_COPY_COLUMNS),
         )
-        session.add(new_track)
-        await session.flush()
-        await session.refresh(new_track)
-        return new_track
+        
+        by_storm: Dict[str, List[Tuple[Any, ...]]] = {}
+        for r in records:
+            by_storm.setdefault(r[columns["storm_id"]], []).append(
+                (r[columns["timestamp"]], r[columns["lat"]], r[columns["lon"]], r[columns["wind_speed"]])
+            )
+        # A replaced point may have been a storm's first, last or strongest
+        touched = {row.storm_id for row in replaced}
+        for storm_id, points in by_storm.items():
+            mark_storm_changed(session, storm_id, TRACKS)
+            if storm_id in touched:
+                await storm_summaries.tracks_changed(session, storm_id)
+            else:
+                await storm_summaries.tracks_added(session, storm_id, points)
+        return len(replaced), int(result.split()[-1])
     
     async def get_track_by_id(
         self,
@@ -127,25 +333,60 @@ class StormTrackTables:
         session: AsyncSession,
         storm_id: str,
         skip: int = 0,
-        limit: int = 1000
+        limit: int = 1000,
+        cursor: Optional[str] = None,
+        as_rows: bool = False
     ) -> List[StormTrackDB]:
-        query = select(StormTrackDB).where(
-            StormTrackDB.storm_id == storm_id
-        ).order_by(StormTrackDB.timestamp).offset(skip).limit(limit)
+        query = paginate(
+            (select(*TRACK_COLUMNS) if as_rows else select(StormTrackDB)).where(StormTrackDB.storm_id == storm_id),
+            TRACK_SORT_KEY, skip, limit, cursor
+        )
         result = await session.execute(query)
-        return result.scalars().all()
+        return result.all() if as_rows else result.scalars().all()
     
     async def get_all_tracks(
         self,
         session: AsyncSession,
         skip: int = 0,
-        limit: int = 1000
+        limit: int = 1000,
+        cursor: Optional[str] = None,
+        as_rows: bool = False
     ) -> List[StormTrackDB]:
-        query = select(StormTrackDB).order_by(
-            StormTrackDB.storm_id, StormTrackDB.timestamp
-        ).offset(skip).limit(limit)
+        query = paginate(select(*TRACK_COLUMNS) if as_rows else select(StormTrackDB), TRACK_SORT_KEY, skip, limit, cursor)
         result = await session.execute(query)
-        return result.scalars().all()
+        return result.all() if as_rows else result.scalars().all()
+    
+    async def get_track_points(
+        self,
+        session: AsyncSession,
+        storm_id: str
+    ) -> List[Any]:
+        query = select(*TRACK_POINT_COLUMNS).where(
+            StormTrackDB.storm_id == storm_id
+        ).order_by(*TRACK_SORT_KEY)
+        result = await session.execute(query)
+        return result.all()
+    
+    async def get_track_points_by_storm(
+        self,
+        session: AsyncSession,
+        storm_ids: List[str]
+    ) -> Dict[str, List[Any]]:
+        """``get_track_points`` for several storms in one query."""
+        query = select(StormTrackDB.storm_id, *TRACK_POINT_COLUMNS).where(
+            StormTrackDB.storm_id.in_(storm_ids)
+        ).order_by(*TRACK_SORT_KEY)
+        points = {storm_id: [] for storm_id in storm_ids}
+        for row in (await session.execute(query)).all():
+            points[row.storm_id].append(row)
+        return points
+    
+    def export_query(self, storm_id: Optional[str] = None) -> Select:
+        """Every track point (optionally for one storm) in sort-key order, as plain columns."""
+        query = select(*TRACK_COLUMNS).order_by(*TRACK_SORT_KEY)
+        if storm_id is not None:
+            query = query.where(StormTrackDB.storm_id == storm_id)
+        return query
     
     async def update_track(
         self,
@@ -157,37 +398,94 @@ class StormTrackTables:
         category: Optional[int] = None,
         wind_speed: Optional[float] = None
     ) -> Optional[StormTrackDB]:
-        track = await self.get_track_by_id(session, track_id)
-        if not track:
-            return None
-        
+        values = {}
         if timestamp is not None:
-            track.timestamp = datetime.strptime(timestamp, "%d-%m-%Y %H:%M")
+            values["timestamp"] = datetime.strptime(timestamp, "%d-%m-%Y %H:%M")
         if lat is not None:
-            track.lat = lat
+            values["lat"] = lat
         if lon is not None:
-            track.lon = lon
+            values["lon"] = lon
         if category is not None:
-            track.category = category
+            values["category"] = category
         if wind_speed is not None:
-            track.wind_speed = wind_speed
+            values["wind_speed"] = wind_speed
         
-        await session.flush()
-        await session.refresh(track)
-        return track
+        if not values:
+            return await self.get_track_by_id(session, track_id)
+        
+        values["revision"] = CURRENT_REVISION
+        updated = await session.scalar(
+            update(StormTrackDB)
+            .where(StormTrackDB.track_id == track_id)
+            .values(**values)
+            .returning(StormTrackDB)
+            .execution_options(populate_existing=True)
+        )
+        if updated is not None:
+            mark_storm_changed(session, updated.storm_id, TRACKS)
+            if updated.storm_id is not None and values.keys() - {"category"}:
+                await storm_summaries.tracks_changed(session, updated.storm_id)
+        return updated
     
     async def delete_track(
         self,
         session: AsyncSession,
         track_id: int
     ) -> bool:
-        track = await self.get_track_by_id(session, track_id)
-        if not track:
+        deleted = (await session.execute(
+            delete(StormTrackDB)
+            .where(StormTrackDB.track_id == track_id)
+            .returning(StormTrackDB.track_id, StormTrackDB.storm_id)
+        )).first()
+        if deleted is None:
             return False
-        
-        await session.delete(track)
-        await session.flush()
+        await self._bury(session, [deleted])
+        mark_storm_changed(session, deleted.storm_id, TRACKS)
+        if deleted.storm_id is not None:
+            await storm_summaries.tracks_changed(session, deleted.storm_id)
         return True
+    
+    async def _bury(self, session: AsyncSession, deleted: List[Any]) -> None:
+        # Tombstones for deleted (track_id, storm_id) rows; points of no storm are never synced
+        rows = [{"track_id": row.track_id, "storm_id": row.storm_id} for row in deleted if row.storm_id is not None]
+        if rows:
+            await session.execute(insert(StormTrackTombstone), rows)
+    
+    async def get_track_changes(
+        self,
+        session: AsyncSession,
+        storm_id: str,
+        since: Optional[Tuple[int, int]],
+        limit: int
+    ) -> Tuple[List[Any], List[Any]]:
+        """
+        Up to ``limit`` points and up to ``limit`` tombstones of ``storm_id``
+        written after the ``since`` watermark, each in watermark order.
+
+        Only transactions older than every one still running are included:
+        a transaction that is still open may hold a lower revision than one
+        that already committed, and must not end up behind a watermark.
+        """
+        settled = StormTrackDB.revision < func.pg_snapshot_xmin(func.pg_current_snapshot()).cast(String).cast(BigInteger)
+        query = select(*TRACK_COLUMNS, StormTrackDB.revision).where(StormTrackDB.storm_id == storm_id, settled)
+        if since is not None:
+            query = query.where(tuple_(*TRACK_CHANGE_KEY) > tuple_(*since))
+        tracks = (await session.execute(query.order_by(*TRACK_CHANGE_KEY).limit(limit))).all()
+        
+        # A first sync starts from nothing, so it has nothing to delete
+        if since is None:
+            return tracks, []
+        tombstones = (await session.execute(
+            select(StormTrackTombstone.track_id, StormTrackTombstone.revision)
+            .where(
+                StormTrackTombstone.storm_id == storm_id,
+                StormTrackTombstone.revision < settled.right,
+                tuple_(*TOMBSTONE_CHANGE_KEY) > tuple_(*since),
+            )
+            .order_by(*TOMBSTONE_CHANGE_KEY)
+            .limit(limit)
+        )).all()
+        return tracks, tombstones
 
     
 storms = StormTables()
@@ -0,0 +1,73 @@
+import time
+from typing import Dict, Tuple
+
+from sqlalchemy import event, exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.config import config
+from src.models import Storm as StormDB
+from src.storms.catalog import storm_catalog
+
+CHANGED_REGISTRY_KEY = "changed_registry"
+
+
+class StormRegistry:
+    """
+    Process-wide cache of storm existence shared by every service.
+
+    Answered from the storm catalog while it is in sync. Otherwise a storm
+    found in the database is trusted for ``ttl`` seconds, so deletes made by
+    other workers are picked up; a missing storm is not cached, so a storm
+    created anywhere is seen at once. StormTables invalidates the entries of
+    storms it creates or deletes once the session commits.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 10_000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[bool, float]] = {}
+
+    async def exists(self, session: AsyncSession, storm_id: str) -> bool:
+        if storm_catalog.serves(storm_id):
+            return storm_id in storm_catalog
+        now = time.monotonic()
+        entry = self._entries.get(storm_id)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+
+        found = bool(await session.scalar(
+            select(exists().where(StormDB.storm_id == storm_id))
+        ))
+        if not found:
+            return False
+        if len(self._entries) >= self.max_entries:
+            self._entries = {k: v for k, v in self._entries.items() if v[1] > now}
+        self._entries[storm_id] = (True, now + self.ttl)
+        return True
+
+    def invalidate(self, storm_id: str) -> None:
+        self._entries.pop(storm_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+storm_registry = StormRegistry(ttl=config.STORM_CACHE_TTL_SECONDS)
+
+
+def mark_registry_changed(session: AsyncSession, storm_id: str) -> None:
+    """Record that ``storm_id`` was created or deleted; its entry is dropped once the session commits."""
+    session.info.setdefault(CHANGED_REGISTRY_KEY, set()).add(storm_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_storms(session):
+    # After the commit, so a concurrent lookup cannot re-cache the state before it
+    for storm_id in session.info.pop(CHANGED_REGISTRY_KEY, ()):
+        storm_registry.invalidate(storm_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_storms(session):
+    session.info.pop(CHANGED_REGISTRY_KEY, None)
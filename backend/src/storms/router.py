@@ -8,20 +8,28 @@ from fastapi import (
     Form,
     Path,
     Query,
+    Request,
+    Response,
     UploadFile,
     WebSocket,
     WebSocketDisconnect,
     status,
 )
 from uuid import UUID
-from src.dependencies import DBSession
+import orjson
+from src.dependencies import DBSession, ReadOnlyDBSession, Cursor, StormCache, FastPath
+from src.serialization import rows_response, rows_to_json
+from src.export import ExportFormat, stream_export
 from src.schemas import (
-    StormCreate, StormUpdate, StormResponse,
-    StormTrackCreate, StormTrackUpdate, StormTrackResponse,
+    StormCreate, StormUpdate, StormResponse, StormSummaryResponse, StormProximityResponse,
+    StormTrackCreate, StormTrackUpdate, StormTrackResponse, StormTrackBulkResponse, StormTrackChangesResponse,
+    StormPositionBatchRequest, StormPositionResponse, StormKinematicsResponse,
     PaginationRequest, TrackPaginationRequest
 )
 
 from src.storms.service import StormService, StormTrackService
+from src.storms.model import STORM_SORT_KEY, TRACK_SORT_KEY
+from src.storms.summary import SUMMARY_SORT_KEY
 service = StormService()
 track_service = StormTrackService()
 router = APIRouter(prefix="/api/v1/storms", tags=["storms"])
@@ -40,21 +48,71 @@ async def create_storm(
 @router.get("/", response_model=List[StormResponse])
 async def get_all_storms(
     pagination: Annotated[PaginationRequest, Depends()],
-    session: DBSession = None,
+    keyset: Cursor,
+    session: ReadOnlyDBSession = None,
 ):
     """Get all storms with pagination"""
-    storms = await service.get_all_storms(session=session, skip=pagination.skip, limit=pagination.limit)
-    return storms
+    storms = await service.get_all_storms(
+        session=session,
+        skip=pagination.skip,
+        limit=pagination.limit,
+        cursor=keyset.cursor
+    )
+    return keyset.page(storms, pagination.limit, STORM_SORT_KEY)
+
+
+@router.get("/summary", response_model=List[StormSummaryResponse])
+async def get_storm_summaries(
+    pagination: Annotated[PaginationRequest, Depends()],
+    keyset: Cursor,
+    session: ReadOnlyDBSession = None,
+):
+    """Get the maintained overview of every storm: track extent, max wind, rescue counts and latest forecast/damage ids"""
+    summaries = await service.get_storm_summaries(
+        session=session,
+        skip=pagination.skip,
+        limit=pagination.limit,
+        cursor=keyset.cursor
+    )
+    return keyset.page(summaries, pagination.limit, SUMMARY_SORT_KEY)
+
+
+@router.get("/near", response_model=List[StormProximityResponse])
+async def get_storms_near(
+    lat: Optional[float] = Query(None, ge=-90, le=90, description="Latitude of the point of interest"),
+    lon: Optional[float] = Query(None, ge=-180, le=180, description="Longitude of the point of interest"),
+    radius_km: Optional[float] = Query(None, gt=0, le=5000, description="Search radius around lat/lon in km"),
+    bbox: Optional[str] = Query(None, description="min_lon,min_lat,max_lon,max_lat (min_lon above max_lon crosses the antimeridian); used instead of lat/lon/radius_km"),
+    limit: int = Query(100, ge=1, le=1000),
+    session: ReadOnlyDBSession = None,
+):
+    """Find storms whose track passed within a radius of a point or through a bounding box, closest first"""
+    return await service.find_storms_near(
+        session=session, lat=lat, lon=lon, radius_km=radius_km, bbox=bbox, limit=limit
+    )
+
+
+@router.get("/kinematics", response_model=List[StormKinematicsResponse])
+async def get_active_storm_kinematics(
+    session: ReadOnlyDBSession = None,
+):
+    """Get motion and intensity change along the track of every active (not yet ended) storm"""
+    body = await track_service.get_active_kinematics(session=session)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/{storm_id}", response_model=StormResponse)
 async def get_storm(
     storm_id: str = Path(...),
-    session: DBSession = None,
+    cache: StormCache = None,
+    session: ReadOnlyDBSession = None,
 ):
     """Get a storm by ID"""
+    cached = cache.lookup(storm_id)
+    if cached is not None:
+        return cached
     storm = await service.get_storm(session=session, storm_id=storm_id)
-    return storm
+    return cache.store(storm, StormResponse)
 
 
 @router.put("/{storm_id}", response_model=StormResponse)
@@ -96,36 +154,179 @@ async def create_storm_track(
     return result
 
 
+@router.post(
+    "/{storm_id}/tracks:bulk",
+    response_model=StormTrackBulkResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": {"type": "array", "items": {"type": "object"}}},
+                "application/x-ndjson": {"schema": {"type": "string"}},
+                "text/csv": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def bulk_create_storm_tracks(
+    request: Request,
+    storm_id: str = Path(...),
+    all_or_nothing: bool = Query(False, description="Reject the whole batch if any point is invalid"),
+    session: DBSession = None,
+):
+    """
+    Bulk-load track points for a storm from a JSON array, NDJSON or CSV body
+    (columns: timestamp, lat, lon, category, wind_speed; timestamps as
+    "DD-MM-YYYY HH:MM"). Valid points are written with a single COPY; invalid
+    ones are reported per row.
+    """
+    result = await track_service.bulk_create_tracks(
+        session=session,
+        storm_id=storm_id,
+        body=await request.body(),
+        content_type=request.headers.get("content-type"),
+        all_or_nothing=all_or_nothing
+    )
+    return result
+
+
 @router.get("/{storm_id}/tracks", response_model=List[StormTrackResponse])
 async def get_storm_tracks(
     storm_id: str,
     pagination: Annotated[TrackPaginationRequest, Depends()],
-    session: DBSession = None,
+    keyset: Cursor,
+    cache: StormCache,
+    fast: FastPath = False,
+    session: ReadOnlyDBSession = None,
 ):
     """Get all tracks for a specific storm"""
+    cached = cache.lookup(storm_id)
+    if cached is not None:
+        return cached
     tracks = await track_service.get_tracks_by_storm(
         session=session,
         storm_id=storm_id,
         skip=pagination.skip,
-        limit=pagination.limit
+        limit=pagination.limit,
+        cursor=keyset.cursor,
+        as_rows=fast
     )
-    return tracks
+    page = keyset.page(tracks, pagination.limit, TRACK_SORT_KEY)
+    if fast:
+        return cache.store_json(rows_to_json(page))
+    return cache.store(page, List[StormTrackResponse])
+
+
+@router.get("/{storm_id}/tracks/changes", response_model=StormTrackChangesResponse)
+async def get_storm_track_changes(
+    storm_id: str,
+    since: str = Query(
+        ...,
+        description="Watermark from a previous sync response, or 0 for the whole track"
+    ),
+    limit: int = Query(1000, ge=1, le=5000, description="Maximum number of changes to return"),
+    session: ReadOnlyDBSession = None,
+):
+    """Get the track points written and deleted since a sync watermark"""
+    return await track_service.get_track_changes(
+        session=session,
+        storm_id=storm_id,
+        since=since,
+        limit=limit
+    )
+
+
+@router.get("/{storm_id}/track.geojson")
+async def get_storm_track_geojson(
+    storm_id: str,
+    cache: StormCache,
+    zoom: Optional[int] = Query(
+        None, ge=0, le=22,
+        description="Map zoom level; the track is simplified to about one pixel at this zoom. Omit for every point"
+    ),
+    session: ReadOnlyDBSession = None,
+):
+    """Get the storm's track as a GeoJSON LineString Feature simplified for a zoom level"""
+    cached = cache.lookup(storm_id)
+    if cached is not None:
+        return cached
+    body = await track_service.get_track_geojson(session=session, storm_id=storm_id, zoom=zoom)
+    return cache.store_json(body, media_type="application/geo+json")
+
+
+@router.get("/{storm_id}/kinematics", response_model=StormKinematicsResponse)
+async def get_storm_kinematics(
+    storm_id: str,
+    cache: StormCache,
+    session: ReadOnlyDBSession = None,
+):
+    """Get translation speed, heading and 24h wind speed change at every track point"""
+    cached = cache.lookup(storm_id)
+    if cached is not None:
+        return cached
+    body = await track_service.get_kinematics(session=session, storm_id=storm_id)
+    return cache.store_json(body)
+
+
+@router.get("/{storm_id}/position", response_model=StormPositionResponse)
+async def get_storm_position(
+    storm_id: str,
+    at: datetime = Query(..., description="Time to interpolate the storm's position at"),
+    session: ReadOnlyDBSession = None,
+):
+    """Interpolate the storm's position, wind speed and category at a moment between track points"""
+    positions = await track_service.get_positions(session=session, storm_id=storm_id, timestamps=[at])
+    return positions[0]
+
+
+@router.post("/{storm_id}/positions", response_model=List[StormPositionResponse])
+async def get_storm_positions(
+    storm_id: str,
+    body: StormPositionBatchRequest,
+    session: ReadOnlyDBSession = None,
+):
+    """Interpolate the storm's position at many timestamps in one call (e.g. every frame of the time slider)"""
+    positions = await track_service.get_positions(session=session, storm_id=storm_id, timestamps=body.timestamps)
+    return Response(content=orjson.dumps(positions), media_type="application/json")
 
 
 @router.get("/tracks/all", response_model=List[StormTrackResponse])
 async def get_all_storm_tracks(
     pagination: Annotated[TrackPaginationRequest, Depends()],
-    session: DBSession = None,
+    keyset: Cursor,
+    fast: FastPath = False,
+    session: ReadOnlyDBSession = None,
 ):
     """Get all storm tracks across all storms"""
-    tracks = await track_service.get_all_tracks(session=session, skip=pagination.skip, limit=pagination.limit)
-    return tracks
+    tracks = await track_service.get_all_tracks(
+        session=session,
+        skip=pagination.skip,
+        limit=pagination.limit,
+        cursor=keyset.cursor,
+        as_rows=fast
+    )
+    page = keyset.page(tracks, pagination.limit, TRACK_SORT_KEY)
+    if fast:
+        return rows_response(page, keyset.response)
+    return page
+
+
+@router.get("/tracks/export")
+async def export_storm_tracks(
+    export_format: ExportFormat = "ndjson",
+    storm_id: Optional[str] = Query(None, description="Only export rows for this storm"),
+    session: ReadOnlyDBSession = None,
+):
+    """Stream every track point (optionally for one storm) as NDJSON or CSV"""
+    query = await track_service.export_tracks(session=session, storm_id=storm_id)
+    return stream_export(query, export_format, f"tracks_{storm_id or 'all'}")
 
 
 @router.get("/tracks/{track_id}", response_model=StormTrackResponse)
 async def get_storm_track(
     track_id: int = Path(...),
-    session: DBSession = None,
+    session: ReadOnlyDBSession = None,
 ):
     """Get a specific storm track by ID"""
     track = await track_service.get_track(session=session, track_id=track_id)
@@ -1,11 +1,24 @@
 import asyncio
+from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
 from fastapi import HTTPException, UploadFile, status
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.storms.model import storms, storm_tracks
-from src.models import Storm as StormDB, StormTrack as StormTrackDB
+from src.storms.model import TRACK_CHANGE_KEY, storms, storm_tracks
+from src.storms.bulk import parse_track_rows
+from src.storms.geometry import band_for_zoom, track_geojson_by_band
+from src.storms.kinematics import track_kinematics_json
+from src.storms.interpolation import (
+    TrackArrays, build_track_arrays, interpolate, positions_as_dicts, to_epoch_seconds, track_array_cache
+)
+from src.caching import TRACKS, CachedResponse, response_cache, storm_versions
+from src.pagination import decode_cursor, encode_cursor
+from src.storms.registry import storm_registry
+from src.storms.summary import storm_summaries
+from src.storms.spatial import parse_bbox, track_index
+from src.models import Storm as StormDB, StormTrack as StormTrackDB, StormSummary
 
 class StormService:
     async def create_storm(
@@ -40,9 +53,62 @@ class StormService:
         self,
         session: AsyncSession,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[StormDB]:
-        return await storms.get_all_storms(session, skip, limit)
+        return await storms.get_all_storms(session, skip, limit, cursor)
+    
+    async def get_storm_summaries(
+        self,
+        session: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> List[StormSummary]:
+        return await storm_summaries.get_summaries(session, skip, limit, cursor)
+    
+    async def find_storms_near(
+        self,
+        session: AsyncSession,
+        lat: Optional[float] = None,
+        lon: Optional[float] = None,
+        radius_km: Optional[float] = None,
+        bbox: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        if bbox is not None:
+            try:
+                min_lon, min_lat, max_lon, max_lat = parse_bbox(bbox, antimeridian=True)
+            except ValueError as e:
+                raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(e))
+        elif lat is None or lon is None or radius_km is None:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail="Pass either lat, lon and radius_km, or bbox"
+            )
+        
+        await track_index.sync(session)
+        if bbox is not None:
+            approaches = track_index.within_bbox(min_lon, min_lat, max_lon, max_lat)[:limit]
+        else:
+            approaches = track_index.near(lat, lon, radius_km)[:limit]
+        if not approaches:
+            return []
+        
+        names = dict((await session.execute(
+            select(StormDB.storm_id, StormDB.name).where(StormDB.storm_id.in_([a.storm_id for a in approaches]))
+        )).all())
+        return [
+            {
+                "storm_id": a.storm_id,
+                "name": names.get(a.storm_id),
+                "distance_km": a.distance_km,
+                "closest_time": a.time,
+                "closest_lat": a.lat,
+                "closest_lon": a.lon,
+            }
+            for a in approaches
+        ]
     
     async def update_storm(
         self,
@@ -86,8 +152,7 @@ class StormTrackService:
         track_data: Dict[str, Any]
     ) -> StormTrackDB:
         # Verify storm exists
-        storm = await storms.get_storm_by_id(session, track_data["storm_id"])
-        if not storm:
+        if not await storm_registry.exists(session, track_data["storm_id"]):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Storm with id {track_data['storm_id']} not found"
@@ -104,6 +169,39 @@ class StormTrackService:
         )
         return result
     
+    async def bulk_create_tracks(
+        self,
+        session: AsyncSession,
+        storm_id: str,
+        body: bytes,
+        content_type: Optional[str],
+        all_or_nothing: bool = False
+    ) -> Dict[str, Any]:
+        if not await storm_registry.exists(session, storm_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Storm with id {storm_id} not found"
+            )
+        
+        # Parsing thousands of points is CPU work; keep it off the event loop
+        records, errors = await asyncio.to_thread(parse_track_rows, body, content_type, storm_id)
+        if errors and all_or_nothing:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail={
+                    "message": f"{len(errors)} track point(s) rejected; nothing was inserted",
+                    "errors": errors
+                }
+            )
+        
+        inserted = await storm_tracks.copy_tracks(session, storm_id, records)
+        if inserted is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Storm with id {storm_id} not found"
+            )
+        return {"inserted": inserted, "rejected": len(errors), "errors": errors}
+    
     async def get_track(
         self,
         session: AsyncSession,
@@ -122,24 +220,178 @@ class StormTrackService:
         session: AsyncSession,
         storm_id: str,
         skip: int = 0,
-        limit: int = 1000
+        limit: int = 1000,
+        cursor: Optional[str] = None,
+        as_rows: bool = False
     ) -> List[StormTrackDB]:
-        # Verify storm exists
-        storm = await storms.get_storm_by_id(session, storm_id)
-        if not storm:
+        tracks = await storm_tracks.get_tracks_by_storm(session, storm_id, skip, limit, cursor, as_rows)
+        # An empty page is the only case where the storm itself needs checking
+        if not tracks and not await storm_registry.exists(session, storm_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Storm with id {storm_id} not found"
             )
-        return await storm_tracks.get_tracks_by_storm(session, storm_id, skip, limit)
+        return tracks
+    
+    async def get_track_changes(
+        self,
+        session: AsyncSession,
+        storm_id: str,
+        since: str,
+        limit: int = 1000
+    ) -> Dict[str, Any]:
+        """
+        Points written and track_ids deleted after the ``since`` watermark
+        ("0" for the whole track), with the watermark to poll from next.
+        """
+        watermark = None if since == "0" else tuple(decode_cursor(since, TRACK_CHANGE_KEY))
+        tracks, tombstones = await storm_tracks.get_track_changes(session, storm_id, watermark, limit)
+        if not tracks and not tombstones and not await storm_registry.exists(session, storm_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Storm with id {storm_id} not found"
+            )
+        
+        # Both lists are in watermark order; merge them and stop where either may continue
+        events = sorted(
+            [(t.revision, t.track_id, t) for t in tracks] + [(d.revision, d.track_id, None) for d in tombstones],
+            key=lambda event: event[:2]
+        )
+        has_more = len(tracks) == limit or len(tombstones) == limit
+        events = events[:limit]
+        return {
+            "tracks": [track for _, _, track in events if track is not None],
+            "deleted": [track_id for _, track_id, track in events if track is None],
+            "watermark": encode_cursor(events[-1][:2]) if events else since,
+            "has_more": has_more,
+        }
+    
+    async def get_track_geojson(
+        self,
+        session: AsyncSession,
+        storm_id: str,
+        zoom: Optional[int] = None
+    ) -> bytes:
+        band = band_for_zoom(zoom)
+        # Every band is built from one read and cached under the storm's track
+        # version: recomputed after a write to its tracks, or once per lease
+        # window while the version listener is down (see StormVersions)
+        version = storm_versions.token(storm_id, TRACKS)
+        cached = response_cache.get(("track.geojson", storm_id, version, band))
+        if cached is not None:
+            return cached.body
+        
+        points = await storm_tracks.get_track_points(session, storm_id)
+        if not points and not await storm_registry.exists(session, storm_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Storm with id {storm_id} not found"
+            )
+        bodies = await asyncio.to_thread(track_geojson_by_band, storm_id, points)
+        for b, body in enumerate(bodies if storm_versions.settled(storm_id, TRACKS) else ()):
+            response_cache.put(("track.geojson", storm_id, version, b), CachedResponse(body, {}, "application/geo+json"))
+        return bodies[band]
+    
+    async def _track_arrays(
+        self,
+        session: AsyncSession,
+        storm_id: str
+    ) -> TrackArrays:
+        version = storm_versions.token(storm_id, TRACKS)
+        track = track_array_cache.get(storm_id, version)
+        if track is not None:
+            return track
+        
+        points = await storm_tracks.get_track_points(session, storm_id)
+        if not points and not await storm_registry.exists(session, storm_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Storm with id {storm_id} not found"
+            )
+        track = build_track_arrays(points)
+        if storm_versions.settled(storm_id, TRACKS):
+            track_array_cache.put(storm_id, version, track)
+        return track
+    
+    async def get_positions(
+        self,
+        session: AsyncSession,
+        storm_id: str,
+        timestamps: List[datetime]
+    ) -> List[Dict[str, Any]]:
+        # Cached arrays: repeated calls while scrubbing do not touch the database
+        track = await self._track_arrays(session, storm_id)
+        values = interpolate(track, to_epoch_seconds(timestamps))
+        return positions_as_dicts(timestamps, values)
+    
+    async def get_kinematics(
+        self,
+        session: AsyncSession,
+        storm_id: str
+    ) -> bytes:
+        version = storm_versions.token(storm_id, TRACKS)
+        cached = response_cache.get(("kinematics", storm_id, version))
+        if cached is not None:
+            return cached.body
+        
+        points = await storm_tracks.get_track_points(session, storm_id)
+        if not points and not await storm_registry.exists(session, storm_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Storm with id {storm_id} not found"
+            )
+        body = track_kinematics_json(storm_id, points)
+        if storm_versions.settled(storm_id, TRACKS):
+            response_cache.put(("kinematics", storm_id, version), CachedResponse(body, {}))
+        return body
+    
+    async def get_active_kinematics(
+        self,
+        session: AsyncSession
+    ) -> bytes:
+        storm_ids = await storms.get_active_storm_ids(session)
+        versions = {storm_id: storm_versions.token(storm_id, TRACKS) for storm_id in storm_ids}
+        bodies = {}
+        for storm_id, version in versions.items():
+            cached = response_cache.get(("kinematics", storm_id, version))
+            if cached is not None:
+                bodies[storm_id] = cached.body
+        
+        # Storms whose track version moved since they were cached (a track write, or
+        # a new lease window while the version listener is down) are read together in one query
+        missing = [storm_id for storm_id in storm_ids if storm_id not in bodies]
+        if missing:
+            points = await storm_tracks.get_track_points_by_storm(session, missing)
+            computed = await asyncio.to_thread(
+                lambda: {storm_id: track_kinematics_json(storm_id, points[storm_id]) for storm_id in missing}
+            )
+            for storm_id, body in computed.items():
+                if storm_versions.settled(storm_id, TRACKS):
+                    response_cache.put(("kinematics", storm_id, versions[storm_id]), CachedResponse(body, {}))
+            bodies.update(computed)
+        return b"[" + b",".join(bodies[storm_id] for storm_id in storm_ids) + b"]"
     
     async def get_all_tracks(
         self,
         session: AsyncSession,
         skip: int = 0,
-        limit: int = 1000
+        limit: int = 1000,
+        cursor: Optional[str] = None,
+        as_rows: bool = False
     ) -> List[StormTrackDB]:
-        return await storm_tracks.get_all_tracks(session, skip, limit)
+        return await storm_tracks.get_all_tracks(session, skip, limit, cursor, as_rows)
+    
+    async def export_tracks(
+        self,
+        session: AsyncSession,
+        storm_id: Optional[str] = None
+    ) -> Select:
+        if storm_id is not None and not await storm_registry.exists(session, storm_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Storm with id {storm_id} not found"
+            )
+        return storm_tracks.export_query(storm_id)
     
     async def update_track(
         self,
@@ -0,0 +1,294 @@
+import asyncio
+import math
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.caching import storm_versions
+from src.config import config
+from src.models import StormSummary, StormTrack as StormTrackDB
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+# Grid cell size; a cell lists every storm with a track segment whose bounding box touches it
+CELL_DEGREES = 1.0
+# Cell columns around the globe; column numbers wrap at the antimeridian
+GRID_COLUMNS = round(360 / CELL_DEGREES)
+# Above this many changed storms a sync reads every track instead of an IN list
+FULL_RELOAD_STORMS = 500
+# Track timestamps are naive; they are kept as seconds since this naive epoch
+EPOCH = datetime(1970, 1, 1)
+
+Cell = Tuple[int, int]
+
+
+class StormPath(NamedTuple):
+    """One storm's track in time order: positions in degrees, times in epoch seconds."""
+    lat: np.ndarray
+    lon: np.ndarray
+    seconds: np.ndarray
+
+
+class Approach(NamedTuple):
+    storm_id: str
+    distance_km: float
+    time: datetime
+    lat: float
+    lon: float
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def parse_bbox(bbox: str, antimeridian: bool = False) -> Tuple[float, float, float, float]:
+    """
+    (min_lon, min_lat, max_lon, max_lat) from a "min_lon,min_lat,max_lon,max_lat" query value.
+
+    With ``antimeridian``, a min_lon above max_lon is a box crossing the
+    antimeridian, as in GeoJSON.
+    """
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(v) for v in bbox.split(","))
+    except ValueError:
+        raise ValueError("bbox must be min_lon,min_lat,max_lon,max_lat")
+    if (min_lon > max_lon and not antimeridian) or min_lat > max_lat:
+        raise ValueError("bbox minimums must not exceed its maximums")
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def _wrap_lon(lon):
+    """Longitude (or longitude difference) brought into [-180, 180)."""
+    return (lon + 180.0) % 360.0 - 180.0
+
+
+def _wrap_column(col):
+    return (col + GRID_COLUMNS // 2) % GRID_COLUMNS - GRID_COLUMNS // 2
+
+
+def _cell(lat: float, lon: float) -> Cell:
+    return math.floor(lat / CELL_DEGREES), math.floor(_wrap_lon(lon) / CELL_DEGREES)
+
+
+def _cells_in_box(min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> List[Cell]:
+    """Cells touching the box; longitudes past ±180 continue on the other side of the antimeridian."""
+    lat0, lat1 = math.floor(min_lat / CELL_DEGREES), math.floor(max_lat / CELL_DEGREES)
+    lon0 = math.floor(min_lon / CELL_DEGREES)
+    lon1 = min(math.floor(max_lon / CELL_DEGREES), lon0 + GRID_COLUMNS - 1)
+    # A box crossing the antimeridian is split into the column ranges either side of it
+    columns = [_wrap_column(j) for j in range(lon0, lon1 + 1)]
+    return [(i, j) for i in range(lat0, lat1 + 1) for j in columns]
+
+
+def _unwrapped_lon(path: StormPath) -> np.ndarray:
+    """Path longitudes made continuous, each step taking the short way across the antimeridian."""
+    return path.lon[0] + np.concatenate(([0.0], np.cumsum(_wrap_lon(np.diff(path.lon)))))
+
+
+def _path_cells(path: StormPath) -> Set[Cell]:
+    """Every cell touched by the bounding box of one of the path's segments (or its only point)."""
+    row = np.floor(path.lat / CELL_DEGREES).astype(int)
+    col = np.floor(_unwrapped_lon(path) / CELL_DEGREES).astype(int)
+    if len(row) == 1:
+        return {(int(row[0]), int(_wrap_column(col[0])))}
+    row_lo, row_span = np.minimum(row[:-1], row[1:]), np.abs(np.diff(row))
+    col_lo, col_span = np.minimum(col[:-1], col[1:]), np.abs(np.diff(col))
+    cells = set()
+    # Segments are short next to a cell, so walking the offsets covers all boxes in a few passes
+    for i in range(int(row_span.max()) + 1):
+        for j in range(int(col_span.max()) + 1):
+            reach = (row_span >= i) & (col_span >= j)
+            cells.update(zip((row_lo[reach] + i).tolist(), _wrap_column(col_lo[reach] + j).tolist()))
+    return cells
+
+
+def closest_approach(path: StormPath, lat: float, lon: float) -> Tuple[float, float, float, float]:
+    """
+    (distance_km, epoch seconds, lat, lon) of the point of ``path`` nearest to ``lat``/``lon``.
+
+    Every segment is projected onto a plane tangent at the query point and the
+    nearest point of each segment is found in one vectorized pass; the winner's
+    distance is then measured along the great circle.
+    """
+    scale = math.cos(math.radians(lat))
+    x = _wrap_lon(path.lon - lon) * KM_PER_DEGREE * scale
+    y = (path.lat - lat) * KM_PER_DEGREE
+    if len(x) == 1:
+        best, fraction = 0, 0.0
+    else:
+        dx, dy = np.diff(x), np.diff(y)
+        length = dx * dx + dy * dy
+        t = np.clip(np.divide(-(x[:-1] * dx + y[:-1] * dy), length, out=np.zeros_like(length), where=length > 0), 0.0, 1.0)
+        distance = np.hypot(x[:-1] + t * dx, y[:-1] + t * dy)
+        best = int(np.argmin(distance))
+        fraction = float(t[best])
+    nxt = min(best + 1, len(x) - 1)
+    at_lat = path.lat[best] + fraction * (path.lat[nxt] - path.lat[best])
+    at_lon = _wrap_lon(path.lon[best] + fraction * _wrap_lon(path.lon[nxt] - path.lon[best]))
+    at_seconds = path.seconds[best] + fraction * (path.seconds[nxt] - path.seconds[best])
+    distance = float(haversine_km(lat, lon, at_lat, at_lon))
+    # The plane distorts away from the query point; never report worse than the nearest recorded point
+    vertex_distance = haversine_km(lat, lon, path.lat, path.lon)
+    vertex = int(np.argmin(vertex_distance))
+    if vertex_distance[vertex] < distance:
+        return float(vertex_distance[vertex]), path.seconds[vertex], float(path.lat[vertex]), float(path.lon[vertex])
+    return distance, at_seconds, float(at_lat), float(at_lon)
+
+
+def _crosses_box(path: StormPath, min_lon: float, min_lat: float, max_lon: float, max_lat: float) -> bool:
+    """
+    Whether the path enters the box. ``max_lon`` may exceed 180 for a box
+    crossing the antimeridian; longitudes are compared in a frame centred
+    on the box, with every segment taking the short way round.
+    """
+    center = (min_lon + max_lon) / 2
+    lon = center + _wrap_lon(path.lon - center)
+    inside = (path.lat >= min_lat) & (path.lat <= max_lat) & (lon >= min_lon) & (lon <= max_lon)
+    if inside.any() or len(path.lat) == 1:
+        return bool(inside.any())
+    lat0, lat1 = path.lat[:-1], path.lat[1:]
+    step = _wrap_lon(np.diff(path.lon))
+    # A segment may leave the frame at its edges and re-enter on the far side
+    for shift in (-360.0, 0.0, 360.0):
+        lon0 = lon[:-1] + shift
+        lon1 = lon0 + step
+        overlaps = (
+            (np.minimum(lat0, lat1) <= max_lat) & (np.maximum(lat0, lat1) >= min_lat)
+            & (np.minimum(lon0, lon1) <= max_lon) & (np.maximum(lon0, lon1) >= min_lon)
+        )
+        # A segment whose bounding box overlaps the box crosses it unless all four corners lie on one side of it
+        sides = np.array([
+            (lon1 - lon0) * (corner_lat - lat0) - (lat1 - lat0) * (corner_lon - lon0)
+            for corner_lon, corner_lat in ((min_lon, min_lat), (min_lon, max_lat), (max_lon, min_lat), (max_lon, max_lat))
+        ])
+        if (overlaps & (sides.min(axis=0) <= 0) & (sides.max(axis=0) >= 0)).any():
+            return True
+    return False
+
+
+def _split_paths(rows: List[Tuple[str, datetime, float, float]]) -> Dict[str, StormPath]:
+    """Paths by storm from (storm_id, timestamp, lat, lon) rows ordered by storm and time."""
+    if not rows:
+        return {}
+    storm_ids, timestamps, lats, lons = zip(*rows)
+    lat = np.array(lats, dtype=float)
+    lon = np.array(lons, dtype=float)
+    seconds = np.array(timestamps, dtype="datetime64[us]").astype(np.int64) / 1e6
+    starts = [0] + [i for i in range(1, len(storm_ids)) if storm_ids[i] != storm_ids[i - 1]] + [len(storm_ids)]
+    return {
+        storm_ids[start]: StormPath(lat[start:end], lon[start:end], seconds[start:end])
+        for start, end in zip(starts, starts[1:])
+    }
+
+
+class TrackGridIndex:
+    """
+    In-process grid index over every storm's track for proximity queries.
+
+    Each storm's path is held as arrays and registered in the 1-degree cells
+    its segments cross. The index syncs from ``storm_summary``, whose
+    ``updated_at`` moves with every track write: only storms whose row
+    changed are reloaded and storms whose row is gone are dropped. A sync
+    runs before a query when this process committed a write since the last
+    one, and at least every TRACK_INDEX_SYNC_SECONDS for other workers'.
+    """
+
+    def __init__(self, sync_seconds: float):
+        self.sync_seconds = sync_seconds
+        self._paths: Dict[str, StormPath] = {}
+        self._cells: Dict[Cell, Set[str]] = defaultdict(set)
+        self._storm_cells: Dict[str, Set[Cell]] = {}
+        self._synced: Dict[str, datetime] = {}
+        self._synced_generation: Optional[int] = None
+        self._synced_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _remove(self, storm_id: str) -> None:
+        self._paths.pop(storm_id, None)
+        for cell in self._storm_cells.pop(storm_id, ()):
+            self._cells[cell].discard(storm_id)
+            if not self._cells[cell]:
+                del self._cells[cell]
+
+    def _add(self, storm_id: str, path: StormPath) -> None:
+        self._paths[storm_id] = path
+        self._storm_cells[storm_id] = _path_cells(path)
+        for cell in self._storm_cells[storm_id]:
+            self._cells[cell].add(storm_id)
+
+    async def sync(self, session: AsyncSession) -> None:
+        generation = storm_versions.generation
+        if generation == self._synced_generation and time.monotonic() - self._synced_at < self.sync_seconds:
+            return
+        async with self._lock:
+            if generation == self._synced_generation and time.monotonic() - self._synced_at < self.sync_seconds:
+                return
+            current = dict((await session.execute(select(StormSummary.storm_id, StormSummary.updated_at))).all())
+            changed = [storm_id for storm_id, updated_at in current.items() if self._synced.get(storm_id) != updated_at]
+            for storm_id in self._synced.keys() - current.keys():
+                self._remove(storm_id)
+
+            if changed:
+                # A point without a time or position has no place in the path
+                query = select(
+                    StormTrackDB.storm_id, StormTrackDB.timestamp, StormTrackDB.lat, StormTrackDB.lon
+                ).where(
+                    StormTrackDB.storm_id.isnot(None),
+                    StormTrackDB.timestamp.isnot(None),
+                    StormTrackDB.lat.isnot(None),
+                    StormTrackDB.lon.isnot(None),
+                ).order_by(StormTrackDB.storm_id, StormTrackDB.timestamp, StormTrackDB.track_id)
+                if len(changed) <= FULL_RELOAD_STORMS:
+                    query = query.where(StormTrackDB.storm_id.in_(changed))
+                paths = _split_paths((await session.execute(query)).tuples().all())
+                for storm_id in changed:
+                    self._remove(storm_id)
+                    if storm_id in paths:
+                        self._add(storm_id, paths[storm_id])
+
+            self._synced = current
+            self._synced_generation = generation
+            self._synced_at = time.monotonic()
+
+    def _candidates(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> Set[str]:
+        storms = set()
+        for cell in _cells_in_box(min_lat, min_lon, max_lat, max_lon):
+            storms.update(self._cells.get(cell, ()))
+        return storms
+
+    def _approach(self, storm_id: str, lat: float, lon: float) -> Approach:
+        distance, seconds, at_lat, at_lon = closest_approach(self._paths[storm_id], lat, lon)
+        at = EPOCH + timedelta(seconds=round(float(seconds)))
+        return Approach(storm_id, round(distance, 3), at, round(at_lat, 6), round(at_lon, 6))
+
+    def near(self, lat: float, lon: float, radius_km: float) -> List[Approach]:
+        """Storms whose track passed within ``radius_km`` of the point, nearest first."""
+        dlat = radius_km / KM_PER_DEGREE
+        dlon = min(180.0, radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6)))
+        candidates = self._candidates(lat - dlat, lon - dlon, lat + dlat, lon + dlon)
+        approaches = [self._approach(storm_id, lat, lon) for storm_id in candidates]
+        return sorted((a for a in approaches if a.distance_km <= radius_km), key=lambda a: a.distance_km)
+
+    def within_bbox(self, min_lon: float, min_lat: float, max_lon: float, max_lat: float) -> List[Approach]:
+        """
+        Storms whose track passed through the box; the approach is measured to
+        the box centre. A min_lon above max_lon is a box crossing the antimeridian.
+        """
+        if min_lon > max_lon:
+            max_lon += 360.0
+        center_lat, center_lon = (min_lat + max_lat) / 2, _wrap_lon((min_lon + max_lon) / 2)
+        approaches = []
+        for storm_id in self._candidates(min_lat, min_lon, max_lat, max_lon):
+            if _crosses_box(self._paths[storm_id], min_lon, min_lat, max_lon, max_lat):
+                approaches.append(self._approach(storm_id, center_lat, center_lon))
+        return sorted(approaches, key=lambda a: a.distance_km)
+
+
+track_index = TrackGridIndex(config.TRACK_INDEX_SYNC_SECONDS)
@@ -0,0 +1,254 @@
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Integer, Select, String, and_, case, cast, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import (
+    DamageAssessment,
+    DamageDetail,
+    Forecast,
+    RescueRequest,
+    StormSummary,
+    StormTrack,
+)
+from src.pagination import paginate
+
+SUMMARY_SORT_KEY = (StormSummary.storm_id,)
+UNKNOWN_KEY = "unknown"
+
+# (timestamp, lat, lon, wind_speed) of a track point being inserted
+TrackPoint = Tuple[Optional[datetime], Optional[float], Optional[float], Optional[float]]
+
+
+def _count_key(value: Any) -> str:
+    return UNKNOWN_KEY if value is None else str(value)
+
+
+def _bump_count(column, key: str, delta: int):
+    # column || {key: count + delta}; a count that drops to zero removes the key
+    count = func.coalesce(column[key].astext.cast(Integer), 0) + delta
+    return func.jsonb_strip_nulls(column.op("||", return_type=JSONB)(func.jsonb_build_object(key, func.nullif(count, 0))))
+
+
+class StormSummaryTables:
+    """
+    Incremental maintenance of ``storm_summary``.
+
+    Inserts fold their own values into the row with a single upsert (counts
+    add up, min/max/first/last compare against the stored values). Changes
+    that can shrink an aggregate - deleting or moving a track point, changing
+    a request's status or priority, removing the latest forecast or damage
+    row - recompute just that part of the row for the one storm from its
+    (storm_id, ...) index range. Every helper runs in the caller's
+    transaction, so the summary commits or rolls back with the write.
+    """
+
+    async def _upsert(self, session: AsyncSession, storm_id: str, values: Dict[str, Any], merge: Callable[[Any], Dict[str, Any]]) -> None:
+        # values is this write's own contribution; merge(excluded) folds it into an existing row
+        stmt = pg_insert(StormSummary).values(storm_id=storm_id, **values)
+        await session.execute(stmt.on_conflict_do_update(
+            index_elements=[StormSummary.storm_id],
+            set_={**merge(stmt.excluded), "updated_at": func.now()},
+        ))
+
+    async def _refresh(self, session: AsyncSession, query: Select) -> None:
+        # query selects storm_id plus recomputed columns, each labelled with its summary column name
+        names = [column.key for column in query.selected_columns]
+        stmt = pg_insert(StormSummary).from_select(names, query)
+        await session.execute(stmt.on_conflict_do_update(
+            index_elements=[StormSummary.storm_id],
+            set_={**{name: stmt.excluded[name] for name in names[1:]}, "updated_at": func.now()},
+        ))
+
+    async def create(self, session: AsyncSession, storm_id: str) -> None:
+        await session.execute(
+            pg_insert(StormSummary).values(storm_id=storm_id).on_conflict_do_nothing(index_elements=[StormSummary.storm_id])
+        )
+
+    async def create_many(self, session: AsyncSession, storm_ids: Sequence[str]) -> None:
+        if storm_ids:
+            await session.execute(
+                pg_insert(StormSummary).values([{"storm_id": storm_id} for storm_id in storm_ids])
+                .on_conflict_do_nothing(index_elements=[StormSummary.storm_id])
+            )
+
+    async def get_summaries(
+        self,
+        session: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> List[StormSummary]:
+        query = paginate(select(StormSummary), SUMMARY_SORT_KEY, skip, limit, cursor)
+        result = await session.execute(query)
+        return result.scalars().all()
+
+    async def tracks_added(self, session: AsyncSession, storm_id: str, points: Sequence[TrackPoint]) -> None:
+        if not points:
+            return
+        timed = [p for p in points if p[0] is not None]
+        # Equal timestamps: the later insert has the higher track_id, so it is "last"
+        first = min(timed, key=lambda p: p[0]) if timed else (None, None, None, None)
+        last = max(reversed(timed), key=lambda p: p[0]) if timed else (None, None, None, None)
+        lats = [p[1] for p in points if p[1] is not None]
+        lons = [p[2] for p in points if p[2] is not None]
+        winds = [p[3] for p in points if p[3] is not None]
+        values = {
+            "track_count": len(points),
+            "first_track_at": first[0], "first_lat": first[1], "first_lon": first[2],
+            "last_track_at": last[0], "last_lat": last[1], "last_lon": last[2],
+            "max_wind_speed": max(winds, default=None),
+            "min_lat": min(lats, default=None), "max_lat": max(lats, default=None),
+            "min_lon": min(lons, default=None), "max_lon": max(lons, default=None),
+        }
+
+        def merge(new):
+            s = StormSummary
+            earlier = and_(new.first_track_at.isnot(None), or_(s.first_track_at.is_(None), new.first_track_at < s.first_track_at))
+            later = and_(new.last_track_at.isnot(None), or_(s.last_track_at.is_(None), new.last_track_at >= s.last_track_at))
+            return {
+                "track_count": s.track_count + new.track_count,
+                **{name: case((earlier, new[name]), else_=s.__table__.c[name]) for name in ("first_track_at", "first_lat", "first_lon")},
+                **{name: case((later, new[name]), else_=s.__table__.c[name]) for name in ("last_track_at", "last_lat", "last_lon")},
+                "max_wind_speed": func.greatest(s.max_wind_speed, new.max_wind_speed),
+                "min_lat": func.least(s.min_lat, new.min_lat),
+                "max_lat": func.greatest(s.max_lat, new.max_lat),
+                "min_lon": func.least(s.min_lon, new.min_lon),
+                "max_lon": func.greatest(s.max_lon, new.max_lon),
+            }
+
+        await self._upsert(session, storm_id, values, merge)
+
+    async def tracks_changed(self, session: AsyncSession, storm_id: str) -> None:
+        def edge(column, last: bool):
+            order = (StormTrack.timestamp.desc(), StormTrack.track_id.desc()) if last else (StormTrack.timestamp, StormTrack.track_id)
+            return (
+                select(column)
+                .where(StormTrack.storm_id == storm_id, StormTrack.timestamp.isnot(None))
+                .order_by(*order)
+                .limit(1)
+                .correlate(None)
+                .scalar_subquery()
+            )
+
+        query = select(
+            literal(storm_id, String).label("storm_id"),
+            func.count(StormTrack.track_id).label("track_count"),
+            edge(StormTrack.timestamp, False).label("first_track_at"),
+            edge(StormTrack.lat, False).label("first_lat"),
+            edge(StormTrack.lon, False).label("first_lon"),
+            edge(StormTrack.timestamp, True).label("last_track_at"),
+            edge(StormTrack.lat, True).label("last_lat"),
+            edge(StormTrack.lon, True).label("last_lon"),
+            func.max(StormTrack.wind_speed).label("max_wind_speed"),
+            func.min(StormTrack.lat).label("min_lat"),
+            func.max(StormTrack.lat).label("max_lat"),
+            func.min(StormTrack.lon).label("min_lon"),
+            func.max(StormTrack.lon).label("max_lon"),
+        ).where(StormTrack.storm_id == storm_id)
+        await self._refresh(session, query)
+
+    async def rescue_counted(
+        self,
+        session: AsyncSession,
+        storm_id: str,
+        status: Optional[str],
+        priority: Optional[int],
+        delta: int
+    ) -> None:
+        status_key, priority_key = _count_key(status), _count_key(priority)
+        values = {
+            "rescue_count": delta,
+            "rescue_by_status": {status_key: delta},
+            "rescue_by_priority": {priority_key: delta},
+        }
+        await self._upsert(session, storm_id, values, lambda new: {
+            "rescue_count": StormSummary.rescue_count + new.rescue_count,
+            "rescue_by_status": _bump_count(StormSummary.rescue_by_status, status_key, delta),
+            "rescue_by_priority": _bump_count(StormSummary.rescue_by_priority, priority_key, delta),
+        })
+
+    async def rescue_changed(self, session: AsyncSession, storm_id: str) -> None:
+        def counts_by(column):
+            grouped = (
+                select(column.label("key"), func.count().label("n"))
+                .where(RescueRequest.storm_id == storm_id)
+                .group_by(column)
+                .subquery()
+            )
+            return select(
+                func.coalesce(func.jsonb_object_agg(grouped.c.key, grouped.c.n), cast("{}", JSONB))
+            ).scalar_subquery()
+
+        query = select(
+            literal(storm_id, String).label("storm_id"),
+            select(func.count()).where(RescueRequest.storm_id == storm_id).scalar_subquery().label("rescue_count"),
+            counts_by(func.coalesce(RescueRequest.status, UNKNOWN_KEY)).label("rescue_by_status"),
+            counts_by(func.coalesce(cast(RescueRequest.priority, String), UNKNOWN_KEY)).label("rescue_by_priority"),
+        )
+        await self._refresh(session, query)
+
+    async def forecast_added(self, session: AsyncSession, storm_id: str, forecast_id: int) -> None:
+        await self._upsert(session, storm_id, {"latest_forecast_id": forecast_id}, lambda new: {
+            "latest_forecast_id": func.greatest(StormSummary.latest_forecast_id, new.latest_forecast_id),
+        })
+
+    async def forecasts_changed(self, session: AsyncSession, storm_id: str) -> None:
+        latest = (
+            select(Forecast.forecast_id)
+            .where(Forecast.storm_id == storm_id)
+            .order_by(Forecast.created_at.desc(), Forecast.forecast_id.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        await self._refresh(session, select(
+            literal(storm_id, String).label("storm_id"), latest.label("latest_forecast_id")
+        ))
+
+    async def damage_added(self, session: AsyncSession, storm_id: str, damage_id: int, time: datetime) -> None:
+        def merge(new):
+            newer = or_(StormSummary.latest_damage_time.is_(None), new.latest_damage_time >= StormSummary.latest_damage_time)
+            return {
+                "latest_damage_id": case((newer, new.latest_damage_id), else_=StormSummary.latest_damage_id),
+                "latest_damage_time": case((newer, new.latest_damage_time), else_=StormSummary.latest_damage_time),
+            }
+
+        await self._upsert(session, storm_id, {"latest_damage_id": damage_id, "latest_damage_time": time}, merge)
+
+    async def damage_changed(self, session: AsyncSession, storm_id: str) -> None:
+        def latest(column):
+            return (
+                select(column)
+                .where(DamageAssessment.storm_id == storm_id)
+                .order_by(DamageAssessment.time.desc(), DamageAssessment.id.desc())
+                .limit(1)
+                .scalar_subquery()
+            )
+
+        await self._refresh(session, select(
+            literal(storm_id, String).label("storm_id"),
+            latest(DamageAssessment.id).label("latest_damage_id"),
+            latest(DamageAssessment.time).label("latest_damage_time"),
+        ))
+
+    async def damage_detail_added(self, session: AsyncSession, storm_id: str, damage_detail_id: int) -> None:
+        await self._upsert(session, storm_id, {"latest_damage_detail_id": damage_detail_id}, lambda new: {
+            "latest_damage_detail_id": func.greatest(StormSummary.latest_damage_detail_id, new.latest_damage_detail_id),
+        })
+
+    async def damage_details_changed(self, session: AsyncSession, storm_id: str) -> None:
+        latest = (
+            select(DamageDetail.id)
+            .where(DamageDetail.storm_id == storm_id)
+            .order_by(DamageDetail.created_at.desc(), DamageDetail.id.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        await self._refresh(session, select(
+            literal(storm_id, String).label("storm_id"), latest.label("latest_damage_detail_id")
+        ))
+
+
+storm_summaries = StormSummaryTables()
@@ -0,0 +1,69 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from src.storms.bulk import parse_track_rows
+
+
+def test_parses_json_array():
+    body = b'[{"timestamp": "01-11-2024 06:00", "lat": 12.5, "lon": 115, "category": 3, "wind_speed": 90.5}]'
+    records, errors = parse_track_rows(body, "application/json; charset=utf-8", "S1")
+    assert records == [("S1", datetime(2024, 11, 1, 6, 0), 12.5, 115.0, 3, 90.5)]
+    assert errors == []
+
+
+def test_optional_fields_become_none():
+    body = b'[{"timestamp": "01-11-2024 06:00", "lat": 12.5, "lon": 115}]'
+    records, _ = parse_track_rows(body, None, "S1")
+    assert records == [("S1", datetime(2024, 11, 1, 6, 0), 12.5, 115.0, None, None)]
+
+
+def test_reports_first_failing_check_per_row():
+    body = b"""[
+        {"timestamp": "2024-11-01 06:00", "lat": 12.5, "lon": 115},
+        {"timestamp": "01-11-2024 07:00", "lat": 95, "lon": 190},
+        {"timestamp": "01-11-2024 08:00", "lat": 12.5, "lon": 181},
+        {"timestamp": "01-11-2024 09:00", "lat": 12.5, "lon": 115, "category": 2.5},
+        {"timestamp": "01-11-2024 10:00", "lat": 12.5, "lon": 115, "wind_speed": "fast"},
+        "not an object",
+        {"timestamp": "01-11-2024 11:00", "lat": "-12.5", "lon": "-115"}
+    ]"""
+    records, errors = parse_track_rows(body, "application/json", "S1")
+    assert records == [("S1", datetime(2024, 11, 1, 11, 0), -12.5, -115.0, None, None)]
+    assert [(e["row"], e["error"].split()[0]) for e in errors] == [
+        (1, "timestamp"),
+        (2, "lat"),
+        (3, "lon"),
+        (4, "category"),
+        (5, "wind_speed"),
+        (6, "Track"),
+    ]
+
+
+def test_ndjson_rows_are_line_numbers():
+    body = b'{"timestamp": "01-11-2024 06:00", "lat": 1, "lon": 2}\n\n{broken\n{"timestamp": "01-11-2024 07:00", "lat": 1}\n'
+    records, errors = parse_track_rows(body, "application/x-ndjson", "S1")
+    assert len(records) == 1
+    assert [e["row"] for e in errors] == [3, 4]
+    assert errors[0]["error"].startswith("Invalid JSON")
+    assert errors[1]["error"].startswith("lon")
+
+
+def test_csv_rows_count_from_first_data_row():
+    body = b"timestamp,lat,lon,category\n01-11-2024 06:00,12.5,115,1\n01-11-2024 07:00,abc,115,\n"
+    records, errors = parse_track_rows(body, "text/csv", "S1")
+    assert records == [("S1", datetime(2024, 11, 1, 6, 0), 12.5, 115.0, 1, None)]
+    assert errors == [{"row": 2, "error": "lat is missing or not a number in [-90, 90]"}]
+
+
+@pytest.mark.parametrize("body, content_type, status_code", [
+    (b"{not json", "application/json", 422),
+    (b'{"timestamp": "01-11-2024 06:00"}', "application/json", 422),
+    (b"timestamp,lat\n01-11-2024 06:00,1\n", "text/csv", 422),
+    (b"<tracks/>", "application/xml", 415),
+])
+def test_rejects_unusable_bodies(body, content_type, status_code):
+    with pytest.raises(HTTPException) as excinfo:
+        parse_track_rows(body, content_type, "S1")
+    assert excinfo.value.status_code == status_code
@@ -0,0 +1,64 @@
+from datetime import datetime
+
+from src.forecasts.points import flatten_forecast, forecast_points
+
+BULLETIN = {
+    "current": {
+        "time": "2024-11-26 13:00",
+        "position": {"lat": 12.4, "lon": 116.6},
+        "intensity": {"wind": 9, "gust": 11},
+        "risk_level": None,
+    },
+    "forecast": [
+        {
+            "time": "27-11-2024 13:00",
+            "position": {"lat": "12.7", "lon": 114.1},
+            "intensity": {"wind": "10-11", "gust": "cấp 14"},
+            "danger_zone": {"lat_range": [15.0, 11.0], "lon_range": [112.0, 118.5]},
+            "risk_level": 3,
+        },
+        {"time": "2024-11-28T13:00:00+07:00", "position": {"lat": 12.4, "lon": 112.9}},
+        {"time": "2024-11-29 13:00", "position": {"lat": 12.0}},
+        {"position": {"lat": 11.0, "lon": 110.0}},
+        "not an entry",
+    ],
+}
+
+
+def test_flattens_current_and_forecast_entries():
+    points = flatten_forecast(7, "S1", "nchmf", BULLETIN)
+    assert [(p["lead_hours"], p["lat"], p["lon"]) for p in points] == [(0, 12.4, 116.6), (24, 12.7, 114.1), (48, 12.4, 112.9)]
+    assert {(p["forecast_id"], p["storm_id"], p["source"], p["issued_at"]) for p in points} == {
+        (7, "S1", "nchmf", datetime(2024, 11, 26, 13, 0))
+    }
+
+
+def test_reads_bulletin_numbers_and_danger_zones():
+    current, first, second = flatten_forecast(7, "S1", "nchmf", BULLETIN)
+    assert (current["wind"], current["gust"], current["risk_level"]) == (9.0, 11.0, None)
+    # A Beaufort range counts as its upper level
+    assert (first["wind"], first["gust"], first["risk_level"]) == (11.0, 14.0, 3)
+    assert (first["danger_min_lat"], first["danger_max_lat"], first["danger_min_lon"], first["danger_max_lon"]) == (
+        11.0, 15.0, 112.0, 118.5
+    )
+    assert second["danger_min_lat"] is None and second["wind"] is None
+
+
+def test_issue_time_falls_back_to_earliest_entry():
+    bulletin = {"forecast": [
+        {"time": "2024-11-27 13:00", "position": {"lat": 1, "lon": 2}},
+        {"time": "2024-11-27 01:00", "position": {"lat": 1, "lon": 2}},
+    ]}
+    assert [p["lead_hours"] for p in flatten_forecast(1, "S1", "jtwc", bulletin)] == [12, 0]
+
+
+def test_unusable_bulletins_give_no_points():
+    assert flatten_forecast(1, "S1", "nchmf", None) == []
+    assert flatten_forecast(1, "S1", "nchmf", {"current": "now", "forecast": {}}) == []
+    assert flatten_forecast(1, "S1", "nchmf", {"forecast": [{"position": {"lat": 1, "lon": 2}}]}) == []
+
+
+def test_forecast_points_covers_every_given_source():
+    points = forecast_points(7, "S1", {"jtwc": BULLETIN, "nchmf": None})
+    assert {p["source"] for p in points} == {"jtwc"}
+    assert len(forecast_points(7, "S1", {"nchmf": BULLETIN, "jtwc": BULLETIN})) == 6
@@ -0,0 +1,64 @@
+import pytest
+
+from src.forecasts.versions import apply_delta, apply_patch, content_hash, json_diff, payload_delta
+
+OLD = {
+    "current": {"time": "2024-11-26 13:00", "position": {"lat": 12.4, "lon": 116.6}, "risk_level": None},
+    "forecast": [{"time": "2024-11-27 13:00", "position": {"lat": 12.7, "lon": 114.1}}],
+    "a/b~c": 1,
+    "dropped": True,
+}
+NEW = {
+    "current": {"time": "2024-11-26 19:00", "position": {"lat": 12.5, "lon": 116.6}, "risk_level": 2},
+    "forecast": [
+        {"time": "2024-11-27 19:00", "position": {"lat": 12.8, "lon": 114.0}},
+        {"time": "2024-11-28 19:00", "position": {"lat": 12.9, "lon": 113.0}},
+    ],
+    "a/b~c": 2,
+    "added": {"nested": [1, 2]},
+}
+
+
+@pytest.mark.parametrize("old, new", [
+    (OLD, NEW),
+    (NEW, OLD),
+    (None, NEW),
+    (NEW, None),
+    ([1, 2, 3], [1, 5, 3]),
+    ({"x": 1}, {"x": 1.0}),
+    ({"x": 1}, {"x": True}),
+    ({"x": [1, {"y": 2}]}, {"x": [1, {"y": 3, "z": 4}]}),
+])
+def test_patch_round_trips(old, new):
+    assert apply_patch(old, json_diff(old, new)) == new
+
+
+def test_diff_is_granular():
+    patch = json_diff(OLD, NEW)
+    assert {"op": "remove", "path": "/dropped"} in patch
+    assert {"op": "replace", "path": "/a~1b~0c", "value": 2} in patch
+    assert {"op": "replace", "path": "/current/position/lat", "value": 12.5} in patch
+    # Arrays of another length are replaced whole
+    assert {"op": "replace", "path": "/forecast", "value": NEW["forecast"]} in patch
+    assert json_diff(NEW, NEW) == []
+
+
+def test_apply_patch_leaves_its_input_alone():
+    old = {"x": {"y": 1}}
+    apply_patch(old, json_diff(old, {"x": {"y": 2}}))
+    assert old == {"x": {"y": 1}}
+
+
+def test_payload_delta_round_trips_or_stores_whole():
+    base = {"nchmf": OLD, "jtwc": None}
+    small_change = {"nchmf": {**OLD, "a/b~c": 3}, "jtwc": None}
+    delta = payload_delta(base, small_change)
+    assert delta is not None
+    assert apply_delta(base, delta) == small_change
+    # A rewrite is no smaller as a diff
+    assert payload_delta(base, {"nchmf": {"other": 1}, "jtwc": None}) is None
+
+
+def test_content_hash_ignores_key_order():
+    assert content_hash({"nchmf": {"a": 1, "b": 2}}) == content_hash({"jtwc": None, "nchmf": {"b": 2, "a": 1}})
+    assert content_hash({"nchmf": {"a": 1}}) != content_hash({"nchmf": {"a": 2}})
@@ -0,0 +1,56 @@
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from src.storms.interpolation import build_track_arrays, interpolate, to_epoch_seconds
+
+TrackPoint = namedtuple("TrackPoint", "timestamp lat lon wind_speed category")
+START = datetime(2024, 11, 1)
+
+
+def at(*hours):
+    return to_epoch_seconds([START + timedelta(hours=h) for h in hours])
+
+
+def test_slerp_crosses_the_antimeridian_the_short_way():
+    track = build_track_arrays([
+        TrackPoint(START, 0.0, 179.0, 100.0, 3),
+        TrackPoint(START + timedelta(hours=6), 0.0, -179.0, 120.0, 4),
+    ])
+    values = interpolate(track, at(0, 1.5, 3, 6))
+    # Halfway lies on the antimeridian, not at 0 degrees on the far side of the globe
+    assert abs(values["lon"][2]) == pytest.approx(180.0)
+    assert values["lon"][1] == pytest.approx(179.5)
+    assert values["lon"][3] == pytest.approx(-179.0)
+    np.testing.assert_allclose(values["lat"], 0.0, atol=1e-6)
+    np.testing.assert_allclose(values["wind_speed"], [100.0, 105.0, 110.0, 120.0])
+    assert values["category"].tolist() == [3, 3, 4, 4]
+
+
+def test_slerp_follows_the_great_circle():
+    # Between two points at 60N the great circle bulges towards the pole
+    track = build_track_arrays([
+        TrackPoint(START, 60.0, 170.0, None, None),
+        TrackPoint(START + timedelta(hours=2), 60.0, -170.0, None, None),
+    ])
+    values = interpolate(track, at(1))
+    assert values["lat"][0] > 60.0
+    assert abs(values["lon"][0]) == pytest.approx(180.0)
+    assert np.isnan(values["wind_speed"][0])
+
+
+def test_times_outside_the_track_are_nan():
+    track = build_track_arrays([
+        TrackPoint(START + timedelta(hours=6), 10.0, 120.0, 80.0, 2),
+        TrackPoint(START, 9.0, 121.0, 70.0, 1),
+    ])
+    values = interpolate(track, at(-1, 0, 7))
+    assert np.isnan(values["lat"][[0, 2]]).all()
+    assert values["lat"][1] == pytest.approx(9.0)
+
+
+def test_aware_timestamps_compare_in_utc():
+    aware = datetime(2024, 11, 1, 7, tzinfo=timezone(timedelta(hours=7)))
+    assert to_epoch_seconds([aware])[0] == at(0)[0]
@@ -0,0 +1,200 @@
+"""
+Query plan regression tests for the model-layer list queries.
+
+Seeds a few storms with tracks, news, rescue requests, damage assessments,
+damage details and forecasts inside a transaction, calls every list/export
+query through the model layer, and runs each SQL statement it issues through
+EXPLAIN (FORMAT JSON). Sequential scans and sorts are disabled for the
+planner, so a plan that still contains a Seq Scan or Sort node means no index
+can serve that filter and order. The transaction is rolled back, so nothing is
+left behind.
+
+The database at DATABASE_URL must be migrated to head (alembic upgrade head);
+the tests are skipped when it cannot be reached.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, insert, text
+from sqlalchemy.exc import DBAPIError
+
+from src.database import AsyncSessionLocal, engine
+from src.models import DamageAssessment, DamageDetail, Forecast, NewsSource, RescueRequest, Storm, StormTrack
+from src.pagination import encode_cursor
+from src.storms.model import storms, storm_tracks
+from src.news.model import news_sources
+from src.rescue.model import rescue_requests
+from src.damage.model import damage_assessments
+from src.damage_details.model import damage_details
+from src.forecasts.model import ForecastModel
+
+STORM_IDS = [f"PLAN_CHECK_{i}" for i in range(3)]
+ROWS_PER_STORM = 200
+FORBIDDEN_NODES = {"Seq Scan", "Sort", "Incremental Sort"}
+
+START = datetime(2024, 1, 1)
+# Cursors positioned in the middle of the seeded data
+TIME_CURSOR = encode_cursor([START + timedelta(hours=ROWS_PER_STORM // 2), 10 ** 9])
+# Danger-zone boxes (min_lon, min_lat, max_lon, max_lat) as a forecast would give them
+ZONE_BBOXES = [(110.0, 10.0, 115.0, 15.0), (108.0, 12.0, 113.0, 17.0)]
+TRACK_CURSOR = encode_cursor([STORM_IDS[1], START + timedelta(hours=ROWS_PER_STORM // 2), 10 ** 9])
+
+
+def cases():
+    storm_id = STORM_IDS[1]
+    return [
+        ("storms.get_all_storms", lambda s: storms.get_all_storms(s)),
+        ("storm_tracks.get_tracks_by_storm", lambda s: storm_tracks.get_tracks_by_storm(s, storm_id)),
+        ("storm_tracks.get_tracks_by_storm (cursor)", lambda s: storm_tracks.get_tracks_by_storm(s, storm_id, cursor=TRACK_CURSOR)),
+        ("storm_tracks.get_all_tracks", lambda s: storm_tracks.get_all_tracks(s)),
+        ("storm_tracks.get_all_tracks (cursor)", lambda s: storm_tracks.get_all_tracks(s, cursor=TRACK_CURSOR)),
+        ("storm_tracks.export_query", lambda s: s.execute(storm_tracks.export_query(storm_id))),
+        ("storm_tracks.get_track_changes", lambda s: storm_tracks.get_track_changes(s, storm_id, None, 1000)),
+        ("storm_tracks.get_track_changes (watermark)", lambda s: storm_tracks.get_track_changes(s, storm_id, (0, 10 ** 9), 1000)),
+        ("news_sources.get_news_by_storm", lambda s: news_sources.get_news_by_storm(s, storm_id)),
+        ("news_sources.get_news_by_storm (cursor)", lambda s: news_sources.get_news_by_storm(s, storm_id, cursor=TIME_CURSOR)),
+        ("news_sources.get_news_by_storm_and_category", lambda s: news_sources.get_news_by_storm_and_category(s, storm_id, "warning")),
+        ("news_sources.get_news_by_storm_and_category (cursor)", lambda s: news_sources.get_news_by_storm_and_category(s, storm_id, "warning", cursor=TIME_CURSOR)),
+        ("news_sources.get_all_news", lambda s: news_sources.get_all_news(s)),
+        ("news_sources.export_query", lambda s: s.execute(news_sources.export_query())),
+        ("rescue_requests.get_requests_by_storm", lambda s: rescue_requests.get_requests_by_storm(s, storm_id)),
+        ("rescue_requests.get_requests_by_storm (cursor)", lambda s: rescue_requests.get_requests_by_storm(s, storm_id, cursor=TIME_CURSOR)),
+        ("rescue_requests.get_requests_by_status", lambda s: rescue_requests.get_requests_by_status(s, "pending")),
+        ("rescue_requests.get_requests_by_status (cursor)", lambda s: rescue_requests.get_requests_by_status(s, "pending", cursor=TIME_CURSOR)),
+        ("rescue_requests.get_requests_by_priority", lambda s: rescue_requests.get_requests_by_priority(s, 3)),
+        ("rescue_requests.get_verified_requests", lambda s: rescue_requests.get_verified_requests(s)),
+        ("rescue_requests.get_all_requests", lambda s: rescue_requests.get_all_requests(s)),
+        ("rescue_requests.export_query", lambda s: s.execute(rescue_requests.export_query(storm_id))),
+        ("rescue_requests.get_requests_in_boxes", lambda s: rescue_requests.get_requests_in_boxes(s, storm_id, "pending", ZONE_BBOXES)),
+        ("damage_assessments.get_damage_by_storm", lambda s: damage_assessments.get_damage_by_storm(s, storm_id)),
+        ("damage_assessments.get_latest_damage_by_storm", lambda s: damage_assessments.get_latest_damage_by_storm(s, storm_id)),
+        ("damage_assessments.get_all_damage", lambda s: damage_assessments.get_all_damage(s)),
+        ("damage_assessments.export_query", lambda s: s.execute(damage_assessments.export_query())),
+        ("damage_details.get_damage_details_by_storm", lambda s: damage_details.get_damage_details_by_storm(s, storm_id)),
+        ("damage_details.get_damage_details_by_storm (cursor)", lambda s: damage_details.get_damage_details_by_storm(s, storm_id, cursor=TIME_CURSOR)),
+        ("damage_details.get_all_damage_details", lambda s: damage_details.get_all_damage_details(s)),
+        ("damage_details.export_query", lambda s: s.execute(damage_details.export_query(storm_id))),
+        ("damage_details.get_damage_details_in_boxes", lambda s: damage_details.get_damage_details_in_boxes(s, storm_id, ZONE_BBOXES)),
+        ("ForecastModel.get_by_storm_id", lambda s: ForecastModel.get_by_storm_id(s, storm_id)),
+        ("ForecastModel.get_by_storm_id (cursor)", lambda s: ForecastModel.get_by_storm_id(s, storm_id, cursor=TIME_CURSOR)),
+        ("ForecastModel.get_latest_by_storm_id", lambda s: ForecastModel.get_latest_by_storm_id(s, storm_id)),
+        ("ForecastModel.get_latest_per_storm", lambda s: ForecastModel.get_latest_per_storm(s, STORM_IDS)),
+        ("ForecastModel.get_latest_per_storm (active storms)", lambda s: ForecastModel.get_latest_per_storm(s)),
+        ("ForecastModel.get_latest_cone", lambda s: ForecastModel.get_latest_cone(s, storm_id)),
+        ("ForecastModel.get_latest_danger_zones", lambda s: ForecastModel.get_latest_danger_zones(s, storm_id)),
+        ("ForecastModel.get_points", lambda s: ForecastModel.get_points(s, storm_id)),
+        ("ForecastModel.get_points (lead time)", lambda s: ForecastModel.get_points(s, storm_id, min_lead_hours=24, max_lead_hours=24)),
+        ("ForecastModel.get_verification_points", lambda s: ForecastModel.get_verification_points(s, STORM_IDS)),
+        ("ForecastModel.get_all", lambda s: ForecastModel.get_all(s)),
+        ("ForecastModel.export_query", lambda s: s.execute(ForecastModel.export_query())),
+    ]
+
+
+async def seed(session):
+    await session.execute(insert(Storm), [
+        {"storm_id": storm_id, "name": storm_id, "start_date": START} for storm_id in STORM_IDS
+    ])
+    rows = [(storm_id, i, START + timedelta(hours=i)) for storm_id in STORM_IDS for i in range(ROWS_PER_STORM)]
+    await session.execute(insert(StormTrack), [
+        {"storm_id": storm_id, "timestamp": at, "lat": 15.0, "lon": 110.0, "category": i % 5, "wind_speed": 30.0}
+        for storm_id, i, at in rows
+    ])
+    await session.execute(insert(NewsSource), [
+        {"storm_id": storm_id, "title": "news", "published_at": at, "category": ("warning", "update", "damage")[i % 3]}
+        for storm_id, i, at in rows
+    ])
+    await session.execute(insert(RescueRequest), [
+        {
+            "storm_id": storm_id, "name": "request", "priority": i % 5 + 1,
+            "status": ("pending", "in_progress", "resolved")[i % 3], "verified": i % 2 == 0, "created_at": at,
+        }
+        for storm_id, i, at in rows
+    ])
+    await session.execute(insert(DamageAssessment), [
+        {"storm_id": storm_id, "detail": {}, "time": at} for storm_id, i, at in rows
+    ])
+    await session.execute(insert(DamageDetail), [
+        {"storm_id": storm_id, "content": {}, "created_at": at} for storm_id, i, at in rows
+    ])
+    await session.execute(insert(Forecast), [
+        {"storm_id": storm_id, "nchmf": {}, "jtwc": {}, "created_at": at} for storm_id, i, at in rows
+    ])
+    for table in ("storms", "storm_tracks", "news_sources", "rescue_requests", "damage_assessment", "damage_details", "forecasts"):
+        await session.execute(text(f"ANALYZE {table}"))
+
+
+def plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+async def capture(session, call) -> list:
+    """Run ``call`` and return the (statement, parameters) of every SELECT it issued."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        await call(session)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    return statements
+
+
+async def explain_all() -> dict:
+    """label -> [(statement, forbidden plan nodes)] for every case."""
+    plans = {}
+    async with AsyncSessionLocal() as session:
+        try:
+            await seed(session)
+            await session.execute(text("SET LOCAL enable_seqscan = off"))
+            await session.execute(text("SET LOCAL enable_sort = off"))
+            connection = await session.connection()
+            for label, call in cases():
+                plans[label] = []
+                for statement, parameters in await capture(session, call):
+                    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+                    nodes = [
+                        f"{node['Node Type']} on {node.get('Relation Name', '-')}"
+                        for node in plan_nodes(result.scalar_one()[0]["Plan"])
+                        if node["Node Type"] in FORBIDDEN_NODES
+                    ]
+                    plans[label].append((" ".join(statement.split()), nodes))
+        finally:
+            await session.rollback()
+    return plans
+
+
+async def reachable() -> bool:
+    try:
+        async with engine.connect() as connection:
+            await asyncio.wait_for(connection.execute(text("SELECT 1")), 5)
+        return True
+    except (OSError, asyncio.TimeoutError, DBAPIError):
+        return False
+
+
+@pytest.fixture(scope="module")
+def plans():
+    async def run():
+        try:
+            return await explain_all() if await reachable() else None
+        finally:
+            await engine.dispose()
+
+    result = asyncio.run(run())
+    if result is None:
+        pytest.skip("PostgreSQL at DATABASE_URL is not reachable")
+    return result
+
+
+@pytest.mark.parametrize("label", [label for label, _ in cases()])
+def test_query_plan_is_index_ordered(plans, label):
+    assert plans[label], f"{label} issued no SELECT"
+    for statement, nodes in plans[label]:
+        assert not nodes, f"{label}: {', '.join(nodes)}\n{statement}"
@@ -0,0 +1,86 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.caching import FORECASTS, TRACKS, VERSIONS_CHANNEL, StormVersions, response_cache, storm_versions
+from src.dependencies import StormCache
+
+app = FastAPI()
+calls = []
+
+
+@app.get("/storms/{storm_id}/thing")
+async def get_thing(storm_id: str, cache: StormCache):
+    cached = cache.lookup(storm_id)
+    if cached is not None:
+        return cached
+    calls.append(storm_id)
+    return cache.store({"storm_id": storm_id, "calls": len(calls)}, dict)
+
+
+@pytest.fixture
+def client():
+    response_cache.clear()
+    calls.clear()
+    return TestClient(app)
+
+
+def test_matching_etag_gets_304(client):
+    first = client.get("/storms/E1/thing")
+    etag = first.headers["etag"]
+    assert first.status_code == 200 and etag.startswith('W/"')
+    for if_none_match in (etag, etag.removeprefix("W/"), f'"other", {etag}', "*"):
+        response = client.get("/storms/E1/thing", headers={"If-None-Match": if_none_match})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+    assert client.get("/storms/E1/thing", headers={"If-None-Match": '"other"'}).status_code == 200
+    assert calls == ["E1"]
+
+
+def test_cached_body_is_served_until_the_storm_changes(client):
+    first = client.get("/storms/E2/thing")
+    assert client.get("/storms/E2/thing").json() == first.json()
+    assert calls == ["E2"]
+
+    storm_versions.bump(["E2"])
+    changed = client.get("/storms/E2/thing", headers={"If-None-Match": first.headers["etag"]})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != first.headers["etag"]
+    assert calls == ["E2", "E2"]
+
+
+def test_query_string_is_part_of_the_cache_key(client):
+    client.get("/storms/E3/thing", params={"a": 1, "b": 2})
+    client.get("/storms/E3/thing", params={"b": 2, "a": 1})
+    client.get("/storms/E3/thing", params={"a": 2})
+    assert calls == ["E3", "E3"]
+
+
+def test_unsettled_reads_are_neither_cached_nor_tagged(client, monkeypatch):
+    monkeypatch.setattr(storm_versions, "replica_lag_seconds", 60.0)
+    storm_versions.bump(["E4"])
+    response = client.get("/storms/E4/thing")
+    assert response.status_code == 200 and "etag" not in response.headers
+    client.get("/storms/E4/thing")
+    assert calls == ["E4", "E4"]
+
+
+def test_part_versions_move_only_with_writes_to_that_part():
+    tracks = storm_versions.token("E5", TRACKS)
+    forecasts = storm_versions.token("E5", FORECASTS)
+    storm_versions.bump(["E5"])
+    assert storm_versions.token("E5", TRACKS) == tracks
+    storm_versions.bump(["E5"], [TRACKS])
+    assert storm_versions.token("E5", TRACKS) != tracks
+    assert storm_versions.token("E5", FORECASTS) == forecasts
+
+
+def test_notifications_carry_the_parts_written():
+    other = StormVersions(30.0)
+    whole, tracks = storm_versions.token("E6"), storm_versions.token("E6", TRACKS)
+    forecasts = storm_versions.token("E7", FORECASTS)
+    for payload in other.notifications({"E6": {TRACKS}, "E7": set()}):
+        storm_versions.on_notify(None, 0, VERSIONS_CHANNEL, payload)
+    assert storm_versions.token("E6") != whole and storm_versions.token("E6", TRACKS) != tracks
+    assert storm_versions.token("E7", FORECASTS) == forecasts
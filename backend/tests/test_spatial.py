@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from src.storms.spatial import StormPath, TrackGridIndex, closest_approach, parse_bbox
+
+# Westward across the antimeridian, 2 degrees every 6 hours along 15N
+DATELINE = StormPath(
+    lat=np.array([15.0, 15.0, 15.0, 15.0]),
+    lon=np.array([176.0, 178.0, -180.0, -178.0]),
+    seconds=np.array([0.0, 21600.0, 43200.0, 64800.0]),
+)
+ACROSS = StormPath(lat=np.array([14.0, 16.0]), lon=np.array([179.5, -179.5]), seconds=np.array([0.0, 21600.0]))
+
+
+@pytest.fixture
+def index():
+    index = TrackGridIndex(60.0)
+    index._add("DL", DATELINE)
+    index._add("X", ACROSS)
+    index._add("FAR", StormPath(np.array([15.0, 15.5]), np.array([0.0, 1.0]), np.array([0.0, 21600.0])))
+    return index
+
+
+def test_closest_approach_takes_the_short_way_across_the_antimeridian():
+    distance, seconds, lat, lon = closest_approach(ACROSS, 15.0, 180.0)
+    assert distance < 1.0
+    assert seconds == pytest.approx(10800.0)
+    assert lat == pytest.approx(15.0) and abs(lon) == pytest.approx(180.0)
+
+
+def test_crossing_segments_stay_near_the_antimeridian(index):
+    columns = {col for _, col in index._storm_cells["X"]}
+    assert columns == {-180, 179}
+
+
+@pytest.mark.parametrize("lon", [179.9, -179.9, 180.0])
+def test_near_finds_tracks_on_both_sides_of_the_antimeridian(index, lon):
+    found = {a.storm_id: a for a in index.near(15.0, lon, 100.0)}
+    assert set(found) == {"DL", "X"}
+    assert found["X"].distance_km < 20.0
+
+
+def test_bbox_crossing_the_antimeridian(index):
+    box = parse_bbox("179,14.5,-179,15.5", antimeridian=True)
+    approaches = index.within_bbox(*box)
+    assert {a.storm_id for a in approaches} == {"DL", "X"}
+    assert all(abs(a.lon) > 179 for a in approaches)
+    # A box on one side only sees the tracks that reach that side
+    assert {a.storm_id for a in index.within_bbox(-179.9, 10, -179.8, 20)} == {"DL", "X"}
+    assert index.within_bbox(-10, 10, -5, 20) == []
+
+
+def test_crossing_boxes_need_the_antimeridian_flag():
+    with pytest.raises(ValueError):
+        parse_bbox("179,14.5,-179,15.5")
@@ -0,0 +1,68 @@
+"""
+Verify the stored NCHMF and JTWC forecasts of whole seasons against the
+actual storm tracks.
+
+Every forecast point (forecast_points) of the storms that started in the
+season is compared with the storm's track interpolated at the point's valid
+time: the great-circle position error in km and the intensity error in
+Beaufort levels (forecast minus actual). Points valid outside the track are
+not verified. The storms are read in one query per table and the errors are
+computed over whole arrays; the summary per source at 24/48/72h is printed,
+and --output writes every verified point as CSV.
+
+Run this with: python verify_forecasts.py SEASON [SEASON ...] [--output PATH]
+"""
+import argparse
+import asyncio
+import csv
+import sys
+from pathlib import Path
+from typing import Dict
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.database import AsyncSessionLocal, engine
+from src.forecasts.service import ForecastService
+from src.forecasts.verification import VerificationTable, summarize, table_rows
+from src.storms.model import storms
+
+
+def print_summary(season: int, tables: Dict[str, VerificationTable]) -> None:
+    print(f"Season {season}: {len(tables)} storms")
+    print(f"{'source':<8}{'lead':>6}{'count':>8}{'mean km':>10}{'median km':>11}{'bias':>8}{'abs err':>9}")
+    for row in summarize(list(tables.values())):
+        values = [row["mean_position_error_km"], row["median_position_error_km"],
+                  row["intensity_bias"], row["mean_abs_intensity_error"]]
+        mean, median, bias, absolute = ("-" if v is None else v for v in values)
+        print(f"{row['source']:<8}{row['lead_hours']:>5}h{row['count']:>8}{mean:>10}{median:>11}{bias:>8}{absolute:>9}")
+
+
+async def main(args: argparse.Namespace) -> None:
+    writer = None
+    output = open(args.output, "w", newline="") if args.output else None
+    try:
+        async with AsyncSessionLocal() as session:
+            for season in args.seasons:
+                storm_ids = await storms.get_season_storm_ids(session, season)
+                tables = await ForecastService.verification_tables(session, storm_ids)
+                print_summary(season, tables)
+                if output is None:
+                    continue
+                for storm_id, table in tables.items():
+                    for row in table_rows(table):
+                        if writer is None:
+                            writer = csv.DictWriter(output, fieldnames=["season", "storm_id", *row])
+                            writer.writeheader()
+                        writer.writerow({"season": season, "storm_id": storm_id, **row})
+    finally:
+        if output is not None:
+            output.close()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify NCHMF/JTWC forecasts against the actual storm tracks")
+    parser.add_argument("seasons", nargs="+", type=int, help="Years the storms started in")
+    parser.add_argument("--output", type=Path, help="Write every verified forecast point to this CSV file")
+    asyncio.run(main(parser.parse_args()))